@@ -0,0 +1,80 @@
+"""
+App Catalog Benchmark
+Times catalog loading and app-name extraction for catalogs of increasing size,
+against the previous per-name substring loop
+
+Usage:
+    python benchmarks/app_catalog_benchmark.py [--repeat N]
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.tools.app_catalog import AppCatalog, app_catalog
+
+REQUESTS = [
+    "Add voice ordering to Swiggy",
+    "I want to add Instagram-style stories to Zomato so people can share their meals",
+    "Integrate Google Maps based live tracking into the Uber driver app",
+    "Add a collaborative playlist feature for road trips",
+    "Enhance LinkedIn with a mentorship matching feature for early career engineers " * 4,
+]
+
+
+def make_entries(size: int, rng: random.Random):
+    """The bundled catalog padded with synthetic one- to three-word brand names"""
+    entries = AppCatalog.parse(open(app_catalog.path, encoding="utf-8"))
+    while len(entries) < size:
+        name = " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))).title()
+                        for _ in range(rng.randint(1, 3)))
+        entries.append((name, [name.replace(" ", "").lower()]))
+    return entries
+
+
+def substring_loop(names, text: str):
+    """The previous approach: lower-case the input again for every known app"""
+    for name in names:
+        if name.lower() in text.lower():
+            return name
+    return "Application"
+
+
+def best_us(repeat, fn, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in REQUESTS:
+            fn(*args, text) if args else fn(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(REQUESTS) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    print("=" * 64)
+    print("App Catalog Benchmark")
+    print("=" * 64)
+    print(f"  {'names':>8} {'load':>10} {'trie lookup':>14} {'substring loop':>16}")
+    for size in (300, 5_000, 50_000):
+        entries = make_entries(size, rng)
+        catalog = AppCatalog(entries=entries)
+        start = time.perf_counter()
+        len(catalog)
+        load_ms = (time.perf_counter() - start) * 1000
+        names = [name.strip('"') for name, _ in entries]
+        trie = best_us(args.repeat, catalog.find_all)
+        loop = best_us(max(1, args.repeat // 5), substring_loop, names)
+        print(f"  {len(catalog):>8,} {load_ms:>8.1f}ms {trie:>12.1f}us {loop:>14.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Competitor Matrix Benchmark
+Times matrix building, scoring and cross-run aggregation on synthetic competitor analyses
+
+Usage:
+    python benchmarks/competitor_matrix_benchmark.py [--runs N] [--repeat N]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.agents.competitor_matrix import CompetitorMatrix
+
+DOMAINS = ["EdTech", "FinTech", "HealthTech", "Food Delivery", "Travel", "Fitness", "Real Estate", "HR"]
+
+
+def make_analyses(runs: int, seed: int = 7):
+    """Synthetic runs drawing 3-7 competitors each from a shared pool, as repeated batch runs would"""
+    rng = random.Random(seed)
+    pool = [f"Competitor {i}" for i in range(5000)]
+    features = [f"Feature {i}" for i in range(800)]
+    analyses = []
+    for _ in range(runs):
+        competitors = [{"name": rng.choice(pool), "features": rng.sample(features, rng.randint(4, 15))}
+                       for _ in range(rng.randint(3, 7))]
+        analyses.append({"domain": rng.choice(DOMAINS), "top_competitors": competitors})
+    return analyses
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = CompetitorMatrix()
+    analyses = make_analyses(args.runs)
+    single = analyses[0]["top_competitors"]
+
+    print("=" * 60)
+    print("Competitor Matrix Benchmark")
+    print("=" * 60)
+    ms, matrix = best_of(args.repeat, lambda: engine.build(single))
+    print(f"  build (one run, {matrix.shape[0]} x {matrix.shape[1]})        best {ms:8.2f} ms")
+    ms, _ = best_of(args.repeat, lambda: engine.summary(matrix))
+    print(f"  score + gaps + summary           best {ms:8.2f} ms")
+
+    everyone = [c for analysis in analyses for c in analysis["top_competitors"]]
+    ms, big = best_of(args.repeat, lambda: engine.build(everyone))
+    print(f"  build (all runs, {big.shape[0]} x {big.shape[1]})   best {ms:8.2f} ms")
+    ms, _ = best_of(args.repeat, lambda: engine.score(big))
+    print(f"  score (all runs)                 best {ms:8.2f} ms")
+    ms, rollup = best_of(args.repeat, lambda: engine.aggregate(analyses))
+    print(f"  aggregate {args.runs} runs              best {ms:8.2f} ms   "
+          f"{len(rollup['competitors'])} competitors, {len(rollup['features'])} features")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Market Simulation Benchmark
+Times the vectorized Monte Carlo TAM/SAM/SOM engine and the scenario grids at several sizes
+
+Usage:
+    python benchmarks/market_simulation_benchmark.py [--repeat N]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.agents.market_simulation import MarketSimulation, MarketAssumptions
+from my_agent.agents.market_scenarios import MarketScenarios
+
+ASSUMPTIONS = {
+    "users": (5e6, 2e7, 5e7),
+    "arpu_usd": (20, 60, 120),
+    "serviceable_share": (0.1, 0.25, 0.4),
+    "penetration": (0.001, 0.005, 0.02),
+    "growth": (0.2, 0.6, 1.2),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    assumptions = MarketAssumptions.from_dict(ASSUMPTIONS)
+    engine = MarketSimulation(seed=42)
+    engine.run(assumptions, samples=1000)
+
+    print("=" * 60)
+    print("Market Simulation Benchmark")
+    print("=" * 60)
+    for samples in (10_000, 100_000, 1_000_000):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = engine.run(assumptions, samples=samples)
+            timings.append(time.perf_counter() - start)
+        best = min(timings) * 1000
+        print(f"  {samples:>9,} samples   best {best:8.1f} ms   "
+              f"{samples / min(timings) / 1e6:6.2f} M samples/s   TAM p50 ${result['tam']['median_usd']:,.0f}")
+
+    scenarios = MarketScenarios()
+    print("\nScenario grids (penetration x growth, SOM year 3)")
+    for points in (50, 100, 1000):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            grid = scenarios.grid(assumptions, points=points)
+            timings.append(time.perf_counter() - start)
+        print(f"  {points:>4} x {points:<4} grid   best {min(timings) * 1000:8.2f} ms   "
+              f"{grid.size / min(timings) / 1e6:6.1f} M cells/s")
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        scenarios.summary(assumptions)
+        timings.append(time.perf_counter() - start)
+    print(f"  tornado + 50x50 summary   best {min(timings) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Output Catalog Benchmark
+Lookup time for past sessions, SQLite catalog versus scanning complete_results.json files
+
+Fills a catalog with synthetic sessions spread over 90 days and 12 domains,
+then times typical queries ("all FinTech ideas from last week with
+TAM > $1B", by keyword, by session ID). The scan baseline opens and filters a
+sample of results files and is scaled to the full session count.
+
+Usage:
+    python benchmarks/output_catalog_benchmark.py [--sessions N] [--scan-sample N]
+"""
+import argparse
+import json
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.utils.output_catalog import OutputCatalog
+
+DOMAINS = ["FinTech", "EdTech", "HealthTech", "FoodTech", "PropTech", "AgriTech", "LegalTech", "InsurTech",
+           "RetailTech", "TravelTech", "GovTech", "CleanTech"]
+KEYWORDS = ["payments", "lending", "students", "ai", "voice", "marketplace", "compliance", "analytics",
+            "mobile", "subscription", "b2b", "social"]
+
+
+def make_results(rng: random.Random, i: int):
+    return {
+        "intent": "new_app_idea" if i % 3 else "feature_extension",
+        "domain": rng.choice(DOMAINS),
+        "user_input": f"Idea number {i}",
+        "keywords": rng.sample(KEYWORDS, 3),
+        "status": "success",
+        "market_size": {"tam": {"value_usd": 10 ** rng.uniform(7, 11)}, "sam": {"value_usd": 10 ** rng.uniform(6, 9)},
+                        "som": {"year_3_usd": 10 ** rng.uniform(5, 8)}},
+    }
+
+
+def timed(fn, repeat: int = 20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200000)
+    parser.add_argument("--scan-sample", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    now = time.time()
+    workdir = Path(tempfile.mkdtemp(prefix="mapis-catalog-bench-"))
+    try:
+        catalog = OutputCatalog(workdir / "catalog.sqlite3")
+        artifacts = [("pitch", "pitch_deck.md", 4000, None), ("readme", "README.md", 900, None),
+                     ("complete_results", "complete_results.json", 120000, None)]
+        start = time.perf_counter()
+        for i in range(args.sessions):
+            catalog.record(workdir / f"s{i}", f"session_{i}", make_results(rng, i), artifacts,
+                           created_at=now - rng.uniform(0, 90 * 86400))
+        fill = time.perf_counter() - start
+
+        since = datetime.now() - timedelta(days=7)
+        queries = {
+            "FinTech ideas, last week, TAM > $1B": lambda: catalog.find(domain="FinTech", intent="new_app_idea",
+                                                                       since=since, min_tam=1e9, limit=None),
+            "keyword 'payments', last week": lambda: catalog.find(keyword="payments", since=since, limit=None),
+            "TAM > $50B, any domain": lambda: catalog.find(min_tam=5e10, limit=None),
+            "by session ID": lambda: catalog.find(session_id=f"session_{args.sessions // 2}"),
+            "artifacts of one session": lambda: catalog.artifacts(args.sessions // 2),
+        }
+
+        # Baseline: open every results file and filter in Python (sample, scaled to all sessions)
+        scan_dir = workdir / "outputs"
+        for i in range(args.scan_sample):
+            (scan_dir / f"s{i}").mkdir(parents=True)
+            with open(scan_dir / f"s{i}" / "complete_results.json", "w") as f:
+                json.dump(make_results(rng, i), f, indent=2)
+
+        def scan():
+            hits = []
+            for path in scan_dir.glob("*/complete_results.json"):
+                with open(path) as f:
+                    results = json.load(f)
+                if results["domain"] == "FinTech" and results["market_size"]["tam"]["value_usd"] > 1e9:
+                    hits.append(path)
+            return hits
+
+        scan_ms, _ = timed(scan, repeat=3)
+
+        print("=" * 72)
+        print("Output Catalog Benchmark")
+        print("=" * 72)
+        print(f"  {args.sessions:,} sessions cataloged in {fill:.1f} s ({args.sessions / fill:,.0f} sessions/s), "
+              f"{(workdir / 'catalog.sqlite3').stat().st_size / 1e6:.1f} MB\n")
+        for label, query in queries.items():
+            ms, rows = timed(query)
+            print(f"  {label:<38} {ms:8.2f} ms   {len(rows):6,d} rows")
+        print(f"\n  scan of results files (FinTech, TAM > $1B) "
+              f"{scan_ms / args.scan_sample * args.sessions:10.0f} ms (extrapolated from {args.scan_sample:,} files)")
+        catalog.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
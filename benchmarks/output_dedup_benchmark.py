@@ -0,0 +1,77 @@
+"""
+Output Dedup Benchmark
+Disk usage and save time for many sessions, plain copies versus the content-addressed blob store
+
+Every session saves the same domain analysis, guides and boilerplate as
+the previous one, plus a pitch and architecture that differ per run (the
+usual shape of repeated runs in one domain). Disk usage counts each inode
+once, so hardlinked files are not double counted.
+
+Usage:
+    python benchmarks/output_dedup_benchmark.py [--sessions N] [--transcript-kb N] [--repeat N]
+"""
+import argparse
+import copy
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from my_agent.utils import file_output
+from output_save_benchmark import make_results
+
+
+def disk_usage(root: Path) -> int:
+    seen, total = set(), 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            info = os.lstat(os.path.join(dirpath, name))
+            if info.st_ino not in seen:
+                seen.add(info.st_ino)
+                total += info.st_size
+    return total
+
+
+def run(dedup: bool, base, sessions: int, output_dir: Path):
+    file_output.OUTPUT_DEDUP = dedup
+    start = time.perf_counter()
+    for i in range(sessions):
+        results = copy.copy(base)
+        results["pitch"] = {"full_text": f"Pitch variant {i}\n" + base["pitch"]["full_text"]}
+        results["architecture"] = {"raw_architecture": f"Architecture variant {i}\n" + base["architecture"]["raw_architecture"]}
+        assert file_output.save_outputs_to_files(results, f"run_{i}", output_dir), "save failed"
+    return time.perf_counter() - start, disk_usage(output_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--transcript-kb", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    base = make_results(args.transcript_kb)
+    print("=" * 64)
+    print("Output Dedup Benchmark")
+    print("=" * 64)
+    print(f"  {args.sessions} sessions, ~{args.transcript_kb} KB per transcript\n")
+    for dedup in (False, True):
+        timings = []
+        for _ in range(args.repeat):
+            output_dir = Path(tempfile.mkdtemp(prefix="mapis-dedup-bench-"))
+            try:
+                timings.append(run(dedup, base, args.sessions, output_dir))
+            finally:
+                shutil.rmtree(output_dir, ignore_errors=True)
+        elapsed, usage = min(timings)
+        label = "blob store" if dedup else "copies"
+        print(f"  {label:<11} save {elapsed * 1000:8.1f} ms   disk {usage / 1e6:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Output Layout Benchmark
+Run directory collisions under concurrent saves, and directory listing cost, flat versus sharded
+
+Part 1 saves many different runs at once under one session ID (like
+main.py's "session_1") and counts the session directories that come out
+and the runs whose complete_results.json still holds their own results.
+Part 2 creates N empty run directories in a flat outputs/ and in the
+date / hash sharded runs/ tree, and times listing the directory a new run
+lands in.
+
+Usage:
+    python benchmarks/output_layout_benchmark.py [--concurrent N] [--runs N]
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from my_agent.utils import file_output
+from my_agent.utils.results_json import load_results
+from output_save_benchmark import make_results
+
+
+def concurrent_saves(count: int, output_dir: Path):
+    """Distinct session directories, and runs whose saved results are still their own"""
+    base = make_results(20)
+    runs = [dict(base, user_input=f"run {i}") for i in range(count)]
+    with ThreadPoolExecutor(count) as pool:
+        saved = list(pool.map(lambda results: file_output.save_outputs_to_files(results, "session_1", output_dir), runs))
+    directories = {Path(files["complete_results"]).parent for files in saved if files.get("complete_results")}
+    intact = sum(1 for results, files in zip(runs, saved) if files.get("complete_results")
+                 and load_results(files["complete_results"]).get("user_input") == results["user_input"])
+    return len(directories), intact
+
+
+def listing(runs: int, output_dir: Path):
+    flat, sharded = output_dir / "flat", output_dir / "sharded"
+    day = "2026/01/01"
+    for i in range(runs):
+        run_id = f"session_{i}_20260101_000000_{i:08x}"
+        (flat / run_id).mkdir(parents=True)
+        (sharded / day / hashlib.sha1(run_id.encode()).hexdigest()[:2] / run_id).mkdir(parents=True)
+
+    def timed(directory: Path, repeat: int = 20):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            entries = os.listdir(directory)
+            best = min(best, time.perf_counter() - start)
+        return best * 1000, len(entries)
+
+    shard = next((sharded / day).iterdir())
+    return timed(flat), timed(shard)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrent", type=int, default=16)
+    parser.add_argument("--runs", type=int, default=100000)
+    args = parser.parse_args()
+
+    file_output.OUTPUT_PDF = False
+    print("=" * 72)
+    print("Output Layout Benchmark")
+    print("=" * 72)
+    output_dir = Path(tempfile.mkdtemp(prefix="mapis-layout-bench-"))
+    try:
+        directories, intact = concurrent_saves(args.concurrent, output_dir)
+        print(f"  {args.concurrent} concurrent saves as 'session_1': {directories} session directories, "
+              f"{intact} runs with their own results intact")
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    output_dir = Path(tempfile.mkdtemp(prefix="mapis-layout-bench-"))
+    try:
+        (flat_ms, flat_entries), (shard_ms, shard_entries) = listing(args.runs, output_dir)
+        print(f"  list flat outputs/ dir     {flat_ms:8.2f} ms   {flat_entries:7,d} entries")
+        print(f"  list one runs/ shard       {shard_ms:8.2f} ms   {shard_entries:7,d} entries")
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Output Save Benchmark
+Measures how long saving session outputs stalls the event loop, blocking versus async
+
+Several sessions save at once while a heartbeat task ticks every millisecond;
+the worst and total heartbeat lateness is the time the loop could not serve
+anything else.
+
+Usage:
+    python benchmarks/output_save_benchmark.py [--sessions N] [--transcript-kb N]
+"""
+import argparse
+import asyncio
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.utils.file_output import save_outputs_to_files, save_outputs_async
+
+TICK = 0.001
+
+
+def make_results(transcript_kb: int, screens: int = 6):
+    """A new-app-idea result with long raw LLM transcripts, like a real run"""
+    text = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 18 + "\n") * (transcript_kb)
+    elements = ["Header", "Search Bar", "Card", "List View", "Primary Button", "Tab Bar"]
+    return {
+        "intent": "new_app_idea",
+        "domain": "EdTech",
+        "user_input": "Give me a new idea in the EdTech domain",
+        "domain_analysis": {"overview": text[:2000], "trends": ["AI tutors", "Micro-credentials"]},
+        "idea_breakdown": {"problem_statement": "p", "value_proposition": "v", "proposed_features": ["a", "b"], "raw_breakdown": text},
+        "architecture": {"raw_architecture": text},
+        "competitor_analysis": {"raw_analysis": text, "top_competitors": []},
+        "market_size": {"tam": {"value_usd": 1e9}, "sam": {"value_usd": 1e8}, "som": {"year_3_usd": 1e6}, "raw_analysis": text},
+        "wireframes": {"wireframes": {f"Screen {i}": {"wireframe": "+--+\n|  |\n+--+", "elements": elements, "raw_analysis": text}
+                                      for i in range(screens)}},
+        "pitch": {"full_text": text},
+    }
+
+
+async def heartbeat(stop: asyncio.Event, lateness: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lateness.append(max(0.0, time.perf_counter() - start - TICK))
+
+
+async def run(mode: str, results, sessions: int, output_dir: Path):
+    stop = asyncio.Event()
+    lateness = []
+    beat = asyncio.create_task(heartbeat(stop, lateness))
+    await asyncio.sleep(0.01)
+
+    async def blocking(i):
+        # What an async caller got before: the whole save runs on the loop thread
+        return save_outputs_to_files(results, f"{mode}_{i}", output_dir)
+
+    async def offloaded(i):
+        return await save_outputs_async(results, f"{mode}_{i}", output_dir)
+
+    save = blocking if mode == "blocking" else offloaded
+    start = time.perf_counter()
+    saved = await asyncio.gather(*(save(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    assert all(saved), "a save failed"
+    return elapsed, max(lateness), sum(lateness)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--transcript-kb", type=int, default=200)
+    args = parser.parse_args()
+
+    results = make_results(args.transcript_kb)
+    output_dir = Path(tempfile.mkdtemp(prefix="mapis-save-bench-"))
+    try:
+        print("=" * 64)
+        print("Output Save Benchmark")
+        print("=" * 64)
+        print(f"  {args.sessions} concurrent sessions, ~{args.transcript_kb} KB per transcript\n")
+        for mode in ("blocking", "async"):
+            elapsed, worst, total = asyncio.run(run(mode, results, args.sessions, output_dir))
+            print(f"  {mode:<9} wall {elapsed * 1000:8.1f} ms   worst loop stall {worst * 1000:8.1f} ms   "
+                  f"total stall {total * 1000:8.1f} ms")
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+PDF Export Benchmark
+Throughput of pitch deck and concept paper PDF rendering, in-process versus the process pool
+
+Also measures how long rendering stalls the event loop: a heartbeat task
+ticks every millisecond while a batch renders either inline (on the loop)
+or on the pool, awaited through ``asyncio.wrap_future``.
+
+Usage:
+    python benchmarks/pdf_export_benchmark.py [--documents N] [--slides N] [--workers 1,2,4]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.utils.pdf_export import PDFExporter, render_pdf
+
+TICK = 0.001
+
+
+def make_deck(slides: int) -> str:
+    body = "\n".join(f"- **Point {i}**: students finish *{i * 7}%* more lessons" for i in range(5))
+    table = "| Metric | Value |\n|---|---:|\n| TAM | $1.2B |\n| SAM | $310M |\n| SOM | $24M |"
+    parts = ["---\nmarp: true\ntheme: default\n---"]
+    parts += [f"# Slide {i}\n\n{body}\n\n{table if i % 3 == 0 else '(Chart showing growth)'}" for i in range(slides)]
+    return "\n\n---\n\n".join(parts)
+
+
+def make_paper(sections: int) -> str:
+    text = "Lorem ipsum dolor sit amet, **consectetur** adipiscing elit, sed do eiusmod tempor. " * 12
+    return "\n\n".join(f"## Section {i}\n\n{text}\n\n- Goal one\n- Goal two\n\n1. Step\n2. Step" for i in range(sections))
+
+
+def jobs(documents: int, slides: int):
+    deck, paper = make_deck(slides), make_paper(slides)
+    return [("slides", deck, "Deck") if i % 2 == 0 else ("document", paper, "Paper") for i in range(documents)]
+
+
+async def heartbeat(stop: asyncio.Event):
+    worst = total = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        late = time.perf_counter() - start - TICK
+        worst, total = max(worst, late), total + max(late, 0.0)
+    return worst, total
+
+
+async def timed(batch, exporter=None):
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    if exporter is None:
+        for job in batch:
+            render_pdf(*job)
+            await asyncio.sleep(0)
+    else:
+        await asyncio.gather(*(asyncio.wrap_future(exporter.submit(*job)) for job in batch))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    worst, total = await beat
+    return elapsed, worst, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=24)
+    parser.add_argument("--slides", type=int, default=12)
+    parser.add_argument("--workers", default=",".join(str(n) for n in sorted({1, 2, 4, os.cpu_count() or 1})))
+    args = parser.parse_args()
+
+    batch = jobs(args.documents, args.slides)
+    print("=" * 72)
+    print("PDF Export Benchmark")
+    print("=" * 72)
+    print(f"  {args.documents} PDFs (decks of {args.slides} slides and papers of {args.slides} sections), "
+          f"{os.cpu_count()} CPUs\n")
+
+    render_pdf(*batch[0])
+    elapsed, worst, total = asyncio.run(timed(batch))
+    print(f"  {'in-process':<12} {args.documents / elapsed:7.1f} PDFs/s   "
+          f"loop stall worst {worst * 1000:7.1f} ms, total {total * 1000:8.1f} ms")
+    for workers in (int(n) for n in args.workers.split(",")):
+        exporter = PDFExporter(workers)
+        try:
+            # Warm the pool so worker start-up is not counted
+            for future in [exporter.submit(*batch[0]) for _ in range(workers)]:
+                future.result()
+            elapsed, worst, total = asyncio.run(timed(batch, exporter))
+        finally:
+            exporter.shutdown()
+        print(f"  {f'pool x{workers}':<12} {args.documents / elapsed:7.1f} PDFs/s   "
+              f"loop stall worst {worst * 1000:7.1f} ms, total {total * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
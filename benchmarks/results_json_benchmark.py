@@ -0,0 +1,98 @@
+"""
+Results JSON Benchmark
+Compares json.dump(indent=2) of the whole results dict with the section-streaming
+writer (indented, compact, gzip), and a lazy single-stage read with a full parse
+
+Usage:
+    python benchmarks/results_json_benchmark.py [--transcript-kb N] [--repeat N]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.utils.results_json import write_results_json, ResultsReader
+
+sys.path.insert(0, str(Path(__file__).parent))
+from output_save_benchmark import make_results  # noqa: E402
+
+
+def measure(repeat, fn):
+    """Best wall time and the peak traced allocation of one run"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings) * 1000, peak / 1e6
+
+
+def measure_all(repeat, fns):
+    """Like measure, for several functions run round-robin so page cache and CPU noise hit all of them alike"""
+    timings = [[] for _ in fns]
+    for _ in range(repeat):
+        for timing, fn in zip(timings, fns):
+            start = time.perf_counter()
+            fn()
+            timing.append(time.perf_counter() - start)
+    results = []
+    for timing, fn in zip(timings, fns):
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append((min(timing) * 1000, peak / 1e6))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transcript-kb", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    results = make_results(args.transcript_kb)
+    work = Path(tempfile.mkdtemp(prefix="mapis-json-bench-"))
+
+    def json_dump():
+        with open(work / "dump.json", "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, default=str)
+
+    writers = [
+        ("json.dump(indent=2)", "dump.json", json_dump),
+        ("streamed, indented", "indented.json", lambda: write_results_json(results, work / "indented.json")),
+        ("streamed, compact", "compact.json", lambda: write_results_json(results, work / "compact.json", compact=True)),
+        ("streamed, compact+gzip", "compact.json.gz",
+         lambda: write_results_json(results, work / "compact.json.gz", compact=True, compress=True)),
+    ]
+    try:
+        print("=" * 72)
+        print("Results JSON Benchmark")
+        print("=" * 72)
+        print(f"  {'writer':<24} {'time':>10} {'peak mem':>10} {'size':>10}")
+        for (label, name, _), (ms, peak) in zip(writers, measure_all(args.repeat, [fn for _, _, fn in writers])):
+            print(f"  {label:<24} {ms:>8.1f}ms {peak:>8.1f}MB {os.path.getsize(work / name) / 1e6:>8.2f}MB")
+
+        print(f"\n  {'read market_size':<24} {'time':>10}")
+        for name in ("indented.json", "compact.json.gz"):
+            ms, _ = measure(args.repeat, lambda: ResultsReader(work / name).load("market_size"))
+            print(f"  {'lazy, ' + name:<24} {ms:>8.2f}ms")
+        ms, _ = measure(args.repeat, lambda: json.load(open(work / "dump.json", encoding="utf-8"))["market_size"])
+        print(f"  {'full parse, dump.json':<24} {ms:>8.2f}ms")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Sandbox Pool Benchmark
+Compares a fresh interpreter per execution with the warm SandboxPool
+
+Usage:
+    python benchmarks/sandbox_pool_benchmark.py [--jobs N] [--workers N]
+"""
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.tools.sandbox_pool import SandboxPool
+
+# A small market-sizing style calculation
+CODE = """
+import statistics
+users = [inputs["base"] * (1 + inputs["growth"]) ** year for year in range(10)]
+result = {"year_10": round(users[-1]), "mean": round(statistics.mean(users))}
+"""
+INPUTS = {"base": 10000, "growth": 0.35}
+
+
+def run_cold(jobs: int) -> float:
+    """Baseline: one interpreter start per execution"""
+    script = f"inputs = {INPUTS!r}\n{CODE}\nprint(result)"
+    start = time.perf_counter()
+    for _ in range(jobs):
+        subprocess.run([sys.executable, "-I", "-c", script], check=True, capture_output=True)
+    return jobs / (time.perf_counter() - start)
+
+
+def run_warm_sequential(pool: SandboxPool, jobs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(jobs):
+        assert pool.run_sync(CODE, INPUTS)["ok"]
+    return jobs / (time.perf_counter() - start)
+
+
+async def run_warm_parallel(pool: SandboxPool, jobs: int) -> float:
+    start = time.perf_counter()
+    results = await pool.map([CODE] * jobs, INPUTS)
+    assert all(r["ok"] for r in results)
+    return jobs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-jobs", type=int, default=50, help="jobs per worker before it is recycled")
+    args = parser.parse_args()
+
+    pool = SandboxPool(size=args.workers, max_jobs=args.max_jobs)
+    print("=" * 60)
+    print("Sandbox Pool Benchmark")
+    print(f"jobs={args.jobs} workers={pool.size} max_jobs={args.max_jobs}")
+    print("=" * 60)
+
+    cold_jobs = max(1, args.jobs // 10)
+    print(f"  {'new interpreter per job':<32} {run_cold(cold_jobs):>9,.0f} jobs/s")
+
+    start = time.perf_counter()
+    pool.start()
+    print(f"  {'pool warm-up':<32} {(time.perf_counter() - start) * 1000:>9,.0f} ms")
+    print(f"  {'warm pool, sequential':<32} {run_warm_sequential(pool, args.jobs):>9,.0f} jobs/s")
+    print(f"  {'warm pool, parallel':<32} {asyncio.run(run_warm_parallel(pool, args.jobs)):>9,.0f} jobs/s")
+    print(f"\n{pool.stats()}")
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Search Backend Throughput Benchmark
+Runs HTTPSearchBackend against a local stand-in search server
+
+Usage:
+    python benchmarks/search_backend_benchmark.py [--queries N] [--concurrency N] [--latency-ms MS]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.tools.google_search import GoogleSearchMCP
+from my_agent.tools.http_search import HTTPSearchBackend, parse_search_response
+
+
+class StandInSearchServer:
+    """Minimal keep-alive HTTP/1.1 server answering in Custom Search JSON format"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000.0
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/search"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                while (await reader.readline()) not in (b"\r\n", b""):
+                    pass
+                self.requests += 1
+                target = request_line.split()[1].decode()
+                params = parse_qs(urlsplit(target).query)
+                query = params.get("q", [""])[0]
+                num = int(params.get("num", ["5"])[0])
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                body = json.dumps({"items": [
+                    {"title": f"{query} result {i}", "link": f"https://example.com/{i}",
+                     "snippet": f"Snippet {i} about {query}"}
+                    for i in range(num)
+                ]}).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+                await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run_pooled(endpoint: str, queries: int, concurrency: int) -> float:
+    backend = HTTPSearchBackend(endpoint, per_host_limit=concurrency, max_keepalive_connections=concurrency)
+    search = GoogleSearchMCP(backend=backend)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(search.search(f"EdTech query {n}", max_results=5) for n in range(queries)))
+    elapsed = time.perf_counter() - start
+    assert all(len(r) == 5 and r[0]["url"] for r in results)
+    await backend.aclose()
+    return queries / elapsed
+
+
+async def run_unpooled(endpoint: str, queries: int, concurrency: int) -> float:
+    """Baseline: a fresh client (and TCP connection) per query"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(n: int):
+        async with semaphore:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(endpoint, params={"q": f"EdTech query {n}", "num": 5})
+                return parse_search_response(response.json(), 5)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(queries)))
+    return queries / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Search Backend Throughput Benchmark")
+    print(f"queries={args.queries} concurrency={args.concurrency} server latency={args.latency_ms}ms")
+    print("=" * 60)
+
+    for label, runner in (("new client per query", run_unpooled), ("pooled keep-alive client", run_pooled)):
+        server = StandInSearchServer(args.latency_ms)
+        endpoint = await server.start()
+        rate = await runner(endpoint, args.queries, args.concurrency)
+        await server.stop()
+        print(f"{label:<28} {rate:>9,.0f} queries/s   TCP connections opened: {server.connections}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+Session Bundle Benchmark
+Files created, bytes on disk and save time per session, session directory versus single-file bundles
+
+Also times pulling one artifact (the README) back out of each bundle
+against unpacking the whole bundle.
+
+Usage:
+    python benchmarks/session_bundle_benchmark.py [--sessions N] [--transcript-kb N]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from my_agent.utils.file_output import save_outputs_to_files
+from my_agent.utils.session_bundle import BundleReader, zstandard
+from output_save_benchmark import make_results
+
+
+def tree_stats(root: Path):
+    files = size = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        files += len(filenames) + len(dirnames)
+        size += sum(os.lstat(os.path.join(dirpath, name)).st_size for name in filenames)
+    return files, size
+
+
+def unpack_all(path: str, target: Path):
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as bundle:
+            bundle.extractall(target)
+    else:
+        with zstandard.open(path, "rb") as f, tarfile.open(fileobj=f, mode="r|") as bundle:
+            bundle.extractall(target, filter="data")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--transcript-kb", type=int, default=200)
+    args = parser.parse_args()
+
+    results = make_results(args.transcript_kb)
+    modes = [None, "zip"] + (["tar.zst"] if zstandard is not None else [])
+    print("=" * 72)
+    print("Session Bundle Benchmark")
+    print("=" * 72)
+    print(f"  {args.sessions} sessions, ~{args.transcript_kb} KB per transcript\n")
+    for bundle in modes:
+        output_dir = Path(tempfile.mkdtemp(prefix="mapis-bundle-bench-"))
+        try:
+            start = time.perf_counter()
+            saved = [save_outputs_to_files(results, f"run_{i}", output_dir, bundle=bundle) for i in range(args.sessions)]
+            elapsed = time.perf_counter() - start
+            files, size = tree_stats(output_dir)
+            line = (f"  {bundle or 'directory':<10} save {elapsed / args.sessions * 1000:7.1f} ms/session   "
+                    f"{files / args.sessions:5.1f} files/session   {size / args.sessions / 1e6:6.2f} MB/session")
+            if bundle:
+                path = saved[0]["bundle"]
+                start = time.perf_counter()
+                BundleReader(path).read("README.md")
+                one = time.perf_counter() - start
+                start = time.perf_counter()
+                unpack_all(path, output_dir / "unpacked")
+                everything = time.perf_counter() - start
+                line += f"   README {one * 1000:5.2f} ms (unpack all {everything * 1000:6.1f} ms)"
+            print(line)
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
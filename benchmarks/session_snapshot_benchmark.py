@@ -0,0 +1,110 @@
+"""
+Session Snapshot Benchmark
+Compares binary snapshot/restore with a plain JSON dump at 10k sessions
+
+Usage:
+    python benchmarks/session_snapshot_benchmark.py [--sessions N] [--raw-size BYTES]
+"""
+import argparse
+import json
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.memory import InMemorySessionService
+from my_agent.session_snapshot import zstandard
+
+
+def _fake_analysis(rng: random.Random, size: int) -> str:
+    """Markdown-ish LLM transcript: repetitive prose with some variation"""
+    words = ["market", "users", "competitor", "feature", "pricing", "growth",
+             "platform", "mobile", "retention", "onboarding", "analytics", "AI"]
+    lines = []
+    total = 0
+    while total < size:
+        line = "- " + " ".join(rng.choice(words) for _ in range(12)) + f" ({rng.randint(1, 999)}%)"
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+
+def populate(service: InMemorySessionService, sessions: int, raw_size: int):
+    rng = random.Random(42)
+    for n in range(sessions):
+        session_id = f"session_{n}"
+        service.get_or_create_session(session_id)
+        service.update_context(session_id, "user_input", "Give me a new idea in the EdTech domain")
+        service.update_context(session_id, "intent", {"intent": "new_app_idea", "domain": "EdTech",
+                                                      "keywords": ["learning", "students"], "confidence": 0.9})
+        for agent in ("domain_understanding", "competitor_analysis", "market_size"):
+            service.add_to_history(session_id, agent, "EdTech", {
+                "domain": "EdTech",
+                "raw_analysis": _fake_analysis(rng, raw_size),
+                "token": "".join(rng.choices(string.ascii_letters, k=16))
+            })
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {elapsed * 1000:>9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--raw-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Session Snapshot Benchmark")
+    print(f"sessions={args.sessions} raw_analysis size={args.raw_size} bytes x3 per session")
+    print("=" * 60)
+
+    service = InMemorySessionService()
+    populate(service, args.sessions, args.raw_size)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        print("\nJSON baseline")
+        json_file = tmp / "sessions.json"
+        def dump_json():
+            with open(json_file, "w", encoding="utf-8") as f:
+                json.dump(service.sessions, f, indent=2, default=str)
+        timed("dump (indent=2)", dump_json)
+        def load_json():
+            with open(json_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        timed("load", load_json)
+        print(f"  {'size':<32} {json_file.stat().st_size / 1e6:>9.1f} MB")
+
+        codecs = [None, "zlib"] + (["zstd"] if zstandard is not None else [])
+        for codec in codecs:
+            print(f"\nBinary snapshot (compression={codec})")
+            snap_file = tmp / f"sessions_{codec}.snap"
+            timed("snapshot", lambda: service.snapshot(snap_file, compression=codec))
+            print(f"  {'size':<32} {snap_file.stat().st_size / 1e6:>9.1f} MB")
+
+            restored = InMemorySessionService()
+            timed("restore (streaming, all)", lambda: restored.restore(snap_file))
+            assert restored.get_history("session_7") == service.get_history("session_7")
+
+            lazy = InMemorySessionService()
+            timed("restore (lazy, index only)", lambda: lazy.restore(snap_file, lazy=True))
+            timed("first access of one session", lambda: lazy.get_session("session_1234"))
+
+            subset = InMemorySessionService()
+            timed("restore 100 selected sessions", lambda: subset.restore(
+                snap_file, session_ids=[f"session_{n}" for n in range(0, args.sessions, max(1, args.sessions // 100))]))
+
+
+if __name__ == "__main__":
+    main()
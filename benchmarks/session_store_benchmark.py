@@ -0,0 +1,91 @@
+"""
+Session Store Contention Benchmark
+Measures InMemorySessionService throughput with many concurrent sessions
+
+Usage:
+    python benchmarks/session_store_benchmark.py [--sessions N] [--ops N] [--threads N]
+"""
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.memory import InMemorySessionService
+
+
+def _worker(service: InMemorySessionService, worker_id: int, sessions: int, ops: int):
+    """Mixed read/write load spread over all sessions"""
+    for i in range(ops):
+        session_id = f"session_{(worker_id * 7919 + i) % sessions}"
+        service.get_or_create_session(session_id)
+        service.add_to_history(session_id, "bench", i, worker_id)
+        service.update_context(session_id, "last_worker", worker_id)
+        service.get_context(session_id, "last_worker")
+
+
+def run_thread_pool(num_shards: int, sessions: int, ops: int, threads: int) -> float:
+    """Run the workload on a thread pool and return ops/sec"""
+    service = InMemorySessionService(num_shards=num_shards)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for f in [pool.submit(_worker, service, w, sessions, ops) for w in range(threads)]:
+            f.result()
+    elapsed = time.perf_counter() - start
+
+    # Every add_to_history must have landed - lost updates mean a race
+    total = sum(len(service.get_history(sid)) for sid in service.session_ids())
+    assert total == ops * threads, f"lost updates: {total} != {ops * threads}"
+    return ops * threads * 4 / elapsed
+
+
+def run_multi_loop(num_shards: int, sessions: int, ops: int, loops: int) -> float:
+    """Run the workload from several event loops, each on its own thread"""
+    service = InMemorySessionService(num_shards=num_shards)
+
+    async def loop_main(loop_id: int):
+        async def task(task_id: int):
+            for i in range(ops // 10):
+                session_id = f"session_{(loop_id * 31 + task_id * 7 + i) % sessions}"
+                service.update_session(session_id, lambda s: s["history"].append(i))
+                if i % 50 == 0:
+                    await asyncio.sleep(0)
+        await asyncio.gather(*(task(t) for t in range(10)))
+
+    threads = [threading.Thread(target=asyncio.run, args=(loop_main(n),)) for n in range(loops)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(service.get_history(sid)) for sid in service.session_ids())
+    assert total == (ops // 10) * 10 * loops, "lost updates across event loops"
+    return total / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Session Store Contention Benchmark")
+    print(f"sessions={args.sessions} ops/worker={args.ops} threads={args.threads}")
+    print("=" * 60)
+
+    for shards in (1, 16, 64):
+        pool_rate = run_thread_pool(shards, args.sessions, args.ops, args.threads)
+        loop_rate = run_multi_loop(shards, args.sessions, args.ops, 4)
+        print(f"shards={shards:<3}  thread pool: {pool_rate:>12,.0f} ops/s   4 event loops: {loop_rate:>12,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main()
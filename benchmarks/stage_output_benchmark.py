@@ -0,0 +1,87 @@
+"""
+Stage Output Benchmark
+Measures how long saving takes after the last stage, saving at the end versus writing each stage as it finishes
+
+Stages are replayed in workflow order with a sleep standing in for each
+LLM call. "at end" saves everything once the pipeline returns (the old
+main.py flow); "per stage" hands each stage to ``StageOutputWriter`` as it
+finishes, so only the last stage and the README are left to write.
+
+Usage:
+    python benchmarks/stage_output_benchmark.py [--stage-ms N] [--transcript-kb N] [--runs N]
+"""
+import argparse
+import asyncio
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from my_agent.utils.file_output import StageOutputWriter, save_outputs_async
+from output_save_benchmark import make_results
+
+# New app idea workflow: stages stored together finish together
+STAGES = [("domain_analysis", "idea_breakdown"), ("competitor_analysis", "market_size"),
+          ("architecture",), ("wireframes",), ("pitch",)]
+
+
+async def pipeline(full, stage_seconds: float, listener=None):
+    results = {key: full[key] for key in ("intent", "domain", "user_input")}
+    for group in STAGES:
+        await asyncio.sleep(stage_seconds)
+        for stage in group:
+            results[stage] = full[stage]
+        if listener:
+            for stage in group:
+                listener("bench", stage, results)
+    results["status"] = "success"
+    return results
+
+
+async def run(mode: str, full, stage_seconds: float, output_dir: Path):
+    if mode == "at end":
+        start = time.perf_counter()
+        results = await pipeline(full, stage_seconds)
+        done = time.perf_counter()
+        saved = await save_outputs_async(results, "bench", output_dir)
+    else:
+        outputs = StageOutputWriter("bench", output_dir)
+        start = time.perf_counter()
+        results = await pipeline(full, stage_seconds, outputs.on_stage)
+        done = time.perf_counter()
+        saved = await outputs.finish(results)
+    end = time.perf_counter()
+    assert saved, "save failed"
+    return end - done, end - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stage-ms", type=float, default=50)
+    parser.add_argument("--transcript-kb", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    full = make_results(args.transcript_kb)
+    output_dir = Path(tempfile.mkdtemp(prefix="mapis-stage-bench-"))
+    try:
+        print("=" * 64)
+        print("Stage Output Benchmark")
+        print("=" * 64)
+        print(f"  {len(STAGES)} stage groups x {args.stage_ms:g} ms, ~{args.transcript_kb} KB per transcript\n")
+        for mode in ("at end", "per stage"):
+            timings = [asyncio.run(run(mode, full, args.stage_ms / 1000, output_dir)) for _ in range(args.runs)]
+            tail = statistics.median(t[0] for t in timings)
+            total = statistics.median(t[1] for t in timings)
+            print(f"  {mode:<10} save after last stage {tail * 1000:8.1f} ms   end to end {total * 1000:8.1f} ms")
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Template Render Benchmark
+Per-session time and memory to render every output artifact in memory (no disk I/O)
+
+Renders a full new-app-idea session (simulation, scenarios, feature matrix,
+wireframes) and a feature-extension session through ``plan_outputs``, which
+builds every markdown / text / SVG artifact but writes nothing. Memory is
+the tracemalloc peak during one render plus the number of memory blocks
+allocated and still alive at that point.
+
+Usage:
+    python benchmarks/template_render_benchmark.py [--runs N] [--transcript-kb N]
+"""
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.agents.competitor_matrix import competitor_matrix
+from my_agent.agents.market_scenarios import MarketScenarios
+from my_agent.agents.market_simulation import MarketAssumptions, MarketSimulation
+from my_agent.utils import file_output
+from my_agent.utils.file_output import plan_outputs
+
+
+def make_sessions(transcript_kb: int = 20):
+    """A new-app-idea and a feature-extension result shaped like real runs"""
+    text = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 18 + "\n") * transcript_kb
+    assumptions = MarketAssumptions.from_dict({
+        "users": [2e6, 5e6, 9e6], "arpu_usd": [20, 45, 80], "serviceable_share": [0.2, 0.35, 0.5],
+        "penetration": [0.01, 0.03, 0.06], "growth": [0.1, 0.35, 0.7],
+    })
+    competitors = [{"name": f"Competitor {i}", "description": f"Learning app {i}",
+                    "features": [f"Feature {j}" for j in range(i % 7, i % 7 + 8)]} for i in range(12)]
+    elements = ["Header", "Search Bar", "Card", "List View", "Primary Button", "Tab Bar"]
+    new_app = {
+        "intent": "new_app_idea",
+        "domain": "EdTech",
+        "user_input": "Give me a new idea in the EdTech domain",
+        "keywords": ["learning", "students"],
+        "domain_analysis": {"overview": text[:2000], "trends": ["AI tutors", "Micro-credentials", "Cohort courses"],
+                            "challenges": ["Retention", "Monetization"]},
+        "idea_breakdown": {"problem_statement": "Students lose focus", "value_proposition": "Focused micro-learning",
+                           "target_audience": "University students",
+                           "proposed_features": [f"Feature {i}" for i in range(10)]},
+        "competitor_analysis": {"raw_analysis": text, "top_competitors": competitors,
+                                "feature_matrix": competitor_matrix.summary(competitor_matrix.build(competitors))},
+        "market_size": {"tam": {"value_usd": 1.2e9, "description": "All learners"},
+                        "sam": {"value_usd": 3.1e8, "description": "Students online"},
+                        "som": {"year_1_usd": 1e6, "year_3_usd": 9e6, "year_5_usd": 2.4e7},
+                        "simulation": MarketSimulation(samples=20000, seed=7).run(assumptions),
+                        "scenarios": MarketScenarios().summary(assumptions)},
+        "architecture": {"overview": "Mobile app with a Python API", "components": ["API", "Mobile app", "Worker"],
+                         "tech_stack": ["FastAPI", "React Native", "Postgres"], "architecture_diagram": "app -> api -> db",
+                         "scaling": "Horizontal"},
+        "wireframes": {"wireframes": {f"Screen {i}": {"wireframe": "+------+\n| Home |\n+------+", "elements": elements,
+                                                     "raw_analysis": text[:4000]} for i in range(6)}},
+        "pitch": {"full_text": text[:8000]},
+        "status": "success",
+    }
+    feature = {
+        "intent": "feature_extension",
+        "domain": "FoodTech",
+        "user_input": "Add a voice ordering feature for Swiggy",
+        "keywords": ["voice"],
+        "feature_design": {"feature_request": "Voice ordering", "feature_overview": "Order by voice",
+                           "user_stories": [f"As a user I want {i}" for i in range(8)],
+                           "user_journey": ["Open app", "Tap mic", "Speak order", "Confirm"],
+                           "technical_requirements": ["ASR", "NLU", "Order API"]},
+        "concept_paper": {"full_text": text[:8000]},
+        "competitor_analysis": {"competitors": [{"name": "Zomato", "description": "Food delivery"}, "Uber Eats"],
+                                "differentiation": "Voice first", "market_gaps": ["Accessibility"]},
+        "wireframes": {"wireframes": {"Voice Order": {"wireframe": "[ mic ]", "elements": ["Microphone Button"]}}},
+        "architecture": {"raw_architecture": "skipped for feature extensions"},
+        "pitch": {"full_text": text[:4000]},
+        "status": "success",
+    }
+    return new_app, feature
+
+
+def render(sessions):
+    return [plan_outputs(results, "bench", Path("/nonexistent")) for results in sessions]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--transcript-kb", type=int, default=20)
+    args = parser.parse_args()
+
+    # PDFs render on their own process pool (benchmarks/pdf_export_benchmark.py)
+    file_output.OUTPUT_PDF = False
+    sessions = make_sessions(args.transcript_kb)
+    render(sessions)
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        render(sessions)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    plans = render(sessions)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+    artifacts = sum(len(plan.artifacts) for plan in plans)
+    print("=" * 64)
+    print("Template Render Benchmark")
+    print("=" * 64)
+    print(f"  {len(sessions)} sessions, {artifacts} artifacts, ~{args.transcript_kb} KB transcripts\n")
+    print(f"  render per session   median {statistics.median(timings) / len(sessions) * 1000:7.2f} ms   "
+          f"best {min(timings) / len(sessions) * 1000:7.2f} ms")
+    print(f"  peak traced memory   {peak / 1024:9.1f} KB")
+    print(f"  blocks still held    {blocks:9,d}")
+
+
+if __name__ == "__main__":
+    main()
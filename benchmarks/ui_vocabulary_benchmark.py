@@ -0,0 +1,85 @@
+"""
+UI Vocabulary Benchmark
+Shows element extraction cost against response length and vocabulary size,
+for the compiled single-pass matcher and a per-term substring scan
+
+Usage:
+    python benchmarks/ui_vocabulary_benchmark.py [--repeat N]
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.tools.ui_vocabulary import UIVocabulary, ui_vocabulary
+
+FILLER = ("the screen shows a list of recent items with clear labels and the user can scroll "
+          "through them before choosing what to open next while the layout adapts to the device").split()
+
+
+def make_vocabulary(size: int, rng: random.Random) -> UIVocabulary:
+    """The bundled vocabulary padded with synthetic component names up to roughly ``size`` terms"""
+    entries = UIVocabulary.parse(open(ui_vocabulary.path, encoding="utf-8"))
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(max(size // 2, 1))]
+    while sum(1 + len(s) for s in entries.values()) < size:
+        name = " ".join(rng.sample(words, rng.randint(1, 3))).title()
+        entries[name] = [" ".join(rng.sample(words, rng.randint(1, 3))) for _ in range(3)]
+    return UIVocabulary(entries)
+
+
+def make_text(chars: int, vocabulary: UIVocabulary, rng: random.Random) -> str:
+    """Prose with an element mention every ~15 words"""
+    terms = list(vocabulary.terms)
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(terms) if rng.random() < 0.07 else rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def substring_scan(vocabulary: UIVocabulary, text: str):
+    """The previous approach: one lowercase substring search per term"""
+    lowered = text.lower()
+    return [canonical for term, canonical in vocabulary.terms.items() if term in lowered]
+
+
+def best_ms(repeat, fn, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    print("=" * 72)
+    print("UI Vocabulary Benchmark")
+    print("=" * 72)
+    print(f"  {'terms':>7} {'compile':>10} {'text':>9} {'single pass':>13} {'per KB':>10} {'substring scan':>16}")
+    for size in (400, 2_000, 10_000, 50_000):
+        vocabulary = make_vocabulary(size, rng)
+        start = time.perf_counter()
+        vocabulary.pattern
+        compile_ms = (time.perf_counter() - start) * 1000
+        for chars in (2_000, 20_000, 200_000):
+            text = make_text(chars, vocabulary, rng)
+            single = best_ms(args.repeat, vocabulary.extract, text)
+            scan = best_ms(args.repeat, substring_scan, vocabulary, text)
+            print(f"  {len(vocabulary):>7,} {compile_ms:>8.0f}ms {len(text):>9,} {single:>11.2f}ms "
+                  f"{single / len(text) * 1000:>8.3f}ms {scan:>14.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Wireframe Rendering Benchmark
+Measures screens/sec for the grid layout engine's ASCII and SVG batch renderers
+
+Usage:
+    python benchmarks/wireframe_render_benchmark.py [--screens N]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_agent.tools.wireframe_layout import render_many, render_screen
+from my_agent.tools.wireframe_svg import render_svgs
+
+ELEMENTS = [
+    "Login Button", "Sign Up Button", "Search Bar", "Navigation Menu", "User Profile",
+    "Settings", "Home Button", "Back Button", "Submit Button", "Input Field", "Dropdown",
+    "Image carousel showing featured courses with autoplay and swipe gestures",
+    "Video Player", "Text Area",
+]
+
+
+def legacy_wireframe(screen_name: str, elements) -> str:
+    """The original single-column string-concatenation renderer"""
+    width = 50
+    wireframe = f"\n[{screen_name}]\n"
+    wireframe += "-" * width + "\n"
+    for element in elements:
+        wireframe += f"| {element:<{width-4}} |\n"
+    wireframe += "-" * width + "\n"
+    return wireframe
+
+
+def make_screens(count: int, nested: bool):
+    rng = random.Random(7)
+    screens = {}
+    for n in range(count):
+        elements = rng.sample(ELEMENTS, 6)
+        if nested:
+            elements.insert(2, rng.sample(ELEMENTS, 3))
+        screens[f"Screen {n}"] = elements
+    return screens
+
+
+def rate(label: str, count: int, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<40} {count / elapsed:>10,.0f} screens/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--screens", type=int, default=5000)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Wireframe Rendering Benchmark")
+    print(f"screens={args.screens}")
+    print("=" * 60)
+
+    flat = make_screens(args.screens, nested=False)
+    nested = make_screens(args.screens, nested=True)
+
+    print("\nFlat screens (6 elements)")
+    rate("legacy string concatenation", args.screens, lambda: [legacy_wireframe(k, v) for k, v in flat.items()])
+    rate("render_screen (fresh grid per screen)", args.screens, lambda: [render_screen(k, v) for k, v in flat.items()])
+    rate("render_many (shared grid)", args.screens, lambda: render_many(flat))
+
+    print("\nScreens with a 3-column row")
+    rate("render_many (shared grid)", args.screens, lambda: render_many(nested))
+
+    print("\nSVG (per-screen documents + combined sheet)")
+    rate("render_svgs, flat", args.screens, lambda: render_svgs(flat))
+    rate("render_svgs, with a 3-column row", args.screens, lambda: render_svgs(nested))
+
+
+if __name__ == "__main__":
+    main()
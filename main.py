@@ -10,7 +10,7 @@ from dotenv import load_dotenv
 
 from my_agent.orchestrator import MAPISOrchestrator
 from my_agent.utils.logger import logger
-from my_agent.utils.file_output import save_outputs_to_files
+from my_agent.utils.file_output import OUTPUT_RETENTION_DAYS, StageOutputWriter, apply_output_retention
 
 # Load environment variables from .env file
 project_root = Path(__file__).parent
@@ -60,8 +60,15 @@ async def main():
         print("-" * 60)
     
     try:
+        # Output files are written as each stage finishes, while later stages are still running
+        outputs = StageOutputWriter(session_id="session_1")
+        orchestrator.add_stage_listener(outputs.on_stage)
+        
         # Process the request
-        result = await orchestrator.process(user_input, session_id="session_1")
+        try:
+            result = await orchestrator.process(user_input, session_id="session_1")
+        finally:
+            orchestrator.remove_stage_listener(outputs.on_stage)
         
         # Display results
         print("\n" + "=" * 60)
@@ -70,6 +77,10 @@ async def main():
         
         if result.get("status") == "error":
             print(f"Error: {result.get('error')}")
+            # Keep whatever stages finished before the failure
+            saved_files = await outputs.finish(result)
+            if saved_files:
+                print(f"Partial outputs saved to: {outputs.session_dir}")
             return
         
         # Display summary
@@ -94,8 +105,14 @@ async def main():
             market = result.get("market_size", {})
             tam = market.get("tam", {}).get("value_usd", 0)
             sam = market.get("sam", {}).get("value_usd", 0)
-            print(f"TAM: ${tam:,}")
-            print(f"SAM: ${sam:,}")
+            print(f"TAM: ${tam:,.0f}")
+            print(f"SAM: ${sam:,.0f}")
+            som = market.get("som", {}).get("year_3_usd", 0)
+            print(f"SOM (year 3): ${som:,.0f}")
+            simulation = market.get("simulation")
+            if simulation:
+                tam_range = simulation["tam"]["percentiles"]
+                print(f"TAM 90% range: ${tam_range['p5']:,.0f} - ${tam_range['p95']:,.0f} ({simulation['samples']:,} samples)")
             
             print("\n--- PITCH ---")
             pitch = result.get("pitch", {}).get("full_text", "")
@@ -111,10 +128,10 @@ async def main():
             concept = result.get("concept_paper", {}).get("full_text", "")
             print(concept[:500] + "..." if len(concept) > 500 else concept)
         
-        # Save outputs to files
+        # Finish writing outputs (most files are already on disk) and regenerate the README
         print("\n" + "=" * 60)
         print("Saving outputs to files...")
-        saved_files = save_outputs_to_files(result, session_id="session_1")
+        saved_files = await outputs.finish(result)
         
         if saved_files:
             print(f"\n✓ Saved {len(saved_files)} output files:")
@@ -124,6 +141,10 @@ async def main():
             print(f"\nAll files saved to: {Path(saved_files.get('readme', '')).parent if saved_files.get('readme') else 'outputs/'}")
         else:
             print("⚠ No files were saved.")
+
+        if OUTPUT_RETENTION_DAYS:
+            # Drop runs past the retention period (and anything only they referenced)
+            await asyncio.get_running_loop().run_in_executor(None, apply_output_retention)
         
         print("\n" + "=" * 60)
         print("Full results saved to session memory and files.")
@@ -3,14 +3,29 @@ Architecture Suggestion Agent
 Generates technical blueprints for new app ideas
 """
 from google.adk.agents.llm_agent import Agent
+from pydantic import Field
 from typing import Dict, Any, List
 import structlog
-from ..utils.agent_helper import call_agent
+from ..utils.agent_helper import call_agent, parse_response, StructuredResponse
 from ..utils.prompts import ARCHITECTURE_INSTRUCTION, ARCHITECTURE_PROMPT_TEMPLATE
 
 logger = structlog.get_logger(__name__)
 
 
+class ArchitectureSuggestion(StructuredResponse):
+    """Response schema for the architecture suggestion agent"""
+    system_architecture: str = Field("", description="Architecture style and a short description of the system")
+    core_services: List[str] = Field(default_factory=list, description="Core services with one-line responsibilities")
+    database_design: str = Field("", description="Databases chosen and the main entities")
+    api_design: str = Field("", description="API style and the main endpoints")
+    third_party_integrations: List[str] = Field(default_factory=list, description="External services and APIs")
+    technology_stack: List[str] = Field(default_factory=list, description="Technologies, e.g. 'Backend: FastAPI'")
+    scalability_considerations: List[str] = Field(default_factory=list)
+    security_considerations: List[str] = Field(default_factory=list)
+    deployment_strategy: str = Field("", description="Hosting and deployment approach")
+    document: str = Field("", description="The complete architecture specification in Markdown, following the output format in your instructions")
+
+
 class ArchitectureSuggestionAgent:
     """Suggests technical architecture for products"""
     
@@ -19,7 +34,8 @@ class ArchitectureSuggestionAgent:
             model=model,
             name='architecture_suggestion_agent',
             description='Suggests technical architecture for products',
-            instruction=self._get_instruction()
+            instruction=self._get_instruction(),
+            output_schema=ArchitectureSuggestion
         )
         logger.info("ArchitectureSuggestionAgent initialized")
     
@@ -50,18 +66,11 @@ class ArchitectureSuggestionAgent:
             prompt = ARCHITECTURE_PROMPT_TEMPLATE.format(context=context)
             
             response = await call_agent(self.agent, prompt)
+            architecture = parse_response(response, ArchitectureSuggestion) or ArchitectureSuggestion(document=str(response))
             
             result = {
-                "system_architecture": "",
-                "core_services": [],
-                "database_design": {},
-                "api_design": {},
-                "third_party_integrations": [],
-                "technology_stack": {},
-                "scalability_considerations": [],
-                "security_considerations": [],
-                "deployment_strategy": "",
-                "raw_architecture": str(response)
+                **architecture.model_dump(exclude={"document"}),
+                "raw_architecture": architecture.document
             }
             
             logger.info("Architecture suggestion completed")
@@ -3,15 +3,35 @@ Competitor Analysis Agent
 Researches competitors and identifies differentiation opportunities
 """
 from google.adk.agents.llm_agent import Agent
-from typing import Dict, Any, List
+from pydantic import Field
+from typing import Dict, Any, List, Optional, Awaitable
 import structlog
+from .competitor_matrix import competitor_matrix
 from ..tools.google_search import google_search
-from ..utils.agent_helper import call_agent
+from ..utils.agent_helper import call_agent, parse_response, StructuredResponse
 from ..utils.prompts import COMPETITOR_ANALYSIS_INSTRUCTION, COMPETITOR_ANALYSIS_PROMPT_TEMPLATE
 
 logger = structlog.get_logger(__name__)
 
 
+class Competitor(StructuredResponse):
+    name: str
+    description: str = ""
+    features: List[str] = Field(default_factory=list, description="Key features, one short phrase each")
+    strengths: List[str] = Field(default_factory=list)
+    weaknesses: List[str] = Field(default_factory=list)
+    pricing: str = Field("", description="Pricing model and price points")
+
+
+class CompetitorAnalysis(StructuredResponse):
+    """Response schema for the competitor analysis agent"""
+    top_competitors: List[Competitor] = Field(default_factory=list, description="The 3-7 most relevant competitors")
+    market_gaps: List[str] = Field(default_factory=list, description="Needs no competitor serves well")
+    differentiation_opportunities: List[str] = Field(default_factory=list, description="Concrete ways to stand out")
+    market_positioning: str = Field("", description="Recommended positioning for the product")
+    document: str = Field("", description="The complete competitive analysis in Markdown, following the output format in your instructions")
+
+
 class CompetitorAnalysisAgent:
     """Analyzes competitors and identifies differentiation"""
     
@@ -20,14 +40,15 @@ class CompetitorAnalysisAgent:
             model=model,
             name='competitor_analysis_agent',
             description='Analyzes competitors and market positioning',
-            instruction=self._get_instruction()
+            instruction=self._get_instruction(),
+            output_schema=CompetitorAnalysis
         )
         logger.info("CompetitorAnalysisAgent initialized")
     
     def _get_instruction(self) -> str:
         return COMPETITOR_ANALYSIS_INSTRUCTION
     
-    async def analyze(self, domain: str, product_type: str, idea_context: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def analyze(self, domain: str, product_type: str, idea_context: Dict[str, Any] = None, search_results: Optional[Awaitable[List[Dict[str, Any]]]] = None) -> Dict[str, Any]:
         """
         Analyze competitors
         
@@ -35,6 +56,7 @@ class CompetitorAnalysisAgent:
             domain: Domain name
             product_type: Type of product
             idea_context: Optional context about the idea/product
+            search_results: Optional pre-fetched competitor results (e.g. from a SearchPlan)
             
         Returns:
             Competitor analysis with top players, feature comparison, gaps
@@ -42,13 +64,16 @@ class CompetitorAnalysisAgent:
         logger.info("Analyzing competitors", domain=domain, product_type=product_type)
         
         try:
-            # Search for competitors
-            competitor_results = await google_search.search_competitors(domain, product_type)
+            # Search for competitors (unless the run already planned the search)
+            if search_results is not None:
+                competitor_results = await search_results
+            else:
+                competitor_results = await google_search.search_competitors(domain, product_type)
             
             # Build context
             context = f"Domain: {domain}\nProduct Type: {product_type}\n\n"
             if idea_context:
-                context += f"Idea Context: {idea_context}\n\n"
+                context += self._summarize_context(idea_context)
             if competitor_results:
                 context += "Competitor Search Results:\n"
                 for i, result in enumerate(competitor_results[:5], 1):
@@ -57,17 +82,20 @@ class CompetitorAnalysisAgent:
             prompt = COMPETITOR_ANALYSIS_PROMPT_TEMPLATE.format(context=context)
             
             response = await call_agent(self.agent, prompt)
+            analysis = parse_response(response, CompetitorAnalysis) or CompetitorAnalysis(document=str(response))
+            
+            # Parse the per-competitor feature lists once into a competitor x feature matrix
+            analysis_data = analysis.model_dump(exclude={"document"})
+            matrix = competitor_matrix.build(analysis_data["top_competitors"])
             
             result = {
                 "domain": domain,
                 "product_type": product_type,
-                "top_competitors": [],
-                "feature_comparison": {},
-                "market_gaps": [],
-                "differentiation_opportunities": [],
-                "pricing_models": {},
-                "market_positioning": {},
-                "raw_analysis": str(response)
+                **analysis_data,
+                "feature_comparison": {feature: matrix.index[matrix[feature]].tolist() for feature in matrix.columns},
+                "feature_matrix": competitor_matrix.summary(matrix),
+                "pricing_models": {c.name: c.pricing for c in analysis.top_competitors if c.pricing},
+                "raw_analysis": analysis.document
             }
             
             logger.info("Competitor analysis completed", domain=domain)
@@ -80,4 +108,18 @@ class CompetitorAnalysisAgent:
                 "product_type": product_type,
                 "error": str(e)
             }
+    
+    def _summarize_context(self, idea_context: Dict[str, Any]) -> str:
+        """Key facts about the idea or feature, rather than the whole upstream result"""
+        context = ""
+        for label, key in (("Idea", "original_idea"), ("Feature", "feature_request"), ("Problem", "problem_statement"),
+                           ("Value Proposition", "value_proposition"), ("Overview", "feature_overview")):
+            if idea_context.get(key):
+                context += f"{label}: {idea_context[key]}\n"
+        features = idea_context.get("proposed_features") or idea_context.get("user_stories") or []
+        if features:
+            context += "Planned Features:\n"
+            for feature in features[:5]:
+                context += f"- {feature}\n"
+        return context + "\n" if context else ""
 
@@ -0,0 +1,212 @@
+"""
+Competitor Matrix
+Columnar competitor x feature matrix with vectorized scoring, gap detection and cross-run aggregation
+"""
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_GAP_SHARE = 1 / 3
+
+
+def _normalize(labels: pd.Series) -> pd.Series:
+    """Matching key for free-text names: trimmed, case-folded, single-spaced"""
+    # Names repeat heavily, so normalize each distinct spelling once
+    codes, uniques = pd.factorize(labels)
+    keys = pd.Series(uniques, dtype=object).astype(str).str.strip().str.casefold().str.replace(r"\s+", " ", regex=True)
+    return pd.Series(keys.to_numpy(dtype=object)[codes], index=labels.index, dtype=object)
+
+
+class CompetitorMatrix:
+    """
+    Turns per-competitor feature lists into a boolean DataFrame and scores it
+
+    The matrix is indexed by competitor with one column per feature; features
+    are matched case- and whitespace-insensitively and labelled by their first
+    spelling. All scoring is done on the whole matrix at once, and the
+    JSON-safe ``summary`` is what gets stored in the competitor results.
+    """
+
+    def __init__(self, gap_share: float = DEFAULT_GAP_SHARE):
+        self.gap_share = gap_share
+
+    @staticmethod
+    def long_frame(competitors: List[Dict[str, Any]], extra: Optional[List[tuple]] = None,
+                   extra_columns: Sequence[str] = ()) -> pd.DataFrame:
+        """
+        One row per (competitor, feature) pair, with normalized match keys
+
+        ``extra`` optionally gives a tuple of additional column values per
+        competitor (named by ``extra_columns``), e.g. the run it came from.
+        """
+        extra = extra or [()] * len(competitors)
+        rows = [(c.get("name", ""), feature, *values) for c, values in zip(competitors, extra) if c.get("name")
+                for feature in c.get("features") or [] if str(feature).strip()]
+        long = pd.DataFrame(rows, columns=["competitor", "feature", *extra_columns])
+        long["competitor_key"] = _normalize(long["competitor"])
+        long["feature_key"] = _normalize(long["feature"])
+        return long
+
+    def build(self, competitors: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Competitor x feature matrix
+
+        Args:
+            competitors: ``top_competitors`` entries (dicts with name and features)
+
+        Returns:
+            Boolean DataFrame indexed by competitor, columns ordered by how many
+            competitors offer each feature (most common first)
+        """
+        names = list(dict.fromkeys(c["name"] for c in competitors if c.get("name")))
+        long = self.long_frame(competitors)
+        if long.empty:
+            return pd.DataFrame(index=pd.Index(names, name="competitor"), dtype=bool)
+
+        # Scatter the pairs into a dense boolean array; factorize keeps first-seen order
+        rows = pd.Index(names).get_indexer(long["competitor"])
+        columns, _ = pd.factorize(long["feature_key"])
+        values = np.zeros((len(names), columns.max() + 1), dtype=bool)
+        values[rows, columns] = True
+        _, first_seen = np.unique(columns, return_index=True)
+        labels = long["feature"].to_numpy()[first_seen]
+
+        order = np.argsort(-values.sum(axis=0), kind="stable")
+        return pd.DataFrame(values[:, order], index=pd.Index(names, name="competitor"),
+                            columns=pd.Index(labels[order], name="feature"))
+
+    @staticmethod
+    def score(matrix: pd.DataFrame, weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """
+        Weighted feature coverage and ranking for every competitor
+
+        Args:
+            matrix: Boolean matrix from ``build``
+            weights: Optional feature -> weight; by default a feature is weighted
+                by the share of competitors offering it (table stakes count most)
+
+        Returns:
+            DataFrame indexed by competitor with features, unique_features,
+            coverage (0-1 weighted share of all features) and rank (1 = best)
+        """
+        values = matrix.to_numpy(dtype=float)
+        offered_by = values.sum(axis=0)
+        if weights is None:
+            w = offered_by / max(len(matrix.index), 1)
+        else:
+            w = matrix.columns.to_series().map(weights).fillna(1.0).to_numpy(dtype=float)
+        total = w.sum()
+
+        scores = pd.DataFrame({
+            "features": values.sum(axis=1).astype(int),
+            "unique_features": values[:, offered_by == 1].sum(axis=1).astype(int),
+            # Rounded so float noise cannot split ties in the ranking
+            "coverage": np.round(values @ w / total, 6) if total else np.zeros(len(matrix.index)),
+        }, index=matrix.index)
+        scores["rank"] = scores["coverage"].rank(ascending=False, method="min").astype(int)
+        return scores.sort_values(["rank", "unique_features"], ascending=[True, False])
+
+    def gaps(self, matrix: pd.DataFrame, max_share: Optional[float] = None) -> pd.DataFrame:
+        """
+        Underserved features: offered by at most ``max_share`` of competitors
+
+        Returns:
+            DataFrame indexed by feature with offered_by, share and the
+            competitors offering it, rarest first
+        """
+        max_share = self.gap_share if max_share is None else max_share
+        offered_by = matrix.sum(axis=0)
+        share = offered_by / max(len(matrix.index), 1)
+        rare = matrix.loc[:, (share <= max_share).to_numpy()]
+        # Names per rare feature from the transposed matrix in one pass
+        holders = rare.T.dot(matrix.index.to_series().add(", ")).str.rstrip(", ")
+        gaps = pd.DataFrame({
+            "offered_by": offered_by[rare.columns].astype(int),
+            "share": share[rare.columns],
+            "competitors": holders,
+        })
+        return gaps.sort_values("offered_by", kind="stable")
+
+    def summary(self, matrix: pd.DataFrame, weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        JSON-serializable matrix, scores and gaps, as stored in the competitor results
+
+        Use ``matrix_frame`` / ``scores_frame`` / ``gaps_frame`` to turn it back into DataFrames.
+        """
+        return {
+            "competitors": matrix.index.tolist(),
+            "features": matrix.columns.tolist(),
+            "matrix": matrix.to_numpy(dtype=int).tolist(),
+            "scores": self.score(matrix, weights).reset_index().to_dict(orient="records"),
+            "gaps": self.gaps(matrix).reset_index().to_dict(orient="records")
+        }
+
+    @staticmethod
+    def matrix_frame(summary: Dict[str, Any]) -> pd.DataFrame:
+        return pd.DataFrame(np.asarray(summary["matrix"], dtype=bool).reshape(len(summary["competitors"]), len(summary["features"])),
+                            index=pd.Index(summary["competitors"], name="competitor"),
+                            columns=pd.Index(summary["features"], name="feature"))
+
+    @staticmethod
+    def scores_frame(summary: Dict[str, Any]) -> pd.DataFrame:
+        return pd.DataFrame.from_records(summary["scores"], index="competitor",
+                                         columns=["competitor", "features", "unique_features", "coverage", "rank"])
+
+    @staticmethod
+    def gaps_frame(summary: Dict[str, Any]) -> pd.DataFrame:
+        return pd.DataFrame.from_records(summary["gaps"], index="feature",
+                                         columns=["feature", "offered_by", "share", "competitors"])
+
+    def aggregate(self, analyses: Iterable[Dict[str, Any]]) -> Dict[str, pd.DataFrame]:
+        """
+        Roll up competitor analyses from many runs
+
+        Args:
+            analyses: ``competitor_analysis`` results (each with domain and top_competitors)
+
+        Returns:
+            Dict with "competitors" (runs, domains and distinct features per
+            competitor) and "features" (competitors and runs per feature, and
+            the share of all competitors offering it), most frequent first
+        """
+        competitors, extra = [], []
+        for run, analysis in enumerate(analyses):
+            for competitor in analysis.get("top_competitors") or []:
+                competitors.append(competitor)
+                extra.append((run, analysis.get("domain", "")))
+        # One frame for every run, so the string work happens once per distinct name
+        long = self.long_frame(competitors, extra, ("run", "domain"))
+        if long.empty:
+            return {"competitors": pd.DataFrame(), "features": pd.DataFrame()}
+
+        # Categoricals keep the grouping cheap when the same names repeat across thousands of rows
+        for column in ("competitor_key", "feature_key", "domain"):
+            long[column] = long[column].astype("category")
+
+        by_competitor = long.groupby("competitor_key", observed=True)
+        competitors = pd.DataFrame({
+            "competitor": by_competitor["competitor"].first(),
+            "runs": by_competitor["run"].nunique(),
+            "domains": by_competitor["domain"].nunique(),
+            "features": by_competitor["feature_key"].nunique(),
+        }).set_index("competitor").sort_values(["runs", "features"], ascending=False)
+
+        by_feature = long.groupby("feature_key", observed=True)
+        total = long["competitor_key"].nunique()
+        features = pd.DataFrame({
+            "feature": by_feature["feature"].first(),
+            "competitors": by_feature["competitor_key"].nunique(),
+            "runs": by_feature["run"].nunique(),
+        }).set_index("feature")
+        features["share"] = features["competitors"] / total if total else 0.0
+        features = features.sort_values(["competitors", "runs"], ascending=False)
+
+        logger.debug("Aggregated competitor analyses", runs=long["run"].nunique(), competitors=total, features=len(features))
+        return {"competitors": competitors, "features": features}
+
+
+# Global instance
+competitor_matrix = CompetitorMatrix()
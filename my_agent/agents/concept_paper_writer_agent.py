@@ -3,14 +3,31 @@ Concept Paper Writer Agent
 Generates enterprise-style concept papers
 """
 from google.adk.agents.llm_agent import Agent
-from typing import Dict, Any
+from pydantic import Field
+from typing import Dict, Any, List
 import structlog
-from ..utils.agent_helper import call_agent
+from ..utils.agent_helper import call_agent, parse_response, StructuredResponse
 from ..utils.prompts import CONCEPT_PAPER_INSTRUCTION, CONCEPT_PAPER_PROMPT_TEMPLATE
 
 logger = structlog.get_logger(__name__)
 
 
+class ConceptPaper(StructuredResponse):
+    """Response schema for the concept paper writer agent"""
+    executive_summary: str = ""
+    background: str = ""
+    problem_statement: str = ""
+    personas: List[str] = Field(default_factory=list)
+    proposed_solution: str = ""
+    user_journeys: List[str] = Field(default_factory=list)
+    technical_overview: str = ""
+    kpis: List[str] = Field(default_factory=list)
+    risks_mitigation: List[str] = Field(default_factory=list, description="Each item: a risk and its mitigation")
+    rollout_plan: List[str] = Field(default_factory=list, description="Ordered rollout phases")
+    open_questions: List[str] = Field(default_factory=list)
+    document: str = Field("", description="The complete concept paper in Markdown, following the output format in your instructions")
+
+
 class ConceptPaperWriterAgent:
     """Writes enterprise-style concept papers"""
     
@@ -19,7 +36,8 @@ class ConceptPaperWriterAgent:
             model=model,
             name='concept_paper_writer_agent',
             description='Writes enterprise-style concept papers',
-            instruction=self._get_instruction()
+            instruction=self._get_instruction(),
+            output_schema=ConceptPaper
         )
         logger.info("ConceptPaperWriterAgent initialized")
     
@@ -55,22 +73,11 @@ class ConceptPaperWriterAgent:
             prompt = CONCEPT_PAPER_PROMPT_TEMPLATE.format(context=context)
             
             response = await call_agent(self.agent, prompt)
+            paper = parse_response(response, ConceptPaper) or ConceptPaper(document=str(response))
             
             result = {
-                "concept_paper": {
-                    "executive_summary": "",
-                    "background": "",
-                    "problem_statement": "",
-                    "personas": [],
-                    "proposed_solution": "",
-                    "user_journeys": [],
-                    "technical_overview": "",
-                    "kpis": [],
-                    "risks_mitigation": {},
-                    "rollout_plan": [],
-                    "open_questions": []
-                },
-                "full_text": str(response),
+                "concept_paper": paper.model_dump(exclude={"document"}),
+                "full_text": paper.document,
                 "app_name": app_name
             }
             
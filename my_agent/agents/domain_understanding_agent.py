@@ -3,15 +3,26 @@ Domain Understanding Agent
 Analyzes domain, identifies pain points, user segments, trends, and market gaps
 """
 from google.adk.agents.llm_agent import Agent
-from typing import Dict, Any, List
+from pydantic import Field
+from typing import Dict, Any, List, Optional, Awaitable
 import structlog
 from ..tools.google_search import google_search
-from ..utils.agent_helper import call_agent
+from ..utils.agent_helper import call_agent, parse_response, StructuredResponse
 from ..utils.prompts import DOMAIN_UNDERSTANDING_INSTRUCTION, DOMAIN_UNDERSTANDING_PROMPT_TEMPLATE
 
 logger = structlog.get_logger(__name__)
 
 
+class DomainAnalysis(StructuredResponse):
+    """Response schema for the domain understanding agent"""
+    pain_points: List[str] = Field(default_factory=list, description="Key user pain points, one per item")
+    user_segments: List[str] = Field(default_factory=list, description="Distinct user segments")
+    trends: List[str] = Field(default_factory=list, description="Current market and technology trends")
+    market_gaps: List[str] = Field(default_factory=list, description="Unserved needs and opportunity gaps")
+    key_players: List[str] = Field(default_factory=list, description="Notable companies or products in the domain")
+    document: str = Field("", description="The complete domain analysis in Markdown, following the output format in your instructions")
+
+
 class DomainUnderstandingAgent:
     """Analyzes domains for product opportunities"""
     
@@ -20,20 +31,22 @@ class DomainUnderstandingAgent:
             model=model,
             name='domain_understanding_agent',
             description='Analyzes domains to identify opportunities and pain points',
-            instruction=self._get_instruction()
+            instruction=self._get_instruction(),
+            output_schema=DomainAnalysis
         )
         logger.info("DomainUnderstandingAgent initialized")
     
     def _get_instruction(self) -> str:
         return DOMAIN_UNDERSTANDING_INSTRUCTION
     
-    async def analyze(self, domain: str, keywords: List[str] = None) -> Dict[str, Any]:
+    async def analyze(self, domain: str, keywords: List[str] = None, search_results: Optional[Awaitable[List[Dict[str, Any]]]] = None) -> Dict[str, Any]:
         """
         Analyze a domain
         
         Args:
             domain: Domain name (e.g., "EdTech", "FinTech")
             keywords: Optional keywords to focus on
+            search_results: Optional pre-fetched market trend results (e.g. from a SearchPlan)
             
         Returns:
             Domain analysis with pain points, segments, trends, gaps
@@ -41,8 +54,11 @@ class DomainUnderstandingAgent:
         logger.info("Analyzing domain", domain=domain, keywords=keywords)
         
         try:
-            # Search for market trends
-            trends_results = await google_search.search_market_trends(domain)
+            # Search for market trends (unless the run already planned the search)
+            if search_results is not None:
+                trends_results = await search_results
+            else:
+                trends_results = await google_search.search_market_trends(domain)
             
             # Build context for the agent
             context = f"Domain: {domain}\n"
@@ -56,16 +72,13 @@ class DomainUnderstandingAgent:
             prompt = DOMAIN_UNDERSTANDING_PROMPT_TEMPLATE.format(domain=domain, context=context)
             
             response = await call_agent(self.agent, prompt)
+            analysis = parse_response(response, DomainAnalysis) or DomainAnalysis(document=str(response))
             
             # Structure the response
             result = {
                 "domain": domain,
-                "pain_points": [],
-                "user_segments": [],
-                "trends": [],
-                "market_gaps": [],
-                "key_players": [],
-                "raw_analysis": str(response)
+                **analysis.model_dump(exclude={"document"}),
+                "raw_analysis": analysis.document
             }
             
             logger.info("Domain analysis completed", domain=domain)
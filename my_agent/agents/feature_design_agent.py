@@ -3,14 +3,30 @@ Feature Design Agent
 Designs features for existing applications
 """
 from google.adk.agents.llm_agent import Agent
+from pydantic import Field
 from typing import Dict, Any, List
 import structlog
-from ..utils.agent_helper import call_agent
+from ..utils.agent_helper import call_agent, parse_response, StructuredResponse
 from ..utils.prompts import FEATURE_DESIGN_INSTRUCTION, FEATURE_DESIGN_PROMPT_TEMPLATE
 
 logger = structlog.get_logger(__name__)
 
 
+class FeatureDesign(StructuredResponse):
+    """Response schema for the feature design agent"""
+    feature_overview: str = Field("", description="One-paragraph overview of the feature")
+    user_journey: List[str] = Field(default_factory=list, description="Ordered steps of the user journey")
+    screens: List[str] = Field(default_factory=list, description="Names of the 1-5 screens the feature adds or changes")
+    epics: List[str] = Field(default_factory=list, description="Epic titles")
+    user_stories: List[str] = Field(default_factory=list, description="User stories in 'As a ..., I want ..., so that ...' form")
+    acceptance_criteria: List[str] = Field(default_factory=list, description="Key acceptance criteria")
+    ux_impact: str = Field("", description="Impact on the existing user experience")
+    integration_points: List[str] = Field(default_factory=list, description="Existing systems the feature touches")
+    technical_considerations: List[str] = Field(default_factory=list, description="Technical considerations and risks")
+    backward_compatibility: str = Field("", description="Backward compatibility notes")
+    document: str = Field("", description="The complete feature specification in Markdown, following the output format in your instructions")
+
+
 class FeatureDesignAgent:
     """Designs features for existing applications"""
     
@@ -19,7 +35,8 @@ class FeatureDesignAgent:
             model=model,
             name='feature_design_agent',
             description='Designs features for existing applications',
-            instruction=self._get_instruction()
+            instruction=self._get_instruction(),
+            output_schema=FeatureDesign
         )
         logger.info("FeatureDesignAgent initialized")
     
@@ -48,20 +65,13 @@ class FeatureDesignAgent:
             prompt = FEATURE_DESIGN_PROMPT_TEMPLATE.format(context=context)
             
             response = await call_agent(self.agent, prompt)
+            design = parse_response(response, FeatureDesign) or FeatureDesign(document=str(response))
             
             result = {
                 "app_name": app_name,
                 "feature_request": feature_request,
-                "feature_overview": "",
-                "user_journey": [],
-                "epics": [],
-                "user_stories": [],
-                "acceptance_criteria": {},
-                "ux_impact": "",
-                "integration_points": [],
-                "technical_considerations": [],
-                "backward_compatibility": "",
-                "raw_design": str(response)
+                **design.model_dump(exclude={"document"}),
+                "raw_design": design.document
             }
             
             logger.info("Feature design completed", app=app_name)
@@ -3,14 +3,28 @@ Idea Breakdown Agent
 Takes rough ideas and breaks them into structured components
 """
 from google.adk.agents.llm_agent import Agent
-from typing import Dict, Any
+from pydantic import Field
+from typing import Dict, Any, List
 import structlog
-from ..utils.agent_helper import call_agent
+from ..utils.agent_helper import call_agent, parse_response, StructuredResponse
 from ..utils.prompts import IDEA_BREAKDOWN_INSTRUCTION, IDEA_BREAKDOWN_PROMPT_TEMPLATE
 
 logger = structlog.get_logger(__name__)
 
 
+class IdeaBreakdown(StructuredResponse):
+    """Response schema for the idea breakdown agent"""
+    problem_statement: str = Field("", description="One-paragraph problem statement")
+    value_proposition: str = Field("", description="One or two sentence value proposition")
+    target_audience: str = Field("", description="Primary target audience")
+    user_personas: List[str] = Field(default_factory=list, description="Short persona descriptions")
+    proposed_features: List[str] = Field(default_factory=list, description="MVP features, one short phrase each")
+    constraints: List[str] = Field(default_factory=list, description="Technical, legal or business constraints")
+    success_metrics: List[str] = Field(default_factory=list, description="Measurable success metrics")
+    key_screens: List[str] = Field(default_factory=list, description="Names of the 3-6 most important app screens")
+    document: str = Field("", description="The complete idea breakdown in Markdown, following the output format in your instructions")
+
+
 class IdeaBreakdownAgent:
     """Breaks down rough ideas into structured components"""
     
@@ -19,7 +33,8 @@ class IdeaBreakdownAgent:
             model=model,
             name='idea_breakdown_agent',
             description='Breaks down product ideas into structured components',
-            instruction=self._get_instruction()
+            instruction=self._get_instruction(),
+            output_schema=IdeaBreakdown
         )
         logger.info("IdeaBreakdownAgent initialized")
     
@@ -51,16 +66,12 @@ class IdeaBreakdownAgent:
             prompt = IDEA_BREAKDOWN_PROMPT_TEMPLATE.format(context=context)
             
             response = await call_agent(self.agent, prompt)
+            breakdown = parse_response(response, IdeaBreakdown) or IdeaBreakdown(document=str(response))
             
             result = {
                 "original_idea": idea,
-                "problem_statement": "",
-                "value_proposition": "",
-                "user_personas": [],
-                "proposed_features": [],
-                "constraints": [],
-                "success_metrics": [],
-                "raw_breakdown": str(response)
+                **breakdown.model_dump(exclude={"document"}),
+                "raw_breakdown": breakdown.document
             }
             
             logger.info("Idea breakdown completed")
@@ -3,15 +3,23 @@ Intent Classification Agent
 Determines whether user wants new app idea or feature extension
 """
 from google.adk.agents.llm_agent import Agent
-from typing import Dict, Any
-import json
+from pydantic import Field
+from typing import Dict, Any, List, Literal, Optional
 import structlog
-from ..utils.agent_helper import call_agent
+from ..utils.agent_helper import call_agent, parse_response, StructuredResponse
 from ..utils.prompts import INTENT_CLASSIFICATION_INSTRUCTION
 
 logger = structlog.get_logger(__name__)
 
 
+class IntentClassification(StructuredResponse):
+    """Response schema for the intent classification agent"""
+    intent: Literal["new_app_idea", "feature_extension"]
+    domain: Optional[str] = Field(None, description="Domain such as EdTech or FinTech, or null if unclear")
+    keywords: List[str] = Field(default_factory=list, description="3-7 keywords capturing the request")
+    confidence: float = Field(0.5, ge=0.0, le=1.0)
+
+
 class IntentClassificationAgent:
     """Classifies user intent: new_app_idea or feature_extension"""
     
@@ -20,7 +28,8 @@ class IntentClassificationAgent:
             model=model,
             name='intent_classification_agent',
             description='Classifies user intent for product innovation requests',
-            instruction=self._get_instruction()
+            instruction=self._get_instruction(),
+            output_schema=IntentClassification
         )
         logger.info("IntentClassificationAgent initialized")
     
@@ -43,20 +52,9 @@ class IntentClassificationAgent:
             # Use the agent to classify
             response = await call_agent(self.agent, user_input)
             
-            # Parse JSON response
-            # In ADK, response might be in different format, adjust accordingly
-            if isinstance(response, str):
-                # Try to extract JSON from response
-                response_text = response
-            else:
-                response_text = str(response)
-            
-            # Extract JSON from response
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
-            if json_start >= 0 and json_end > json_start:
-                json_str = response_text[json_start:json_end]
-                result = json.loads(json_str)
+            parsed = parse_response(response, IntentClassification)
+            if parsed is not None:
+                result = parsed.model_dump()
             else:
                 # Fallback: create default structure
                 result = {
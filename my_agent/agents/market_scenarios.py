@@ -0,0 +1,136 @@
+"""
+Market Scenarios
+Sensitivity (tornado) analysis and parameter grids over the market sizing model
+"""
+from dataclasses import fields
+from typing import Dict, Any, Optional
+import numpy as np
+import pandas as pd
+import structlog
+from .market_simulation import MarketAssumptions, project_market
+
+logger = structlog.get_logger(__name__)
+
+PARAMETERS = tuple(f.name for f in fields(MarketAssumptions))
+METRICS = ("tam", "sam", "som_year_1", "som_year_3", "som_year_5")
+DEFAULT_METRIC = "som_year_3"
+DEFAULT_POINTS = 50
+
+
+class MarketScenarios:
+    """
+    Deterministic what-if analysis over ranged market assumptions
+
+    Every variation is one element of a broadcast NumPy evaluation of the
+    sizing model (no LLM calls), so a 50 x 50 grid is a single array
+    operation. Parameters not being varied are held at their likely values.
+    """
+
+    def __init__(self, metric: str = DEFAULT_METRIC, points: int = DEFAULT_POINTS):
+        self.metric = metric
+        self.points = points
+
+    def tornado(self, assumptions: MarketAssumptions, metric: Optional[str] = None) -> pd.DataFrame:
+        """
+        One-at-a-time sensitivity of a metric to each assumption
+
+        Returns:
+            DataFrame indexed by parameter with the parameter's low/high values,
+            the metric at each, and the swing, sorted by swing (largest first)
+        """
+        metric = self._check_metric(metric)
+        likely = np.array([getattr(assumptions, name).likely for name in PARAMETERS])
+        # Row 0 is the base case; rows 2i+1 / 2i+2 move parameter i to its low / high
+        scenarios = np.tile(likely, (2 * len(PARAMETERS) + 1, 1))
+        for i, name in enumerate(PARAMETERS):
+            distribution = getattr(assumptions, name)
+            scenarios[2 * i + 1, i] = distribution.low
+            scenarios[2 * i + 2, i] = distribution.high
+        values = project_market(*scenarios.T)[metric]
+
+        frame = pd.DataFrame({
+            "low": scenarios[1::2, :].diagonal(),
+            "high": scenarios[2::2, :].diagonal(),
+            f"{metric}_at_low": values[1::2],
+            f"{metric}_at_high": values[2::2],
+        }, index=pd.Index(PARAMETERS, name="parameter"))
+        frame["swing"] = (frame[f"{metric}_at_high"] - frame[f"{metric}_at_low"]).abs()
+        frame.attrs["base"] = float(values[0])
+        return frame.sort_values("swing", ascending=False)
+
+    def grid(self, assumptions: MarketAssumptions, x: str = "penetration", y: str = "growth",
+             metric: Optional[str] = None, points: Optional[int] = None) -> pd.DataFrame:
+        """
+        Metric over a full grid of two assumptions
+
+        Args:
+            assumptions: Ranged sizing assumptions
+            x: Parameter varied down the rows
+            y: Parameter varied across the columns
+            metric: Metric to evaluate (tam, sam, som_year_1/3/5)
+            points: Grid points per axis, spanning each parameter's low..high
+
+        Returns:
+            DataFrame of shape (points, points) indexed by x values, columns y values
+        """
+        metric = self._check_metric(metric)
+        if x == y or x not in PARAMETERS or y not in PARAMETERS:
+            raise ValueError(f"Grid axes must be two different parameters from {PARAMETERS}")
+        points = points or self.points
+
+        params: Dict[str, Any] = {name: getattr(assumptions, name).likely for name in PARAMETERS}
+        x_values = np.linspace(getattr(assumptions, x).low, getattr(assumptions, x).high, points)
+        y_values = np.linspace(getattr(assumptions, y).low, getattr(assumptions, y).high, points)
+        params[x] = x_values[:, np.newaxis]
+        params[y] = y_values[np.newaxis, :]
+        values = np.broadcast_to(project_market(**params)[metric], (points, points))
+
+        return pd.DataFrame(values, index=pd.Index(x_values, name=x), columns=pd.Index(y_values, name=y))
+
+    def summary(self, assumptions: MarketAssumptions, x: str = "penetration", y: str = "growth") -> Dict[str, Any]:
+        """
+        JSON-serializable tornado and grid, as stored in the market size results
+
+        Use ``grid_frame`` / ``tornado_frame`` to turn it back into DataFrames.
+        """
+        tornado = self.tornado(assumptions)
+        grid = self.grid(assumptions, x, y)
+        return {
+            "metric": self.metric,
+            "base": tornado.attrs["base"],
+            "tornado": tornado.reset_index().to_dict(orient="records"),
+            "grid": {
+                "x": x,
+                "y": y,
+                "x_values": grid.index.tolist(),
+                "y_values": grid.columns.tolist(),
+                "values": grid.to_numpy().tolist()
+            }
+        }
+
+    @staticmethod
+    def tornado_frame(summary: Dict[str, Any]) -> pd.DataFrame:
+        return pd.DataFrame.from_records(summary["tornado"], index="parameter")
+
+    @staticmethod
+    def grid_frame(summary: Dict[str, Any]) -> pd.DataFrame:
+        grid = summary["grid"]
+        return pd.DataFrame(grid["values"], index=pd.Index(grid["x_values"], name=grid["x"]),
+                            columns=pd.Index(grid["y_values"], name=grid["y"]))
+
+    @staticmethod
+    def sample_grid(frame: pd.DataFrame, max_points: int = 8) -> pd.DataFrame:
+        """Evenly spaced rows and columns of a grid, small enough to read as a table"""
+        rows = np.unique(np.linspace(0, len(frame.index) - 1, min(max_points, len(frame.index))).round().astype(int))
+        cols = np.unique(np.linspace(0, len(frame.columns) - 1, min(max_points, len(frame.columns))).round().astype(int))
+        return frame.iloc[rows, cols]
+
+    def _check_metric(self, metric: Optional[str]) -> str:
+        metric = metric or self.metric
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {METRICS}")
+        return metric
+
+
+# Global instance
+market_scenarios = MarketScenarios()
@@ -0,0 +1,191 @@
+"""
+Market Simulation
+Vectorized Monte Carlo TAM/SAM/SOM engine driven by ranged market-sizing assumptions
+"""
+from dataclasses import dataclass, fields
+from typing import Dict, Any, Optional, Sequence
+import time
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_SAMPLES = 100_000
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+PROJECTION_YEARS = (1, 3, 5)
+
+
+@dataclass
+class Distribution:
+    """
+    Three-point estimate of an uncertain quantity
+
+    ``kind`` is "pert" (a beta distribution weighted towards the likely value),
+    "triangular" or "uniform" (which ignores ``likely``).
+    """
+    low: float
+    likely: float
+    high: float
+    kind: str = "pert"
+
+    def __post_init__(self):
+        self.low, self.high = min(self.low, self.high), max(self.low, self.high)
+        self.likely = min(max(self.likely, self.low), self.high)
+
+    @classmethod
+    def from_value(cls, value: Any, kind: str = "pert") -> "Distribution":
+        """Build from a Distribution, a {low, likely, high} dict, a (low, likely, high) tuple or a number"""
+        if isinstance(value, Distribution):
+            return value
+        if isinstance(value, dict):
+            likely = value.get("likely", value.get("mode"))
+            low = value.get("low", likely)
+            high = value.get("high", likely)
+            if likely is None:
+                likely = (low + high) / 2
+            return cls(float(low), float(likely), float(high), value.get("kind", kind))
+        if isinstance(value, (list, tuple)):
+            low, likely, high = value
+            return cls(float(low), float(likely), float(high), kind)
+        return cls(float(value), float(value), float(value), kind)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        if self.high == self.low:
+            return np.full(size, self.low)
+        if self.kind == "uniform":
+            return rng.uniform(self.low, self.high, size)
+        if self.kind == "triangular":
+            return rng.triangular(self.low, self.likely, self.high, size)
+        if self.kind != "pert":
+            raise ValueError(f"Unknown distribution kind: {self.kind}")
+        span = self.high - self.low
+        alpha = 1 + 4 * (self.likely - self.low) / span
+        beta = 1 + 4 * (self.high - self.likely) / span
+        return self.low + span * rng.beta(alpha, beta, size)
+
+
+@dataclass
+class MarketAssumptions:
+    """
+    Ranged inputs for bottom-up market sizing
+
+    TAM = users * ARPU, SAM = TAM * serviceable share, year-1 SOM = SAM *
+    penetration, and SOM then compounds at the annual growth rate (capped at
+    the SAM). Shares and rates are fractions, e.g. 0.05 for 5%.
+    """
+    users: Distribution
+    arpu_usd: Distribution
+    serviceable_share: Distribution
+    penetration: Distribution
+    growth: Distribution
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MarketAssumptions":
+        return cls(**{f.name: Distribution.from_value(data[f.name]) for f in fields(cls)})
+
+    def is_usable(self) -> bool:
+        """True when the ranges describe a non-empty market"""
+        return (self.users.high > 0 and self.arpu_usd.high > 0 and self.serviceable_share.high > 0
+                and self.penetration.high > 0 and self.serviceable_share.low >= 0 and self.penetration.low >= 0)
+
+
+def project_market(users: Any, arpu_usd: Any, serviceable_share: Any, penetration: Any, growth: Any) -> Dict[str, np.ndarray]:
+    """
+    The sizing model, evaluated element-wise with NumPy broadcasting
+
+    Inputs may be scalars or arrays of any broadcast-compatible shapes, so the
+    same function serves Monte Carlo samples and scenario grids.
+
+    Returns:
+        Arrays keyed tam, sam, som_year_1, som_year_3, som_year_5
+    """
+    tam = np.multiply(users, arpu_usd)
+    sam = tam * np.clip(serviceable_share, 0.0, 1.0)
+    som_year_1 = sam * np.clip(penetration, 0.0, 1.0)
+    factor = 1.0 + np.asarray(growth, dtype=float)
+
+    projection = {"tam": tam, "sam": sam}
+    for year in PROJECTION_YEARS:
+        projection[f"som_year_{year}"] = np.minimum(som_year_1 * factor ** (year - 1), sam)
+    return projection
+
+
+class MarketSimulation:
+    """Runs vectorized Monte Carlo samples of TAM, SAM and SOM projections"""
+
+    def __init__(self, samples: int = DEFAULT_SAMPLES, percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                 seed: Optional[int] = None):
+        self.samples = samples
+        # The median doubles as the point estimate, so it is always computed
+        self.percentiles = tuple(sorted(set(percentiles) | {50}))
+        self.seed = seed
+
+    def sample(self, assumptions: MarketAssumptions, samples: Optional[int] = None,
+               seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Draw raw samples
+
+        Returns:
+            Arrays keyed tam, sam, som_year_1, som_year_3, som_year_5
+        """
+        n = samples or self.samples
+        rng = np.random.default_rng(self.seed if seed is None else seed)
+        return project_market(**{f.name: getattr(assumptions, f.name).sample(rng, n) for f in fields(MarketAssumptions)})
+
+    def run(self, assumptions: MarketAssumptions, samples: Optional[int] = None,
+            seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Simulate the market and summarise it
+
+        Args:
+            assumptions: Ranged sizing assumptions
+            samples: Number of Monte Carlo samples (defaults to the engine setting)
+            seed: Optional RNG seed for reproducible results
+
+        Returns:
+            Median point estimates, means and percentiles for TAM, SAM and the
+            year 1/3/5 SOM projections
+        """
+        start = time.perf_counter()
+        draws = self.sample(assumptions, samples, seed)
+        names = list(draws)
+        stacked = np.vstack([draws[name] for name in names])
+        quantiles = self._quantiles(stacked)
+        means = stacked.mean(axis=1)
+
+        summary = {}
+        for i, name in enumerate(names):
+            summary[name] = {
+                "median_usd": float(quantiles[i, self.percentiles.index(50)]),
+                "mean_usd": float(means[i]),
+                "percentiles": {f"p{p:g}": float(quantiles[i, j]) for j, p in enumerate(self.percentiles)}
+            }
+
+        tam_median = summary["tam"]["median_usd"]
+        result = {
+            "samples": int(stacked.shape[1]),
+            "tam": summary["tam"],
+            "sam": {**summary["sam"], "percentage_of_tam": round(100 * summary["sam"]["median_usd"] / tam_median, 2) if tam_median else 0.0},
+            "som": {f"year_{year}": summary[f"som_year_{year}"] for year in PROJECTION_YEARS},
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+        logger.debug("Market simulation completed", samples=result["samples"], elapsed_ms=result["elapsed_ms"])
+        return result
+
+    def _quantiles(self, stacked: np.ndarray) -> np.ndarray:
+        """
+        Percentiles of every row, shape (metrics, percentiles)
+
+        Sorts each row once and interpolates linearly (numpy's default
+        method); several times faster than np.percentile for many percentiles.
+        """
+        ordered = np.sort(stacked, axis=1)
+        positions = np.asarray(self.percentiles, dtype=float) / 100.0 * (ordered.shape[1] - 1)
+        lower = np.floor(positions).astype(int)
+        upper = np.minimum(lower + 1, ordered.shape[1] - 1)
+        fraction = positions - lower
+        return ordered[:, lower] * (1.0 - fraction) + ordered[:, upper] * fraction
+
+
+# Global instance
+market_simulation = MarketSimulation()
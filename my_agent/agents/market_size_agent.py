@@ -3,15 +3,76 @@ Market Size Agent
 Calculates TAM, SAM, SOM for new app ideas
 """
 from google.adk.agents.llm_agent import Agent
-from typing import Dict, Any
+from pydantic import Field
+from typing import Dict, Any, List, Optional, Awaitable
 import structlog
 from ..tools.google_search import google_search
-from ..utils.agent_helper import call_agent
+from .market_simulation import MarketAssumptions, market_simulation, PROJECTION_YEARS
+from .market_scenarios import market_scenarios
+from ..utils.agent_helper import call_agent, parse_response, StructuredResponse
 from ..utils.prompts import MARKET_SIZE_INSTRUCTION, MARKET_SIZE_PROMPT_TEMPLATE
 
 logger = structlog.get_logger(__name__)
 
 
+class TAMEstimate(StructuredResponse):
+    value_usd: float = Field(0, description="Total addressable market in USD")
+    methodology: str = ""
+    assumptions: List[str] = Field(default_factory=list)
+    description: str = ""
+
+
+class SAMEstimate(StructuredResponse):
+    value_usd: float = Field(0, description="Serviceable addressable market in USD")
+    percentage_of_tam: float = 0
+    target_segments: List[str] = Field(default_factory=list)
+    description: str = ""
+
+
+class SOMEstimate(StructuredResponse):
+    year_1_usd: float = 0
+    year_3_usd: float = 0
+    year_5_usd: float = 0
+    market_share_assumptions: str = ""
+    growth_projections: List[str] = Field(default_factory=list)
+    description: str = ""
+
+
+class PricingModel(StructuredResponse):
+    model: str = Field("", description="e.g. freemium, subscription, transaction fee")
+    price_points: List[str] = Field(default_factory=list)
+
+
+class MarketGrowth(StructuredResponse):
+    cagr_percent: float = Field(0, description="Expected compound annual growth rate in percent")
+    drivers: List[str] = Field(default_factory=list)
+
+
+class Range(StructuredResponse):
+    low: float = 0
+    likely: float = 0
+    high: float = 0
+
+
+class SizingAssumptions(StructuredResponse):
+    users: Range = Field(default_factory=Range, description="Potential users or customers in the region")
+    arpu_usd: Range = Field(default_factory=Range, description="Annual revenue per user in USD")
+    serviceable_share: Range = Field(default_factory=Range, description="Fraction of the TAM the product can serve, 0-1")
+    penetration: Range = Field(default_factory=Range, description="Fraction of the SAM captured in year 1, 0-1")
+    growth: Range = Field(default_factory=Range, description="Annual growth of captured revenue, e.g. 0.4 for 40%")
+
+
+class MarketSize(StructuredResponse):
+    """Response schema for the market size agent"""
+    tam: TAMEstimate = Field(default_factory=TAMEstimate)
+    sam: SAMEstimate = Field(default_factory=SAMEstimate)
+    som: SOMEstimate = Field(default_factory=SOMEstimate)
+    pricing_model: PricingModel = Field(default_factory=PricingModel)
+    market_growth_trends: MarketGrowth = Field(default_factory=MarketGrowth)
+    sizing_assumptions: SizingAssumptions = Field(default_factory=SizingAssumptions, description="Low / likely / high ranges behind the estimates, used for Monte Carlo simulation")
+    document: str = Field("", description="The complete market sizing analysis in Markdown, following the output format in your instructions")
+
+
 class MarketSizeAgent:
     """Calculates market size (TAM/SAM/SOM)"""
     
@@ -20,14 +81,15 @@ class MarketSizeAgent:
             model=model,
             name='market_size_agent',
             description='Calculates market size and opportunity',
-            instruction=self._get_instruction()
+            instruction=self._get_instruction(),
+            output_schema=MarketSize
         )
         logger.info("MarketSizeAgent initialized")
     
     def _get_instruction(self) -> str:
         return MARKET_SIZE_INSTRUCTION
     
-    async def calculate(self, domain: str, product_type: str, region: str = "global", idea_context: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def calculate(self, domain: str, product_type: str, region: str = "global", idea_context: Dict[str, Any] = None, search_results: Optional[Awaitable[List[Dict[str, Any]]]] = None) -> Dict[str, Any]:
         """
         Calculate market size
         
@@ -36,6 +98,7 @@ class MarketSizeAgent:
             product_type: Type of product
             region: Target region (default: global)
             idea_context: Optional context about the idea
+            search_results: Optional pre-fetched market size results (e.g. from a SearchPlan)
             
         Returns:
             Market size calculations with TAM, SAM, SOM
@@ -43,8 +106,11 @@ class MarketSizeAgent:
         logger.info("Calculating market size", domain=domain, region=region)
         
         try:
-            # Search for market size data
-            market_data = await google_search.search_market_size(domain, region)
+            # Search for market size data (unless the run already planned the search)
+            if search_results is not None:
+                market_data = await search_results
+            else:
+                market_data = await google_search.search_market_size(domain, region)
             
             context = f"Domain: {domain}\nProduct Type: {product_type}\nRegion: {region}\n\n"
             if idea_context:
@@ -57,33 +123,28 @@ class MarketSizeAgent:
             prompt = MARKET_SIZE_PROMPT_TEMPLATE.format(context=context)
             
             response = await call_agent(self.agent, prompt)
+            market_size = parse_response(response, MarketSize) or MarketSize(document=str(response))
             
             result = {
                 "domain": domain,
                 "product_type": product_type,
                 "region": region,
-                "tam": {
-                    "value_usd": 0,
-                    "methodology": "",
-                    "assumptions": []
-                },
-                "sam": {
-                    "value_usd": 0,
-                    "percentage_of_tam": 0,
-                    "target_segments": []
-                },
-                "som": {
-                    "year_1_usd": 0,
-                    "year_3_usd": 0,
-                    "year_5_usd": 0,
-                    "market_share_assumptions": "",
-                    "growth_projections": []
-                },
-                "pricing_model": {},
-                "market_growth_trends": {},
-                "raw_calculation": str(response)
+                **market_size.model_dump(exclude={"document"}),
+                "raw_calculation": market_size.document
             }
             
+            # Replace the model's point guesses with simulated estimates where possible
+            assumptions = self._assumptions(market_size.sizing_assumptions)
+            if assumptions:
+                simulation = market_simulation.run(assumptions)
+                result["tam"]["value_usd"] = simulation["tam"]["median_usd"]
+                result["sam"]["value_usd"] = simulation["sam"]["median_usd"]
+                result["sam"]["percentage_of_tam"] = simulation["sam"]["percentage_of_tam"]
+                for year in PROJECTION_YEARS:
+                    result["som"][f"year_{year}_usd"] = simulation["som"][f"year_{year}"]["median_usd"]
+                result["simulation"] = simulation
+                result["scenarios"] = market_scenarios.summary(assumptions)
+            
             logger.info("Market size calculation completed", domain=domain)
             return result
             
@@ -93,4 +154,12 @@ class MarketSizeAgent:
                 "domain": domain,
                 "error": str(e)
             }
+    
+    def _assumptions(self, ranges: SizingAssumptions) -> Optional[MarketAssumptions]:
+        """Simulation inputs from the model's ranges, or None if they are unusable"""
+        assumptions = MarketAssumptions.from_dict(ranges.model_dump())
+        if not assumptions.is_usable():
+            logger.warning("Market sizing assumptions unusable, keeping model estimates")
+            return None
+        return assumptions
 
@@ -3,14 +3,28 @@ Pitch Creator Agent
 Produces startup-style pitch summaries
 """
 from google.adk.agents.llm_agent import Agent
-from typing import Dict, Any
+from pydantic import Field
+from typing import Dict, Any, List
 import structlog
-from ..utils.agent_helper import call_agent
+from ..utils.agent_helper import call_agent, parse_response, StructuredResponse
 from ..utils.prompts import PITCH_CREATOR_INSTRUCTION, PITCH_CREATOR_PROMPT_TEMPLATE
 
 logger = structlog.get_logger(__name__)
 
 
+class Pitch(StructuredResponse):
+    """Response schema for the pitch creator agent"""
+    hook: str = ""
+    problem: str = ""
+    solution: str = ""
+    features: List[str] = Field(default_factory=list)
+    market_size: str = ""
+    competitive_edge: str = ""
+    business_model: str = ""
+    closing_statement: str = ""
+    document: str = Field("", description="The complete pitch deck in Marp Markdown, following the output format in your instructions")
+
+
 class PitchCreatorAgent:
     """Creates startup-style pitch summaries"""
     
@@ -19,7 +33,8 @@ class PitchCreatorAgent:
             model=model,
             name='pitch_creator_agent',
             description='Creates startup-style pitch summaries',
-            instruction=self._get_instruction()
+            instruction=self._get_instruction(),
+            output_schema=Pitch
         )
         logger.info("PitchCreatorAgent initialized")
     
@@ -50,49 +65,42 @@ class PitchCreatorAgent:
                 context += f"App: {idea_context.get('app_name', 'N/A')}\n"
                 if idea_context.get('feature_overview'):
                     context += f"Overview: {idea_context.get('feature_overview', '')}\n"
-                if idea_context.get('raw_design'):
-                    # Extract key points from raw_design
-                    raw_design = idea_context.get('raw_design', '')
-                    context += f"\nFeature Details: {raw_design[:500]}...\n"
+                if idea_context.get('user_stories'):
+                    context += f"\nKey User Stories:\n"
+                    for story in idea_context['user_stories'][:3]:
+                        context += f"- {story}\n"
             else:
                 # For new app ideas
                 context += f"Product Idea: {idea_context.get('original_idea', 'N/A')}\n"
                 context += f"Problem: {idea_context.get('problem_statement', 'N/A')}\n"
                 context += f"Value Proposition: {idea_context.get('value_proposition', 'N/A')}\n"
+                if idea_context.get('proposed_features'):
+                    context += f"\nKey Features:\n"
+                    for feature in idea_context['proposed_features'][:5]:
+                        context += f"- {feature}\n"
             
             if market_data:
                 context += f"\nMarket Size:\n"
                 if market_data.get('tam'):
-                    context += f"TAM: ${market_data['tam'].get('value_usd', 0):,}\n"
+                    context += f"TAM: ${market_data['tam'].get('value_usd', 0):,.0f}\n"
                 if market_data.get('sam'):
-                    context += f"SAM: ${market_data['sam'].get('value_usd', 0):,}\n"
+                    context += f"SAM: ${market_data['sam'].get('value_usd', 0):,.0f}\n"
+                if market_data.get('som', {}).get('year_3_usd'):
+                    context += f"SOM (year 3): ${market_data['som']['year_3_usd']:,.0f}\n"
             
             if competitor_data:
                 context += f"\nCompetitive Edge:\n"
-                if competitor_data.get('differentiation_opportunities'):
-                    for opp in competitor_data['differentiation_opportunities'][:3]:
-                        context += f"- {opp}\n"
-                elif competitor_data.get('raw_analysis'):
-                    # Extract key differentiation points from raw_analysis
-                    raw_analysis = competitor_data.get('raw_analysis', '')
-                    context += f"Differentiation: {raw_analysis[:300]}...\n"
+                for opp in competitor_data.get('differentiation_opportunities', [])[:3]:
+                    context += f"- {opp}\n"
             
             prompt = PITCH_CREATOR_PROMPT_TEMPLATE.format(context=context)
             
             response = await call_agent(self.agent, prompt)
+            pitch = parse_response(response, Pitch) or Pitch(document=str(response))
             
             result = {
-                "pitch": {
-                    "hook": "",
-                    "problem": "",
-                    "solution": "",
-                    "features": [],
-                    "market_size": "",
-                    "competitive_edge": "",
-                    "business_model": "",
-                    "closing_statement": ""
-                },
-                "full_text": str(response)
+                "pitch": pitch.model_dump(exclude={"document"}),
+                "full_text": pitch.document
             }
             
             logger.info("Pitch created")
@@ -3,14 +3,24 @@ Wireframe Generator Agent
 Creates ASCII-style wireframes using Code Execution MCP
 """
 from google.adk.agents.llm_agent import Agent
+from pydantic import Field
 from typing import Dict, Any, List
 import structlog
 from ..tools.code_execution import code_execution
-from ..utils.agent_helper import call_agent
+from ..tools.ui_vocabulary import ui_vocabulary
+from ..utils.agent_helper import call_agent, parse_response, StructuredResponse
 from ..utils.prompts import WIREFRAME_INSTRUCTION, WIREFRAME_PROMPT_TEMPLATE
 
 logger = structlog.get_logger(__name__)
 
+MAX_ELEMENTS = 8
+
+
+class ScreenSpec(StructuredResponse):
+    """Response schema for the wireframe generator agent"""
+    elements: List[str] = Field(default_factory=list, description="UI elements top to bottom, short labels such as 'Search Bar' or 'Login Button'")
+    document: str = Field("", description="The complete wireframe specification in Markdown, following the output format in your instructions")
+
 
 class WireframeGeneratorAgent:
     """Generates ASCII wireframes for UI screens"""
@@ -20,7 +30,8 @@ class WireframeGeneratorAgent:
             model=model,
             name='wireframe_generator_agent',
             description='Generates wireframes for product screens',
-            instruction=self._get_instruction()
+            instruction=self._get_instruction(),
+            output_schema=ScreenSpec
         )
         logger.info("WireframeGeneratorAgent initialized")
     
@@ -43,6 +54,7 @@ class WireframeGeneratorAgent:
         
         try:
             wireframes = {}
+            screen_elements = {}
             
             for screen in screens:
                 # Use agent to identify elements
@@ -55,21 +67,24 @@ class WireframeGeneratorAgent:
                 )
                 
                 agent_response = await call_agent(self.agent, prompt)
+                spec = parse_response(agent_response, ScreenSpec) or ScreenSpec(document=str(agent_response))
                 
-                # Extract elements from agent response
-                # Then use code execution to generate ASCII wireframe
-                elements = self._extract_elements(str(agent_response))
-                
-                # Generate ASCII wireframe
-                wireframe = await code_execution.generate_wireframe(screen, elements)
+                # Prefer the structured element list (synonyms folded to canonical names); fall back to scanning the text
+                elements = ui_vocabulary.normalize(spec.elements, limit=MAX_ELEMENTS) or self._extract_elements(spec.document)
+                screen_elements[screen] = elements
                 
                 wireframes[screen] = {
                     "screen_name": screen,
-                    "wireframe": wireframe,
+                    "wireframe": "",
                     "elements": elements,
-                    "raw_analysis": str(agent_response)
+                    "raw_analysis": spec.document
                 }
             
+            # Use code execution to render every ASCII wireframe in one pass
+            rendered = await code_execution.render_many(screen_elements)
+            for screen, wireframe in rendered.items():
+                wireframes[screen]["wireframe"] = wireframe
+            
             result = {
                 "wireframes": wireframes,
                 "total_screens": len(screens)
@@ -86,25 +101,13 @@ class WireframeGeneratorAgent:
             }
     
     def _extract_elements(self, text: str) -> List[str]:
-        """Extract UI elements from agent response"""
-        # Simple extraction - in production, use more sophisticated parsing
-        elements = []
-        common_elements = [
-            "Login Button", "Sign Up Button", "Search Bar", "Navigation Menu",
-            "User Profile", "Settings", "Home Button", "Back Button",
-            "Submit Button", "Cancel Button", "Input Field", "Dropdown",
-            "Checkbox", "Radio Button", "Image", "Video Player", "Text Area"
-        ]
-        
-        # Look for common elements in text
-        text_lower = text.lower()
-        for elem in common_elements:
-            if elem.lower() in text_lower:
-                elements.append(elem)
+        """Extract UI elements from agent response, in the order they are mentioned"""
+        # One pass over the text with the compiled element vocabulary (see data/ui_elements.txt)
+        elements = ui_vocabulary.extract(text, limit=MAX_ELEMENTS)
         
         # If no elements found, add defaults
         if not elements:
             elements = ["Header", "Content Area", "Footer", "Navigation"]
         
-        return elements[:8]  # Limit to 8 elements
+        return elements
 
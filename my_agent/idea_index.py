@@ -0,0 +1,254 @@
+"""
+Idea Index for MAPIS
+On-disk BM25 inverted index over previously generated ideas and features
+"""
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from collections import Counter
+from datetime import datetime
+import hashlib
+import json
+import os
+import threading
+import structlog
+from .utils.bm25 import tokenize, idf, term_score, DEFAULT_K1, DEFAULT_B
+
+logger = structlog.get_logger(__name__)
+
+DOCS_FILE = "docs.jsonl"
+RESULTS_DIR = "results"
+
+
+class IdeaIndex:
+    """
+    Full-text index over completed runs so similar requests can be found
+    (and their results reused) without running the agent pipeline again.
+
+    Layout under ``index_dir``:
+        docs.jsonl          append-only log, one line per indexed document
+                            (term frequencies included, so loading never re-tokenizes)
+        results/<id>.json   full orchestrator results for each document
+
+    Updates are incremental: adding a document appends one line to the log and
+    patches the in-memory postings. Re-adding the same text supersedes the older
+    entry; the log is compacted once superseded lines outnumber live ones.
+    """
+
+    def __init__(self, index_dir: Optional[Path] = None, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        if index_dir is None:
+            project_root = Path(__file__).parent.parent
+            index_dir = project_root / 'outputs' / 'idea_index'
+        self.index_dir = Path(index_dir)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._superseded = 0
+        logger.info("IdeaIndex initialized", index_dir=str(self.index_dir))
+
+    @property
+    def docs_path(self) -> Path:
+        return self.index_dir / DOCS_FILE
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._docs)
+
+    def add(self, kind: str, text: str, results: Optional[Dict[str, Any]] = None,
+            session_id: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None,
+            request: Optional[str] = None) -> Optional[str]:
+        """
+        Index a completed idea or feature
+
+        Args:
+            kind: Document kind ("idea" or "feature")
+            text: Text to index (user input plus any descriptive fields)
+            results: Optional full results to store for later reuse
+            session_id: Session that produced the document
+            metadata: Optional extra fields returned with search hits
+            request: The request the document answers, when ``text`` adds more
+                fields; similarity also requires a query to cover its terms
+
+        Returns:
+            Document ID, or None if the text has no indexable terms
+        """
+        terms = tokenize(text)
+        if not terms:
+            return None
+
+        doc_id = hashlib.sha1(f"{kind}\0{' '.join(terms)}".encode('utf-8')).hexdigest()[:16]
+        entry = {
+            "doc_id": doc_id,
+            "kind": kind,
+            "text": text[:500],
+            "session_id": session_id,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "metadata": metadata or {},
+            "length": len(terms),
+            "tf": dict(Counter(terms)),
+            "request_terms": sorted(set(tokenize(request))) if request else None,
+            "has_results": results is not None
+        }
+
+        with self._lock:
+            self._ensure_loaded()
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            if results is not None:
+                self._write_results(doc_id, results)
+            with open(self.docs_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, separators=(',', ':'), default=str) + "\n")
+            self._apply(entry)
+            if self._superseded > max(len(self._docs), 64):
+                self._compact()
+
+        logger.info("Indexed document", doc_id=doc_id, kind=kind, terms=len(terms))
+        return doc_id
+
+    def search(self, query: str, kind: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Rank indexed documents against a query with BM25
+
+        Args:
+            query: Free-text query
+            kind: Optional kind filter ("idea" or "feature")
+            limit: Maximum number of hits
+
+        Returns:
+            Hits sorted by score; each has doc_id, kind, text, session_id,
+            created_at, metadata, score and similarity in [0, 1]: the lower of
+            the IDF-weighted share of the query's terms the document contains
+            and the share of the document's request terms the query contains
+        """
+        query_tf = Counter(tokenize(query))
+        if not query_tf:
+            return []
+
+        with self._lock:
+            self._ensure_loaded()
+            total_docs = len(self._docs)
+            if not total_docs:
+                return []
+            avg_len = self._total_length / total_docs
+
+            scores: Dict[str, float] = {}
+            # Similarity is coverage both ways, not score / best score: stored documents add the idea's
+            # domain, problem and keywords to the user input, so an identical request never scores like
+            # the query against itself, but the two cover each other's terms. One-way coverage alone
+            # would let a short query match any longer document containing its words
+            matched_idf: Dict[str, float] = {}
+            query_idf = 0.0
+            for term in query_tf:
+                postings = self._postings.get(term, {})
+                term_idf = idf(total_docs, len(postings))
+                query_idf += term_idf
+                for doc_id, tf in postings.items():
+                    doc = self._docs[doc_id]
+                    if kind and doc["kind"] != kind:
+                        continue
+                    scores[doc_id] = scores.get(doc_id, 0.0) + term_score(
+                        tf, doc["length"], avg_len, term_idf, self.k1, self.b
+                    )
+                    matched_idf[doc_id] = matched_idf.get(doc_id, 0.0) + term_idf
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            hits = []
+            for doc_id, score in ranked:
+                doc = self._docs[doc_id]
+                hits.append({
+                    "doc_id": doc_id,
+                    "kind": doc["kind"],
+                    "text": doc["text"],
+                    "session_id": doc["session_id"],
+                    "created_at": doc["created_at"],
+                    "metadata": doc["metadata"],
+                    "has_results": doc["has_results"],
+                    "score": score,
+                    "similarity": min(1.0, matched_idf[doc_id] / query_idf,
+                                      self._request_coverage(doc, query_tf, total_docs)) if query_idf else 0.0
+                })
+            return hits
+
+    def _request_coverage(self, doc: Dict[str, Any], query_tf: Counter, total_docs: int) -> float:
+        """IDF-weighted share of a document's request terms (all its terms for older entries) in the query"""
+        terms = doc.get("request_terms") or doc["tf"]
+        weights = {term: idf(total_docs, len(self._postings.get(term, ()))) for term in terms}
+        total = sum(weights.values())
+        return sum(weight for term, weight in weights.items() if term in query_tf) / total if total else 0.0
+
+    def find_match(self, query: str, kind: Optional[str] = None, threshold: float = 0.8) -> Optional[Dict[str, Any]]:
+        """Return the best hit if its similarity reaches the threshold"""
+        hits = self.search(query, kind=kind, limit=1)
+        if hits and hits[0]["similarity"] >= threshold:
+            return hits[0]
+        return None
+
+    def load_results(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Load the stored results for a document"""
+        results_file = self.index_dir / RESULTS_DIR / f"{doc_id}.json"
+        if not results_file.exists():
+            return None
+        with open(results_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_results(self, doc_id: str, results: Dict[str, Any]):
+        results_dir = self.index_dir / RESULTS_DIR
+        results_dir.mkdir(exist_ok=True)
+        tmp_file = results_dir / f"{doc_id}.json.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, default=str)
+        os.replace(tmp_file, results_dir / f"{doc_id}.json")
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.docs_path.exists():
+            return
+        with open(self.docs_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError) as e:
+                    # A torn final line from an interrupted write - skip it
+                    logger.warning("Skipping corrupt index entry", error=str(e))
+        logger.info("Loaded idea index", documents=len(self._docs))
+
+    def _apply(self, entry: Dict[str, Any]):
+        doc_id = entry["doc_id"]
+        if doc_id in self._docs:
+            self._remove(doc_id)
+            self._superseded += 1
+        self._docs[doc_id] = entry
+        self._total_length += entry["length"]
+        for term, tf in entry["tf"].items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+    def _remove(self, doc_id: str):
+        old = self._docs.pop(doc_id)
+        self._total_length -= old["length"]
+        for term in old["tf"]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _compact(self):
+        tmp_file = self.docs_path.with_suffix(".jsonl.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for entry in self._docs.values():
+                f.write(json.dumps(entry, separators=(',', ':'), default=str) + "\n")
+        os.replace(tmp_file, self.docs_path)
+        logger.info("Compacted idea index", documents=len(self._docs), dropped=self._superseded)
+        self._superseded = 0
+
+
+# Global idea index instance
+idea_index = IdeaIndex()
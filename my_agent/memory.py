@@ -2,82 +2,306 @@
 Memory Management for MAPIS
 Uses InMemorySessionService to maintain conversation context
 """
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, List, TypeVar, Iterable
+import threading
+import zlib
 import structlog
+from .session_snapshot import (
+    SnapshotReader,
+    SnapshotWriter,
+    iter_snapshot,
+    DEFAULT_COMPRESS_THRESHOLD,
+)
 
 logger = structlog.get_logger(__name__)
 
+T = TypeVar("T")
+
+DEFAULT_NUM_SHARDS = 16
+
+
+def _new_session() -> Dict[str, Any]:
+    """Empty session structure"""
+    return {
+        "context": {},
+        "history": [],
+        "preferences": {},
+        "previous_ideas": [],
+        "previous_features": []
+    }
+
+
+class _SessionShard:
+    """One partition of the session store, guarded by its own lock"""
+
+    __slots__ = ("lock", "sessions", "lazy")
 
-class InMemorySessionService:
-    """In-memory session service for maintaining conversation context"""
-    
     def __init__(self):
+        # threading locks (not asyncio ones) so the store is safe from thread
+        # pools and from several event loops at once; they are never held
+        # across an await
+        self.lock = threading.RLock()
         self.sessions: Dict[str, Dict[str, Any]] = {}
-        logger.info("InMemorySessionService initialized")
-    
+        # Sessions restored lazily from a snapshot, decoded on first access
+        self.lazy: Dict[str, SnapshotReader] = {}
+
+    def lookup(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Find a session, materializing it from a snapshot if needed (lock held)"""
+        session = self.sessions.get(session_id)
+        if session is None and self.lazy:
+            reader = self.lazy.pop(session_id, None)
+            if reader is not None:
+                session = reader.load(session_id)
+                if session is not None:
+                    self.sessions[session_id] = session
+        return session
+
+
+class InMemorySessionService:
+    """
+    In-memory session service for maintaining conversation context
+
+    Sessions are spread over a fixed number of shards, each with its own lock,
+    so concurrent requests for different sessions rarely contend. Every
+    mutation runs under the owning shard's lock, which makes get-or-create and
+    read-modify-write updates atomic.
+    """
+
+    def __init__(self, num_shards: int = DEFAULT_NUM_SHARDS):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self._shards = [_SessionShard() for _ in range(num_shards)]
+        logger.info("InMemorySessionService initialized", shards=num_shards)
+
+    def _shard(self, session_id: str) -> _SessionShard:
+        # crc32 rather than hash() so shard placement is stable across processes
+        return self._shards[zlib.crc32(session_id.encode('utf-8')) % len(self._shards)]
+
+    @property
+    def sessions(self) -> Dict[str, Dict[str, Any]]:
+        """Point-in-time copy of the session mapping across all shards"""
+        merged: Dict[str, Dict[str, Any]] = {}
+        for shard in self._shards:
+            with shard.lock:
+                for session_id in list(shard.lazy):
+                    shard.lookup(session_id)
+                merged.update(shard.sessions)
+        return merged
+
+    def __len__(self) -> int:
+        return sum(len(shard.sessions) + len(shard.lazy) for shard in self._shards)
+
+    def __contains__(self, session_id: str) -> bool:
+        shard = self._shard(session_id)
+        with shard.lock:
+            return session_id in shard.sessions or session_id in shard.lazy
+
+    def session_ids(self) -> List[str]:
+        """List all session IDs (including ones not yet loaded from a snapshot)"""
+        ids: List[str] = []
+        for shard in self._shards:
+            with shard.lock:
+                ids.extend(shard.sessions.keys())
+                ids.extend(shard.lazy.keys())
+        return ids
+
     def create_session(self, session_id: str) -> Dict[str, Any]:
-        """Create a new session"""
-        self.sessions[session_id] = {
-            "context": {},
-            "history": [],
-            "preferences": {},
-            "previous_ideas": [],
-            "previous_features": []
-        }
+        """Create a new session, replacing any existing session with the same ID"""
+        shard = self._shard(session_id)
+        with shard.lock:
+            shard.lazy.pop(session_id, None)
+            session = shard.sessions[session_id] = _new_session()
         logger.info(f"Created session: {session_id}")
-        return self.sessions[session_id]
-    
+        return session
+
+    def get_or_create_session(self, session_id: str) -> Dict[str, Any]:
+        """Get an existing session, creating it if needed (atomic)"""
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.lookup(session_id)
+            if session is not None:
+                return session
+            session = shard.sessions[session_id] = _new_session()
+        logger.info(f"Created session: {session_id}")
+        return session
+
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get existing session"""
-        return self.sessions.get(session_id)
-    
+        shard = self._shard(session_id)
+        with shard.lock:
+            return shard.lookup(session_id)
+
+    def delete_session(self, session_id: str) -> bool:
+        """Delete a session, returning whether it existed"""
+        shard = self._shard(session_id)
+        with shard.lock:
+            existed = shard.sessions.pop(session_id, None) is not None
+            existed = shard.lazy.pop(session_id, None) is not None or existed
+        if existed:
+            logger.info(f"Deleted session: {session_id}")
+        return existed
+
+    def update_session(self, session_id: str, updater: Callable[[Dict[str, Any]], T]) -> T:
+        """
+        Atomically apply an update to a session
+
+        Args:
+            session_id: Session to update (created if missing)
+            updater: Called with the session dict while the shard lock is held;
+                must not block or await
+
+        Returns:
+            Whatever the updater returns
+        """
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.lookup(session_id)
+            if session is None:
+                session = shard.sessions[session_id] = _new_session()
+            return updater(session)
+
     def update_context(self, session_id: str, key: str, value: Any):
         """Update context in session"""
-        if session_id not in self.sessions:
-            self.create_session(session_id)
-        self.sessions[session_id]["context"][key] = value
+        self.update_session(session_id, lambda s: s["context"].__setitem__(key, value))
         logger.debug(f"Updated context for {session_id}: {key}")
-    
+
     def get_context(self, session_id: str, key: str, default: Any = None) -> Any:
         """Get context value from session"""
-        session = self.get_session(session_id)
-        if session:
-            return session["context"].get(key, default)
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.lookup(session_id)
+            if session:
+                return session["context"].get(key, default)
         return default
-    
+
     def add_to_history(self, session_id: str, agent_name: str, input_data: Any, output_data: Any):
         """Add interaction to history"""
-        if session_id not in self.sessions:
-            self.create_session(session_id)
-        self.sessions[session_id]["history"].append({
+        entry = {
             "agent": agent_name,
             "input": input_data,
             "output": output_data
-        })
+        }
+        self.update_session(session_id, lambda s: s["history"].append(entry))
         logger.debug(f"Added to history for {session_id}: {agent_name}")
-    
+
     def get_history(self, session_id: str) -> list:
         """Get conversation history"""
-        session = self.get_session(session_id)
-        if session:
-            return session["history"]
-        return []
-    
+        return self._get_list(session_id, "history")
+
     def store_preference(self, session_id: str, key: str, value: Any):
         """Store user preference"""
-        if session_id not in self.sessions:
-            self.create_session(session_id)
-        self.sessions[session_id]["preferences"][key] = value
+        self.update_session(session_id, lambda s: s["preferences"].__setitem__(key, value))
         logger.debug(f"Stored preference for {session_id}: {key}")
-    
+
     def get_preference(self, session_id: str, key: str, default: Any = None) -> Any:
         """Get user preference"""
-        session = self.get_session(session_id)
-        if session:
-            return session["preferences"].get(key, default)
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.lookup(session_id)
+            if session:
+                return session["preferences"].get(key, default)
         return default
 
+    def add_previous_idea(self, session_id: str, idea: Dict[str, Any]):
+        """Record a completed new app idea"""
+        self.update_session(session_id, lambda s: s["previous_ideas"].append(idea))
+        logger.debug(f"Added previous idea for {session_id}")
+
+    def get_previous_ideas(self, session_id: str) -> list:
+        """Get completed ideas for a session"""
+        return self._get_list(session_id, "previous_ideas")
+
+    def add_previous_feature(self, session_id: str, feature: Dict[str, Any]):
+        """Record a completed feature extension"""
+        self.update_session(session_id, lambda s: s["previous_features"].append(feature))
+        logger.debug(f"Added previous feature for {session_id}")
+
+    def get_previous_features(self, session_id: str) -> list:
+        """Get completed feature extensions for a session"""
+        return self._get_list(session_id, "previous_features")
+
+    def _get_list(self, session_id: str, field: str) -> list:
+        # Copy under the lock so callers never iterate a list another thread appends to
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.lookup(session_id)
+            if session:
+                return list(session[field])
+        return []
+
+    def snapshot(self, path: Path, compression: Optional[str] = "zlib",
+                 compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD) -> int:
+        """
+        Write all sessions to a compact binary snapshot file
+
+        Args:
+            path: Snapshot file path (replaced atomically)
+            compression: "zlib", "zstd" (needs zstandard) or None for large strings
+            compress_threshold: Minimum string size in bytes to compress
+
+        Returns:
+            Number of sessions written
+        """
+        with SnapshotWriter(path, compression, compress_threshold) as writer:
+            for shard in self._shards:
+                # Encode under the shard lock for a consistent view of each
+                # session; file writes happen after the lock is released
+                with shard.lock:
+                    records = [(sid, writer.encode_record(sid, s)) for sid, s in shard.sessions.items()]
+                    lazy = list(shard.lazy.items())
+                # Not-yet-loaded sessions are copied over without decoding
+                records.extend((sid, reader.read_record(sid)) for sid, reader in lazy)
+                for session_id, record in records:
+                    writer.write_record(session_id, record)
+            return len(writer)
+
+    def restore(self, path: Path, session_ids: Optional[Iterable[str]] = None, lazy: bool = False) -> int:
+        """
+        Restore sessions from a snapshot file
+
+        Existing sessions with the same IDs are replaced.
+
+        Args:
+            path: Snapshot file written by snapshot()
+            session_ids: Optional subset of sessions to restore
+            lazy: Only register the sessions now and decode each one on first access
+
+        Returns:
+            Number of sessions restored
+        """
+        wanted = set(session_ids) if session_ids is not None else None
+        count = 0
+
+        if lazy or wanted is not None:
+            reader = SnapshotReader(path)
+            targets = reader.session_ids() if wanted is None else [sid for sid in reader.session_ids() if sid in wanted]
+            for session_id in targets:
+                shard = self._shard(session_id)
+                if lazy:
+                    with shard.lock:
+                        shard.sessions.pop(session_id, None)
+                        shard.lazy[session_id] = reader
+                else:
+                    session = reader.load(session_id)
+                    with shard.lock:
+                        shard.lazy.pop(session_id, None)
+                        shard.sessions[session_id] = session
+                count += 1
+            if not lazy:
+                reader.close()
+        else:
+            # Full restore streams records one at a time
+            for session_id, session in iter_snapshot(path):
+                shard = self._shard(session_id)
+                with shard.lock:
+                    shard.lazy.pop(session_id, None)
+                    shard.sessions[session_id] = session
+                count += 1
+
+        logger.info("Restored sessions from snapshot", path=str(path), sessions=count, lazy=lazy)
+        return count
+
 
 # Global session service instance
 session_service = InMemorySessionService()
-
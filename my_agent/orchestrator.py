@@ -2,10 +2,11 @@
 Final Output Aggregator (Orchestrator)
 Orchestrates agent workflows and aggregates outputs
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, List, Optional
 import structlog
 import asyncio
 from .memory import session_service
+from .idea_index import idea_index
 from .agents.intent_classification_agent import IntentClassificationAgent
 from .agents.domain_understanding_agent import DomainUnderstandingAgent
 from .agents.idea_breakdown_agent import IdeaBreakdownAgent
@@ -16,6 +17,8 @@ from .agents.market_size_agent import MarketSizeAgent
 from .agents.wireframe_generator_agent import WireframeGeneratorAgent
 from .agents.concept_paper_writer_agent import ConceptPaperWriterAgent
 from .agents.pitch_creator_agent import PitchCreatorAgent
+from .tools.app_catalog import app_catalog
+from .tools.search_planner import SearchPlan
 from .utils.logger import log_agent_execution
 
 logger = structlog.get_logger(__name__)
@@ -24,7 +27,10 @@ logger = structlog.get_logger(__name__)
 class MAPISOrchestrator:
     """Orchestrates the Multi-Agent Product Innovation System"""
     
-    def __init__(self):
+    def __init__(self, reuse_threshold: float = 0.8):
+        # Minimum normalized BM25 similarity for an earlier run to count as a match
+        self.reuse_threshold = reuse_threshold
+        
         # Initialize all agents
         self.intent_agent = IntentClassificationAgent()
         self.domain_agent = DomainUnderstandingAgent()
@@ -37,16 +43,44 @@ class MAPISOrchestrator:
         self.concept_paper_agent = ConceptPaperWriterAgent()
         self.pitch_agent = PitchCreatorAgent()
         
+        # Called as listener(session_id, stage, results) whenever a stage's result is stored
+        self._stage_listeners: List[Callable[[str, str, Dict[str, Any]], None]] = []
+        
         logger.info("MAPISOrchestrator initialized with all agents")
     
+    def add_stage_listener(self, listener: Callable[[str, str, Dict[str, Any]], None]):
+        """
+        Subscribe to stage completions
+        
+        The listener is called on the event loop right after a stage's output
+        is stored under results[stage], so it must hand any slow work off
+        (see ``StageOutputWriter`` in utils/file_output.py).
+        """
+        self._stage_listeners.append(listener)
+    
+    def remove_stage_listener(self, listener: Callable[[str, str, Dict[str, Any]], None]):
+        if listener in self._stage_listeners:
+            self._stage_listeners.remove(listener)
+    
+    def _stage_completed(self, session_id: str, results: Dict[str, Any], *stages: str):
+        """Notify listeners; a failing listener never fails the workflow"""
+        for stage in stages:
+            for listener in list(self._stage_listeners):
+                try:
+                    listener(session_id, stage, results)
+                except Exception as e:
+                    logger.warning("Stage listener failed", stage=stage, error=str(e))
+    
     @log_agent_execution("orchestrator")
-    async def process(self, user_input: str, session_id: str = "default") -> Dict[str, Any]:
+    async def process(self, user_input: str, session_id: str = "default", reuse_previous: bool = False) -> Dict[str, Any]:
         """
         Main orchestration method - processes user input through agent pipeline
         
         Args:
             user_input: User's request
             session_id: Session ID for memory management
+            reuse_previous: Return stored results of a closely matching earlier run
+                instead of regenerating them
             
         Returns:
             Complete output with all agent results
@@ -54,9 +88,17 @@ class MAPISOrchestrator:
         logger.info("Starting MAPIS orchestration", session_id=session_id, input_length=len(user_input))
         
         # Ensure session exists
-        session_service.create_session(session_id)
+        session_service.get_or_create_session(session_id)
         session_service.update_context(session_id, "user_input", user_input)
         
+        # Look up earlier runs before spending any LLM calls
+        similar = await self._find_similar_previous(user_input)
+        if similar:
+            session_service.update_context(session_id, "similar_previous", similar)
+            reused = await self._reuse_previous(similar[0], session_id) if reuse_previous else None
+            if reused is not None:
+                return reused
+        
         try:
             # Step 1: Classify intent
             intent_result = await self.intent_agent.classify(user_input)
@@ -71,12 +113,18 @@ class MAPISOrchestrator:
             
             # Route based on intent
             if intent == "new_app_idea":
-                return await self._process_new_app_idea(user_input, domain, keywords, session_id)
+                results = await self._process_new_app_idea(user_input, domain, keywords, session_id)
             elif intent == "feature_extension":
-                return await self._process_feature_extension(user_input, domain, keywords, session_id)
+                results = await self._process_feature_extension(user_input, domain, keywords, session_id)
             else:
                 # Default to new app idea
-                return await self._process_new_app_idea(user_input, domain, keywords, session_id)
+                results = await self._process_new_app_idea(user_input, domain, keywords, session_id)
+            
+            if similar:
+                results["similar_previous"] = similar
+            if results.get("status") == "success":
+                await self._remember_results(session_id, results)
+            return results
                 
         except Exception as e:
             logger.error("Orchestration failed", error=str(e), session_id=session_id)
@@ -97,9 +145,21 @@ class MAPISOrchestrator:
             "keywords": keywords
         }
         
+        # Plan every search this workflow needs and start them now, so they run
+        # while the LLM stages below are in flight
+        search_plan = SearchPlan()
+        search_plan.add_market_trends(domain or "General")
+        search_plan.add_competitors(domain or "General", " ".join(str(k) for k in keywords[:3]) or "app")
+        search_plan.add_market_size(domain or "General", "global")
+        search_plan.start()
+        
         try:
             # Step 2: Domain Understanding (can run in parallel with idea breakdown prep)
-            domain_task = self.domain_agent.analyze(domain or "General", keywords)
+            domain_task = self.domain_agent.analyze(
+                domain or "General",
+                keywords,
+                search_results=search_plan.results("market_trends")
+            )
             
             # Step 3: Idea Breakdown (can start with basic context)
             idea_task = self.idea_breakdown_agent.breakdown(user_input)
@@ -111,20 +171,23 @@ class MAPISOrchestrator:
             results["idea_breakdown"] = idea_result
             session_service.add_to_history(session_id, "domain_understanding", domain, domain_result)
             session_service.add_to_history(session_id, "idea_breakdown", user_input, idea_result)
+            self._stage_completed(session_id, results, "domain_analysis", "idea_breakdown")
             
             # Step 4: Competitor Analysis (parallel with market size)
             product_type = idea_result.get("value_proposition", "product")[:50]
             competitor_task = self.competitor_agent.analyze(
                 domain or "General",
                 product_type,
-                idea_result
+                idea_result,
+                search_results=search_plan.results("competitors")
             )
             
             market_task = self.market_size_agent.calculate(
                 domain or "General",
                 product_type,
                 "global",
-                idea_result
+                idea_result,
+                search_results=search_plan.results("market_size")
             )
             
             competitor_result, market_result = await asyncio.gather(competitor_task, market_task)
@@ -133,23 +196,27 @@ class MAPISOrchestrator:
             results["market_size"] = market_result
             session_service.add_to_history(session_id, "competitor_analysis", domain, competitor_result)
             session_service.add_to_history(session_id, "market_size", domain, market_result)
+            self._stage_completed(session_id, results, "competitor_analysis", "market_size")
             
             # Step 5: Architecture Suggestion
             features = idea_result.get("proposed_features", [])
             architecture_result = await self.architecture_agent.suggest(idea_result, features)
             results["architecture"] = architecture_result
             session_service.add_to_history(session_id, "architecture", idea_result, architecture_result)
+            self._stage_completed(session_id, results, "architecture")
             
             # Step 6: Wireframe Generation
-            screens = ["Login", "Home", "Main Feature", "Settings"]  # Default screens
+            screens = idea_result.get("key_screens", [])[:6] or ["Login", "Home", "Main Feature", "Settings"]  # Default screens
             wireframe_result = await self.wireframe_agent.generate(screens, features, idea_result)
             results["wireframes"] = wireframe_result
             session_service.add_to_history(session_id, "wireframes", screens, wireframe_result)
+            self._stage_completed(session_id, results, "wireframes")
             
             # Step 7: Pitch Creation
             pitch_result = await self.pitch_agent.create(idea_result, market_result, competitor_result)
             results["pitch"] = pitch_result
             session_service.add_to_history(session_id, "pitch", idea_result, pitch_result)
+            self._stage_completed(session_id, results, "pitch")
             
             # Final aggregation
             results["status"] = "success"
@@ -163,6 +230,8 @@ class MAPISOrchestrator:
             results["error"] = str(e)
             results["status"] = "error"
             return results
+        finally:
+            search_plan.cancel()
     
     async def _process_feature_extension(self, user_input: str, domain: str, keywords: List[str], session_id: str) -> Dict[str, Any]:
         """Process feature extension workflow"""
@@ -175,16 +244,22 @@ class MAPISOrchestrator:
             "keywords": keywords
         }
         
+        # Extract app name and feature from input
+        # Simple extraction - can be enhanced
+        app_name = self._extract_app_name(user_input)
+        feature_request = user_input
+        
+        # Start the competitor search now so it overlaps with feature design
+        search_plan = SearchPlan()
+        search_plan.add_competitors(domain or "General", f"{app_name} feature")
+        search_plan.start()
+        
         try:
-            # Extract app name and feature from input
-            # Simple extraction - can be enhanced
-            app_name = self._extract_app_name(user_input)
-            feature_request = user_input
-            
             # Step 2: Feature Design
             feature_result = await self.feature_design_agent.design(app_name, feature_request)
             results["feature_design"] = feature_result
             session_service.add_to_history(session_id, "feature_design", user_input, feature_result)
+            self._stage_completed(session_id, results, "feature_design")
             
             # Step 3: Concept Paper (can run in parallel with competitor analysis)
             concept_task = self.concept_paper_agent.write(feature_result, app_name)
@@ -192,7 +267,8 @@ class MAPISOrchestrator:
             competitor_task = self.competitor_agent.analyze(
                 domain or "General",
                 f"{app_name} feature",
-                feature_result
+                feature_result,
+                search_results=search_plan.results("competitors")
             )
             
             concept_result, competitor_result = await asyncio.gather(concept_task, competitor_task)
@@ -201,9 +277,10 @@ class MAPISOrchestrator:
             results["competitor_analysis"] = competitor_result
             session_service.add_to_history(session_id, "concept_paper", feature_result, concept_result)
             session_service.add_to_history(session_id, "competitor_analysis", domain, competitor_result)
+            self._stage_completed(session_id, results, "concept_paper", "competitor_analysis")
             
             # Step 4: Wireframe Generation
-            screens = feature_result.get("user_journey", ["Feature Screen"])
+            screens = feature_result.get("screens", [])[:6]
             if not screens or isinstance(screens, str):
                 screens = ["Feature Screen", "Settings"]
             
@@ -211,11 +288,13 @@ class MAPISOrchestrator:
             wireframe_result = await self.wireframe_agent.generate(screens, features, feature_result)
             results["wireframes"] = wireframe_result
             session_service.add_to_history(session_id, "wireframes", screens, wireframe_result)
+            self._stage_completed(session_id, results, "wireframes")
             
             # Step 5: Pitch Creation (for feature extension)
             pitch_result = await self.pitch_agent.create(feature_result, None, competitor_result)
             results["pitch"] = pitch_result
             session_service.add_to_history(session_id, "pitch", feature_result, pitch_result)
+            self._stage_completed(session_id, results, "pitch")
             
             # Note: Architecture is NOT generated for feature extensions
             # Feature extensions integrate with existing architecture
@@ -232,20 +311,91 @@ class MAPISOrchestrator:
             results["error"] = str(e)
             results["status"] = "error"
             return results
+        finally:
+            search_plan.cancel()
     
     def _extract_app_name(self, user_input: str) -> str:
         """Extract app name from user input"""
-        # Simple extraction - look for common patterns
-        # "Add X to Y" or "Enhance Y with X"
-        words = user_input.split()
-        common_apps = ["Swiggy", "Instagram", "Facebook", "Twitter", "LinkedIn", "Uber", "Zomato"]
+        # One pass over the input against the app/brand catalog (see data/app_catalog.txt)
+        mentions = app_catalog.find_all(user_input)
+        if not mentions:
+            return "Application"
+        
+        # "Add X to Y" or "Add Instagram-style stories to Zomato": the app being
+        # extended is the one after the preposition; otherwise take the first mention
+        for mention in mentions:
+            preceding = user_input[:mention.start].split()
+            if preceding and preceding[-1].lower() in ("to", "into", "in", "for", "on"):
+                return mention.name
+        return mentions[0].name
+    
+    async def _find_similar_previous(self, user_input: str) -> List[Dict[str, Any]]:
+        """Search the idea index for earlier runs similar to this request"""
+        # The index (and its first load from disk) is read on a worker thread, off the event loop
+        try:
+            return await asyncio.to_thread(idea_index.search, user_input, limit=3)
+        except Exception as e:
+            logger.warning("Idea index lookup failed", error=str(e))
+            return []
+    
+    async def _reuse_previous(self, match: Dict[str, Any], session_id: str) -> Optional[Dict[str, Any]]:
+        """Load stored results for a close match, or None if it cannot be reused"""
+        if match["similarity"] < self.reuse_threshold or not match.get("has_results"):
+            return None
+        
+        previous = await asyncio.to_thread(idea_index.load_results, match["doc_id"])
+        if not previous:
+            return None
         
-        for app in common_apps:
-            if app.lower() in user_input.lower():
-                return app
+        previous["reused_from"] = {
+            "doc_id": match["doc_id"],
+            "session_id": match["session_id"],
+            "created_at": match["created_at"],
+            "similarity": match["similarity"]
+        }
+        session_service.add_to_history(session_id, "idea_index", match["text"], previous["reused_from"])
+        logger.info("Reusing previous results", doc_id=match["doc_id"], similarity=match["similarity"])
+        return previous
+    
+    async def _remember_results(self, session_id: str, results: Dict[str, Any]):
+        """Record a completed run in the session and the cross-session idea index"""
+        intent = results.get("intent")
+        user_input = results.get("user_input", "")
+        domain = results.get("domain")
+        keywords = results.get("keywords") or []
+        
+        if intent == "feature_extension":
+            kind = "feature"
+            feature = results.get("feature_design", {})
+            app_name = feature.get("app_name")
+            text_parts = [user_input, app_name, domain, feature.get("feature_overview")]
+        else:
+            kind = "idea"
+            app_name = None
+            idea = results.get("idea_breakdown", {})
+            text_parts = [user_input, domain, idea.get("problem_statement"), idea.get("value_proposition")]
+        text_parts.extend(str(k) for k in keywords)
+        text = " ".join(str(part) for part in text_parts if part)
+        
+        try:
+            stored = {k: v for k, v in results.items() if k != "similar_previous"}
+            # Writes the full results JSON and appends to the index log: off the event loop
+            doc_id = await asyncio.to_thread(
+                idea_index.add, kind, text, stored,
+                session_id=session_id,
+                metadata={"intent": intent, "domain": domain, "app_name": app_name},
+                request=user_input
+            )
+        except Exception as e:
+            logger.warning("Failed to index results", error=str(e))
+            doc_id = None
         
-        # Default
-        return "Application"
+        entry = {"doc_id": doc_id, "user_input": user_input, "domain": domain, "keywords": keywords}
+        if kind == "feature":
+            entry["app_name"] = app_name
+            session_service.add_previous_feature(session_id, entry)
+        else:
+            session_service.add_previous_idea(session_id, entry)
     
     def _create_summary(self, results: Dict[str, Any]) -> Dict[str, Any]:
         """Create a summary of all results"""
@@ -253,7 +403,7 @@ class MAPISOrchestrator:
             "intent": results.get("intent"),
             "domain": results.get("domain"),
             "status": results.get("status"),
-            "agents_executed": len([k for k in results.keys() if k not in ["intent", "user_input", "domain", "keywords", "status", "summary", "error"]]),
+            "agents_executed": len([k for k in results.keys() if k not in ["intent", "user_input", "domain", "keywords", "status", "summary", "error", "similar_previous", "reused_from"]]),
             "has_wireframes": "wireframes" in results,
             "has_architecture": "architecture" in results,
             "has_market_data": "market_size" in results
@@ -0,0 +1,357 @@
+"""
+Session Snapshots for MAPIS
+Compact binary snapshot/restore format for InMemorySessionService
+
+File layout:
+    header   b"MAPISNAP" + u8 version
+    records  u32 record length + encoded [session_id, session] (one per session)
+    index    encoded {session_id: record offset}
+    trailer  u64 index offset + b"MAPIIDX1"
+
+Records are self-delimiting so a restore can stream them one at a time; the
+trailing index lets single sessions be loaded lazily with one seek.
+"""
+from pathlib import Path
+from typing import Dict, Any, Iterator, Iterable, Optional, Tuple, List
+import struct
+import threading
+import zlib
+import structlog
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+logger = structlog.get_logger(__name__)
+
+MAGIC = b"MAPISNAP"
+INDEX_MAGIC = b"MAPIIDX1"
+VERSION = 1
+DEFAULT_COMPRESS_THRESHOLD = 1024
+
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_TRAILER = struct.Struct("<Q8s")
+
+_CODEC_ZLIB = 1
+_CODEC_ZSTD = 2
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, truncated or malformed"""
+
+
+class _Encoder:
+    """Tagged binary encoder for JSON-like session data"""
+
+    def __init__(self, compression: Optional[str], threshold: int):
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard not installed, falling back to zlib")
+            compression = "zlib"
+        if compression not in (None, "zlib", "zstd"):
+            raise ValueError(f"Unsupported compression: {compression}")
+        self.compression = compression
+        self.threshold = threshold
+        self._zstd = zstandard.ZstdCompressor(level=3) if compression == "zstd" else None
+
+    def encode(self, value: Any) -> bytes:
+        out = bytearray()
+        self._encode(value, out)
+        return bytes(out)
+
+    def _encode(self, value: Any, out: bytearray):
+        if value is None:
+            out += b"N"
+        elif value is True:
+            out += b"T"
+        elif value is False:
+            out += b"F"
+        elif isinstance(value, str):
+            data = value.encode("utf-8")
+            if self.compression and len(data) >= self.threshold:
+                self._encode_compressed(data, out)
+            else:
+                out += b"s"
+                out += _U32.pack(len(data))
+                out += data
+        elif isinstance(value, int):
+            if _INT64_MIN <= value <= _INT64_MAX:
+                out += b"i"
+                out += _I64.pack(value)
+            else:
+                data = str(value).encode("ascii")
+                out += b"I"
+                out += _U32.pack(len(data))
+                out += data
+        elif isinstance(value, float):
+            out += b"f"
+            out += _F64.pack(value)
+        elif isinstance(value, dict):
+            out += b"d"
+            out += _U32.pack(len(value))
+            for k, v in value.items():
+                self._encode(k, out)
+                self._encode(v, out)
+        elif isinstance(value, (list, tuple)):
+            out += b"l"
+            out += _U32.pack(len(value))
+            for item in value:
+                self._encode(item, out)
+        elif isinstance(value, (bytes, bytearray)):
+            out += b"b"
+            out += _U32.pack(len(value))
+            out += value
+        else:
+            # Same fallback as json.dump(..., default=str)
+            self._encode(str(value), out)
+
+    def _encode_compressed(self, data: bytes, out: bytearray):
+        if self._zstd is not None:
+            codec, packed = _CODEC_ZSTD, self._zstd.compress(data)
+        else:
+            codec, packed = _CODEC_ZLIB, zlib.compress(data, 1)
+        out += b"z"
+        out += bytes((codec,))
+        out += _U32.pack(len(data))
+        out += _U32.pack(len(packed))
+        out += packed
+
+
+class _Decoder:
+    """Decoder for buffers produced by _Encoder"""
+
+    def __init__(self):
+        self._zstd = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    def decode(self, buf: bytes) -> Any:
+        value, _ = self._decode(memoryview(buf), 0)
+        return value
+
+    def _decode(self, buf: memoryview, pos: int) -> Tuple[Any, int]:
+        tag = buf[pos]
+        pos += 1
+        if tag == 0x73:  # s
+            (n,) = _U32.unpack_from(buf, pos)
+            pos += 4
+            return str(buf[pos:pos + n], "utf-8"), pos + n
+        if tag == 0x64:  # d
+            (n,) = _U32.unpack_from(buf, pos)
+            pos += 4
+            result = {}
+            for _ in range(n):
+                k, pos = self._decode(buf, pos)
+                v, pos = self._decode(buf, pos)
+                result[k] = v
+            return result, pos
+        if tag == 0x6c:  # l
+            (n,) = _U32.unpack_from(buf, pos)
+            pos += 4
+            items = []
+            for _ in range(n):
+                item, pos = self._decode(buf, pos)
+                items.append(item)
+            return items, pos
+        if tag == 0x4e:  # N
+            return None, pos
+        if tag == 0x54:  # T
+            return True, pos
+        if tag == 0x46:  # F
+            return False, pos
+        if tag == 0x69:  # i
+            return _I64.unpack_from(buf, pos)[0], pos + 8
+        if tag == 0x66:  # f
+            return _F64.unpack_from(buf, pos)[0], pos + 8
+        if tag == 0x7a:  # z
+            codec = buf[pos]
+            raw_len, packed_len = _U32.unpack_from(buf, pos + 1)[0], _U32.unpack_from(buf, pos + 5)[0]
+            pos += 9
+            packed = bytes(buf[pos:pos + packed_len])
+            if codec == _CODEC_ZSTD:
+                if self._zstd is None:
+                    raise SnapshotError("Snapshot uses zstd compression but zstandard is not installed")
+                data = self._zstd.decompress(packed, max_output_size=raw_len)
+            else:
+                data = zlib.decompress(packed)
+            return data.decode("utf-8"), pos + packed_len
+        if tag == 0x49:  # I
+            (n,) = _U32.unpack_from(buf, pos)
+            pos += 4
+            return int(str(buf[pos:pos + n], "ascii")), pos + n
+        if tag == 0x62:  # b
+            (n,) = _U32.unpack_from(buf, pos)
+            pos += 4
+            return bytes(buf[pos:pos + n]), pos + n
+        raise SnapshotError(f"Unknown value tag {tag!r} at offset {pos - 1}")
+
+
+class SnapshotWriter:
+    """
+    Incremental snapshot writer
+
+    Encoding and writing are separate steps so callers can encode sessions
+    while holding their own locks and do the file I/O afterwards.
+    """
+
+    def __init__(self, path: Path, compression: Optional[str] = "zlib",
+                 compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD):
+        self.path = Path(path)
+        self._encoder = _Encoder(compression, compress_threshold)
+        self._index: Dict[str, int] = {}
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(MAGIC + bytes((VERSION,)))
+        self._offset = len(MAGIC) + 1
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def encode_record(self, session_id: str, session: Dict[str, Any]) -> bytes:
+        """Encode one session into a record body"""
+        return self._encoder.encode([session_id, session])
+
+    def write_record(self, session_id: str, record: bytes):
+        """Append an encoded record (from encode_record or SnapshotReader.read_record)"""
+        self._file.write(_U32.pack(len(record)))
+        self._file.write(record)
+        self._index[session_id] = self._offset
+        self._offset += 4 + len(record)
+
+    def add(self, session_id: str, session: Dict[str, Any]):
+        """Encode and append one session"""
+        self.write_record(session_id, self.encode_record(session_id, session))
+
+    def close(self):
+        """Write the index and atomically move the snapshot into place"""
+        self._file.write(self._encoder.encode(self._index))
+        self._file.write(_TRAILER.pack(self._offset, INDEX_MAGIC))
+        self._file.close()
+        self._tmp_path.replace(self.path)
+        logger.info("Wrote session snapshot", path=str(self.path), sessions=len(self._index),
+                    bytes=self.path.stat().st_size)
+
+    def abort(self):
+        """Discard a partially written snapshot"""
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def write_snapshot(path: Path, sessions: Iterable[Tuple[str, Dict[str, Any]]],
+                   compression: Optional[str] = "zlib",
+                   compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD) -> int:
+    """
+    Write sessions to a snapshot file
+
+    Args:
+        path: Destination file (written to a temp file, then renamed into place)
+        sessions: Iterable of (session_id, session) pairs; consumed lazily
+        compression: "zlib", "zstd" or None for strings above the threshold
+        compress_threshold: Minimum encoded string size in bytes to compress
+
+    Returns:
+        Number of sessions written
+    """
+    with SnapshotWriter(path, compression, compress_threshold) as writer:
+        for session_id, session in sessions:
+            writer.add(session_id, session)
+        return len(writer)
+
+
+def iter_snapshot(path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Stream (session_id, session) pairs from a snapshot file in record order"""
+    decoder = _Decoder()
+    with open(path, "rb") as f:
+        _check_header(f.read(len(MAGIC) + 1))
+        index_offset = _read_trailer(f)
+        f.seek(len(MAGIC) + 1)
+        while f.tell() < index_offset:
+            record = _read_record(f)
+            session_id, session = decoder.decode(record)
+            yield session_id, session
+
+
+class SnapshotReader:
+    """Random-access reader used for lazy, per-session restores"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._decoder = _Decoder()
+        self._lock = threading.Lock()
+        self._file = open(self.path, "rb")
+        try:
+            _check_header(self._file.read(len(MAGIC) + 1))
+            index_offset = _read_trailer(self._file)
+            self._file.seek(index_offset)
+            index_bytes = self._file.read(self._file_size() - _TRAILER.size - index_offset)
+            self.index: Dict[str, int] = self._decoder.decode(index_bytes)
+        except Exception:
+            self._file.close()
+            raise
+
+    def _file_size(self) -> int:
+        return self.path.stat().st_size
+
+    def session_ids(self) -> List[str]:
+        return list(self.index.keys())
+
+    def read_record(self, session_id: str) -> Optional[bytes]:
+        """Raw encoded record for a session, or None if it is not in the snapshot"""
+        offset = self.index.get(session_id)
+        if offset is None:
+            return None
+        with self._lock:
+            self._file.seek(offset)
+            return _read_record(self._file)
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Decode a single session, or None if it is not in the snapshot"""
+        record = self.read_record(session_id)
+        if record is None:
+            return None
+        _, session = self._decoder.decode(record)
+        return session
+
+    def close(self):
+        self._file.close()
+
+
+def _check_header(header: bytes):
+    if len(header) < len(MAGIC) + 1:
+        raise SnapshotError("Snapshot is truncated")
+    if header[:len(MAGIC)] != MAGIC:
+        raise SnapshotError("Not a MAPIS session snapshot")
+    if header[len(MAGIC)] != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {header[len(MAGIC)]}")
+
+
+def _read_trailer(f) -> int:
+    if f.seek(0, 2) < len(MAGIC) + 1 + _TRAILER.size:
+        raise SnapshotError("Snapshot is truncated (missing index)")
+    f.seek(-_TRAILER.size, 2)
+    index_offset, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+    if magic != INDEX_MAGIC:
+        raise SnapshotError("Snapshot is truncated (missing index)")
+    return index_offset
+
+
+def _read_record(f) -> bytes:
+    header = f.read(4)
+    if len(header) < 4:
+        raise SnapshotError("Snapshot is truncated")
+    (length,) = _U32.unpack(header)
+    record = f.read(length)
+    if len(record) < length:
+        raise SnapshotError("Snapshot is truncated")
+    return record
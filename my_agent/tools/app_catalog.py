@@ -0,0 +1,146 @@
+"""
+App Catalog
+Word-level trie of product and brand names for recognising existing apps in user requests
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import os
+import re
+import threading
+import time
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_CATALOG = Path(__file__).parent.parent / "data" / "app_catalog.txt"
+
+# Brand-shaped tokens: keeps "booking.com", "h&m", "mcdonald's" and "disney+" whole,
+# but not a sentence's trailing period
+TOKEN_PATTERN = re.compile(r"\w+(?:[.&'’+-]\w+)*\+?")
+_TERMINAL = ""
+
+
+@dataclass
+class AppMention:
+    """One catalog name found in text"""
+    name: str
+    start: int
+    end: int
+    text: str
+
+
+class AppCatalog:
+    """
+    Product and brand names with aliases, matched longest-first on word boundaries
+
+    Names are stored in a trie keyed by lower-cased tokens rather than
+    characters, so a catalog of tens of thousands of names loads in a
+    fraction of a second and a scan costs one dict lookup per word of input
+    (plus a short walk where a name starts). Quoted names in the catalog file
+    only match with their exact capitalisation. The file is read on first use.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, entries: Optional[Iterable[Tuple[str, List[str]]]] = None):
+        self.path = Path(path) if path else DEFAULT_CATALOG
+        self._entries = entries
+        self._trie: Optional[Dict[str, dict]] = None
+        self._names = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def tokenize(text: str) -> List[Tuple[str, int, int]]:
+        return [(m.group(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+
+    @staticmethod
+    def parse(lines: Iterable[str]) -> List[Tuple[str, List[str]]]:
+        """Parse ``Name: alias, alias`` lines (quoted terms kept quoted), skipping blanks and # comments"""
+        entries = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            # Split on the first colon outside quotes (a quoted name may contain one)
+            name, aliases = re.match(r'((?:"[^"]*"|[^:])*):?(.*)', line).group(1, 2)
+            entries.append((name.strip(), [a.strip() for a in aliases.split(",") if a.strip()]))
+        return entries
+
+    def _load(self):
+        start = time.perf_counter()
+        entries = self._entries
+        if entries is None:
+            with open(self.path, encoding="utf-8") as f:
+                entries = self.parse(f)
+
+        trie: Dict[str, dict] = {}
+        names = 0
+        for name, aliases in entries:
+            canonical = name.strip('"')
+            names += 1
+            for term in (name, *aliases):
+                exact = term.startswith('"') and term.endswith('"') and len(term) > 1
+                tokens = [token for token, _, _ in self.tokenize(term.strip('"'))]
+                if not tokens:
+                    continue
+                node = trie
+                for token in tokens:
+                    node = node.setdefault(token.lower(), {})
+                # Terminal: canonical name plus the exact tokens required, if case-sensitive
+                node.setdefault(_TERMINAL, []).append((canonical, tuple(tokens) if exact else None))
+
+        self._trie = trie
+        self._names = names
+        logger.info("App catalog loaded", names=names, elapsed_ms=round((time.perf_counter() - start) * 1000, 1))
+
+    @property
+    def trie(self) -> Dict[str, dict]:
+        if self._trie is None:
+            with self._lock:
+                if self._trie is None:
+                    self._load()
+        return self._trie
+
+    def __len__(self) -> int:
+        self.trie
+        return self._names
+
+    def find_all(self, text: str) -> List[AppMention]:
+        """
+        Every catalog name in text, left to right
+
+        At each word the longest name starting there wins and the scan resumes
+        after it, so "Google Maps" is one mention rather than "Google" twice.
+        """
+        trie = self.trie
+        tokens = self.tokenize(text)
+        lowered = [token.lower() for token, _, _ in tokens]
+        mentions = []
+        i = 0
+        while i < len(tokens):
+            node = trie.get(lowered[i])
+            best = None
+            j = i
+            while node is not None:
+                for canonical, exact in node.get(_TERMINAL, ()):
+                    if exact is None or exact == tuple(token for token, _, _ in tokens[i:j + 1]):
+                        best = (canonical, j)
+                        break
+                j += 1
+                node = node.get(lowered[j]) if j < len(tokens) else None
+            if best is None:
+                i += 1
+                continue
+            canonical, last = best
+            start, end = tokens[i][1], tokens[last][2]
+            mentions.append(AppMention(canonical, start, end, text[start:end]))
+            i = last + 1
+        return mentions
+
+    def find(self, text: str) -> Optional[str]:
+        """The first catalog name mentioned in text, if any"""
+        mentions = self.find_all(text)
+        return mentions[0].name if mentions else None
+
+
+# Global instance (loaded on first use; APP_CATALOG_FILE overrides the bundled catalog)
+app_catalog = AppCatalog(path=os.getenv("APP_CATALOG_FILE") or None)
@@ -1,46 +1,111 @@
 """
 Code Execution MCP Tool Integration
-For generating wireframes and UI concepts
+For generating wireframes and UI concepts, and running generated Python
 """
-from typing import List
+from typing import List, Dict, Any, Optional
+import threading
 import structlog
+from .sandbox_pool import SandboxPool
+from .wireframe_layout import render_screen, render_many, DEFAULT_WIDTH, ElementSpec
 
 logger = structlog.get_logger(__name__)
 
 
 class CodeExecutionMCP:
-    """Code Execution MCP tool wrapper for generating wireframes"""
+    """Code Execution MCP tool wrapper for generating wireframes and executing code"""
     
-    def __init__(self):
+    def __init__(self, width: int = DEFAULT_WIDTH, sandbox: Optional[SandboxPool] = None):
+        self.width = width
+        # Workers are only started the first time code is executed (or on warm_up)
+        self._sandbox = sandbox
+        self._sandbox_lock = threading.Lock()
         logger.info("CodeExecutionMCP initialized")
     
-    async def generate_wireframe(self, screen_name: str, elements: List[str]) -> str:
+    @property
+    def sandbox(self) -> SandboxPool:
+        with self._sandbox_lock:
+            if self._sandbox is None:
+                self._sandbox = SandboxPool()
+            return self._sandbox
+    
+    async def generate_wireframe(self, screen_name: str, elements: List[ElementSpec]) -> str:
         """
         Generate ASCII wireframe for a screen
         
         Args:
             screen_name: Name of the screen
-            elements: List of UI elements to include
+            elements: List of UI elements to include; a nested list is laid
+                out as a row of side-by-side columns. Long elements wrap.
             
         Returns:
             ASCII wireframe string
         """
         logger.info(f"Generating wireframe: {screen_name}", elements=elements)
         
-        # Generate ASCII wireframe
-        width = 50
-        wireframe = f"\n[{screen_name}]\n"
-        wireframe += "-" * width + "\n"
-        
-        for element in elements:
-            wireframe += f"| {element:<{width-4}} |\n"
-        
-        wireframe += "-" * width + "\n"
+        wireframe = render_screen(screen_name, elements, self.width)
         
         logger.debug("Wireframe generated", length=len(wireframe))
         return wireframe
+    
+    async def render_many(self, screens: Dict[str, List[ElementSpec]]) -> Dict[str, str]:
+        """
+        Generate ASCII wireframes for all screens of a run in one pass
+        
+        Args:
+            screens: Mapping of screen name to its UI elements
+            
+        Returns:
+            Mapping of screen name to ASCII wireframe string
+        """
+        logger.info("Generating wireframes", screens=len(screens))
+        return render_many(screens, self.width)
+    
+    async def execute_python(self, code: str, inputs: Optional[Dict[str, Any]] = None,
+                             timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run generated Python in a warm, resource-limited sandbox worker
+        
+        Args:
+            code: Python source; it can read ``inputs`` and should assign ``result``
+            inputs: Optional JSON-serializable values passed to the code
+            timeout: Optional wall-time limit in seconds
+            
+        Returns:
+            Dict with ok, result, stdout, stderr, error, files and duration
+        """
+        logger.info("Executing code", chars=len(code))
+        response = await self.sandbox.run(code, inputs, timeout)
+        if not response["ok"]:
+            logger.warning("Code execution failed", error=response["error"].strip().splitlines()[-1:])
+        return response
+    
+    async def execute_many(self, codes: List[str], inputs: Optional[Dict[str, Any]] = None,
+                           timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Run several code snippets in parallel across the sandbox workers
+        
+        Args:
+            codes: Python sources to run
+            inputs: Optional values passed to every snippet
+            timeout: Optional wall-time limit per snippet in seconds
+            
+        Returns:
+            One execution result per snippet, in order
+        """
+        logger.info("Executing code batch", snippets=len(codes))
+        return await self.sandbox.map(codes, inputs, timeout)
+    
+    def warm_up(self):
+        """Start the sandbox workers ahead of the first execution"""
+        self.sandbox.start()
+    
+    def close(self):
+        """Stop the sandbox workers"""
+        with self._sandbox_lock:
+            if self._sandbox is not None:
+                self._sandbox.close()
+                self._sandbox = None
 
 
 # Global instance
 code_execution = CodeExecutionMCP()
-
@@ -2,32 +2,104 @@
 Google Search MCP Tool Integration
 For competitor research, market trends, and data gathering
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Protocol, Tuple
+import asyncio
+import os
+import time
 import structlog
+from .http_search import HTTPSearchBackend
+from .local_search import LocalCorpusSearchBackend
+from .search_cache import SearchCache, CacheEntry
 
 logger = structlog.get_logger(__name__)
 
 
+class SearchBackend(Protocol):
+    """Anything that can answer search() queries for GoogleSearchMCP"""
+    
+    async def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        ...
+
+
 class GoogleSearchMCP:
     """Google Search MCP tool wrapper"""
     
-    def __init__(self):
-        logger.info("GoogleSearchMCP initialized")
+    def __init__(self, backend: Optional[SearchBackend] = None, cache: Optional[SearchCache] = None, use_cache: bool = True):
+        # Fall back to an endpoint or local corpus configured in the environment, if any
+        if backend is None:
+            backend = HTTPSearchBackend.from_env() or LocalCorpusSearchBackend.from_env()
+        self.backend = backend
+        if cache is None and use_cache:
+            cache = SearchCache(disk_dir=os.getenv("SEARCH_CACHE_DIR") or None)
+        self.cache = cache
+        # In-flight fetches per (event loop, cache key), so concurrent misses share one request
+        self._inflight: Dict[Tuple[int, str], asyncio.Task] = {}
+        logger.info("GoogleSearchMCP initialized", backend=type(self.backend).__name__ if self.backend else None,
+                    cache=self.cache is not None)
     
-    async def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+    async def search(self, query: str, max_results: int = 5, cache_policy: str = "default") -> List[Dict[str, Any]]:
         """
         Search Google for information
         
         Args:
             query: Search query
             max_results: Maximum number of results to return
+            cache_policy: TTL policy name for the result cache
             
         Returns:
             List of search results with title, url, snippet
         """
         logger.info(f"Searching Google: {query}", query=query, max_results=max_results)
         
-        # Placeholder implementation - integrate with actual Google Search MCP server in production
+        if self.cache is None:
+            try:
+                return await self._fetch(query, max_results)
+            except Exception as e:
+                logger.error("Search backend failed", error=str(e), error_type=type(e).__name__, query=query)
+                return []
+        
+        key = SearchCache.make_key(query, max_results)
+        entry = await self.cache.get(key)
+        if entry is not None:
+            if not entry.is_fresh(time.time()):
+                # Stale-while-revalidate: answer now, refresh in the background
+                self._fetch_shared(key, query, max_results, cache_policy, stale=entry)
+            return entry.results
+        
+        return await asyncio.shield(self._fetch_shared(key, query, max_results, cache_policy))
+    
+    def _fetch_shared(self, key: str, query: str, max_results: int, policy: str,
+                      stale: Optional[CacheEntry] = None) -> asyncio.Task:
+        """Start (or join) the fetch for a cache key on the running loop"""
+        loop = asyncio.get_running_loop()
+        inflight_key = (id(loop), key)
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            task = loop.create_task(self._fetch_and_store(key, query, max_results, policy, stale))
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(inflight_key, None))
+        return task
+    
+    async def _fetch_and_store(self, key: str, query: str, max_results: int, policy: str,
+                               stale: Optional[CacheEntry]) -> List[Dict[str, Any]]:
+        try:
+            results = await self._fetch(query, max_results)
+        except Exception as e:
+            logger.error("Search backend failed", error=str(e), error_type=type(e).__name__, query=query)
+            # Never cache a failure: the negative TTL is for searches that succeeded and found nothing,
+            # and an outage must not read as "no results" for every session until it expires
+            return stale.results if stale is not None else []
+        await self.cache.put(key, results, policy)
+        return results
+    
+    async def _fetch(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Query the backend (or the placeholder); backend errors propagate"""
+        if self.backend is not None:
+            results = await self.backend.search(query, max_results=max_results)
+            logger.debug(f"Search returned {len(results)} results")
+            return results
+        
+        # Placeholder implementation - used when no search backend is configured
         results = [
             {
                 "title": f"Result for: {query}",
@@ -39,22 +111,33 @@ class GoogleSearchMCP:
         logger.debug(f"Search returned {len(results)} results")
         return results
     
+    @staticmethod
+    def competitors_query(domain: str, product_type: str) -> str:
+        return f"{domain} {product_type} competitors alternatives"
+    
+    @staticmethod
+    def market_trends_query(domain: str) -> str:
+        return f"{domain} market trends 2024 2025"
+    
+    @staticmethod
+    def market_size_query(domain: str, region: str = "global") -> str:
+        return f"{domain} market size {region} TAM SAM SOM"
+    
     async def search_competitors(self, domain: str, product_type: str) -> List[Dict[str, Any]]:
         """Search for competitors in a domain"""
-        query = f"{domain} {product_type} competitors alternatives"
-        return await self.search(query, max_results=10)
+        query = self.competitors_query(domain, product_type)
+        return await self.search(query, max_results=10, cache_policy="competitors")
     
     async def search_market_trends(self, domain: str) -> List[Dict[str, Any]]:
         """Search for market trends in a domain"""
-        query = f"{domain} market trends 2024 2025"
-        return await self.search(query, max_results=5)
+        query = self.market_trends_query(domain)
+        return await self.search(query, max_results=5, cache_policy="market_trends")
     
     async def search_market_size(self, domain: str, region: str = "global") -> List[Dict[str, Any]]:
         """Search for market size data"""
-        query = f"{domain} market size {region} TAM SAM SOM"
-        return await self.search(query, max_results=5)
+        query = self.market_size_query(domain, region)
+        return await self.search(query, max_results=5, cache_policy="market_size")
 
 
 # Global instance
 google_search = GoogleSearchMCP()
-
@@ -0,0 +1,170 @@
+"""
+HTTP Search Backend
+Pooled async HTTP client for real search endpoints behind GoogleSearchMCP
+"""
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlsplit
+import asyncio
+import os
+import weakref
+import httpx
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+GOOGLE_CSE_ENDPOINT = "https://www.googleapis.com/customsearch/v1"
+
+
+def parse_search_response(payload: Any, max_results: int) -> List[Dict[str, Any]]:
+    """
+    Normalize a search API response into title/url/snippet dicts
+
+    Understands the Google Custom Search JSON format (``items`` with
+    ``link``) and the common ``results`` / ``organic_results`` shapes used by
+    other search APIs and stand-in servers.
+
+    Args:
+        payload: Decoded JSON response
+        max_results: Maximum number of results to return
+
+    Returns:
+        List of search results with title, url, snippet
+    """
+    if isinstance(payload, list):
+        items = payload
+    elif isinstance(payload, dict):
+        items = payload.get("items") or payload.get("results") or payload.get("organic_results") or []
+    else:
+        items = []
+
+    results = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        url = item.get("link") or item.get("url") or ""
+        title = item.get("title") or url
+        if not title:
+            continue
+        results.append({
+            "title": str(title),
+            "url": str(url),
+            "snippet": str(item.get("snippet") or item.get("description") or item.get("content") or "")
+        })
+        if len(results) >= max_results:
+            break
+    return results
+
+
+class HTTPSearchBackend:
+    """
+    Search backend that queries an HTTP JSON endpoint
+
+    One ``httpx.AsyncClient`` is shared per event loop, so keep-alive
+    connections are reused across every search in that loop. Concurrency is
+    capped per host on top of the client's global connection limit.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        query_param: str = "q",
+        count_param: Optional[str] = "num",
+        max_count: Optional[int] = 10,
+        timeout: float = 10.0,
+        connect_timeout: float = 3.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        per_host_limit: int = 8
+    ):
+        self.endpoint = endpoint
+        self.params = dict(params or {})
+        self.headers = dict(headers or {})
+        self.query_param = query_param
+        self.count_param = count_param
+        self.max_count = max_count
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self.per_host_limit = per_host_limit
+        # Clients and semaphores are bound to the loop that created them
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        self._host_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+        logger.info("HTTPSearchBackend initialized", endpoint=endpoint, per_host_limit=per_host_limit)
+
+    @classmethod
+    def from_env(cls) -> Optional["HTTPSearchBackend"]:
+        """
+        Build a backend from environment variables, or None if not configured
+
+        SEARCH_API_URL selects a generic endpoint (optional SEARCH_API_KEY is
+        sent as a bearer token). Otherwise GOOGLE_SEARCH_API_KEY and
+        GOOGLE_SEARCH_ENGINE_ID select the Google Custom Search JSON API.
+        """
+        endpoint = os.getenv("SEARCH_API_URL")
+        if endpoint:
+            api_key = os.getenv("SEARCH_API_KEY")
+            headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
+            return cls(endpoint, headers=headers, max_count=None)
+
+        api_key = os.getenv("GOOGLE_SEARCH_API_KEY")
+        engine_id = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
+        if api_key and engine_id:
+            return cls(GOOGLE_CSE_ENDPOINT, params={"key": api_key, "cx": engine_id})
+        return None
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                headers=self.headers
+            )
+            self._clients[loop] = client
+        return client
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        limits = self._host_limits.setdefault(loop, {})
+        semaphore = limits.get(host)
+        if semaphore is None:
+            semaphore = limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphore
+
+    async def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Query the endpoint
+
+        Args:
+            query: Search query
+            max_results: Maximum number of results to return
+
+        Returns:
+            List of search results with title, url, snippet
+
+        Raises:
+            httpx.HTTPError: On timeouts, connection errors and non-2xx responses
+        """
+        params = dict(self.params)
+        params[self.query_param] = query
+        if self.count_param:
+            params[self.count_param] = min(max_results, self.max_count) if self.max_count else max_results
+
+        host = urlsplit(self.endpoint).netloc
+        async with self._host_semaphore(host):
+            response = await self._client().get(self.endpoint, params=params)
+        response.raise_for_status()
+        return parse_search_response(response.json(), max_results)
+
+    async def aclose(self):
+        """Close the client owned by the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.pop(loop, None)
+        self._host_limits.pop(loop, None)
+        if client is not None:
+            await client.aclose()
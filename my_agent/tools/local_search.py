@@ -0,0 +1,318 @@
+"""
+Local Corpus Search Backend
+Offline BM25 search over a directory of market reports and competitor notes
+"""
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+import asyncio
+import heapq
+import json
+import mmap
+import os
+import re
+import sys
+import threading
+import structlog
+from ..utils.bm25 import tokenize, idf, term_score, DEFAULT_K1, DEFAULT_B
+
+logger = structlog.get_logger(__name__)
+
+INDEX_DIRNAME = ".mapis_index"
+SUPPORTED_SUFFIXES = {".md", ".markdown", ".txt", ".json"}
+CHUNK_MIN_WORDS = 40
+CHUNK_MAX_WORDS = 200
+SNIPPET_CHARS = 300
+
+_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.*?)\s*#*\s*$")
+_JSON_TEXT_FIELDS = ("snippet", "summary", "description", "content", "text", "body", "notes")
+
+
+def _split_markdown(text: str, default_title: str) -> List[Tuple[str, str]]:
+    """Split text into (title, passage) chunks on paragraphs and headings"""
+    chunks: List[Tuple[str, str]] = []
+    title = default_title
+    buffer: List[str] = []
+    words = 0
+
+    for paragraph in re.split(r"\n\s*\n", text):
+        lines = paragraph.strip().splitlines()
+        if not lines:
+            continue
+        heading = _HEADING.match(lines[0])
+        if heading:
+            if buffer:
+                chunks.append((title, "\n".join(buffer)))
+                buffer, words = [], 0
+            title = f"{default_title}: {heading.group(1)}"
+            lines = lines[1:]
+            if not lines:
+                continue
+        paragraph_words = sum(len(line.split()) for line in lines)
+        if buffer and words + paragraph_words > CHUNK_MAX_WORDS:
+            chunks.append((title, "\n".join(buffer)))
+            buffer, words = [], 0
+        buffer.append("\n".join(lines))
+        words += paragraph_words
+        if words >= CHUNK_MIN_WORDS:
+            chunks.append((title, "\n".join(buffer)))
+            buffer, words = [], 0
+
+    if buffer:
+        chunks.append((title, "\n".join(buffer)))
+    return chunks
+
+
+def _split_json(data: Any, default_title: str) -> List[Tuple[str, str]]:
+    """Split a JSON document into (title, passage) chunks, one per record"""
+    if isinstance(data, list):
+        records = data
+    elif isinstance(data, dict):
+        records = data.get("items") or data.get("results") or [data]
+    else:
+        records = [data]
+
+    chunks: List[Tuple[str, str]] = []
+    for record in records:
+        if isinstance(record, dict):
+            title = str(record.get("title") or record.get("name") or default_title)
+            texts = [str(record[k]) for k in _JSON_TEXT_FIELDS if record.get(k)]
+            if not texts:
+                texts = [f"{k}: {v}" for k, v in record.items() if k not in ("title", "name")]
+            chunks.append((title, "\n".join(texts)))
+        elif record is not None:
+            chunks.append((default_title, str(record)))
+    return chunks
+
+
+class LocalCorpusSearchBackend:
+    """
+    BM25 search backend over local files
+
+    The index lives in ``<corpus_dir>/.mapis_index`` (or ``index_dir``):
+        files.json    per-file mtime/size and per-chunk term frequencies
+        docs.json     chunk titles, snippets, source paths and lengths
+        terms.json    term -> [postings offset, postings count]
+        postings.bin  (chunk id, tf) uint32 pairs, memory-mapped for queries
+
+    Re-indexing only re-parses files whose mtime or size changed; postings are
+    then rewritten from the stored term frequencies.
+    """
+
+    def __init__(self, corpus_dir: Path, index_dir: Optional[Path] = None, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        self.corpus_dir = Path(corpus_dir)
+        self.index_dir = Path(index_dir) if index_dir else self.corpus_dir / INDEX_DIRNAME
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._docs: List[Dict[str, Any]] = []
+        self._terms: Dict[str, List[int]] = {}
+        self._avg_len = 0.0
+        self._mmap: Optional[mmap.mmap] = None
+        self._postings: Optional[memoryview] = None
+        logger.info("LocalCorpusSearchBackend initialized", corpus_dir=str(self.corpus_dir))
+
+    @classmethod
+    def from_env(cls) -> Optional["LocalCorpusSearchBackend"]:
+        """Build a backend from SEARCH_CORPUS_DIR, or None if not configured"""
+        corpus_dir = os.getenv("SEARCH_CORPUS_DIR")
+        return cls(Path(corpus_dir)) if corpus_dir else None
+
+    async def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Search the local corpus
+
+        Args:
+            query: Search query
+            max_results: Maximum number of results to return
+
+        Returns:
+            List of search results with title, url, snippet (and score)
+        """
+        if not self._loaded:
+            # First use may need to build the index - keep that off the event loop
+            await asyncio.to_thread(self.ensure_index)
+        return self.query(query, max_results)
+
+    def query(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Synchronous BM25 query against the memory-mapped postings"""
+        self.ensure_index()
+        query_terms = set(tokenize(query))
+        with self._lock:
+            total_docs = len(self._docs)
+            if not query_terms or not total_docs or self._postings is None:
+                return []
+
+            scores: Dict[int, float] = {}
+            for term in query_terms:
+                entry = self._terms.get(term)
+                if entry is None:
+                    continue
+                offset, count = entry
+                term_idf = idf(total_docs, count)
+                pairs = self._postings[offset * 2:(offset + count) * 2]
+                for i in range(0, len(pairs), 2):
+                    doc_id = pairs[i]
+                    scores[doc_id] = scores.get(doc_id, 0.0) + term_score(
+                        pairs[i + 1], self._docs[doc_id]["length"], self._avg_len, term_idf, self.k1, self.b
+                    )
+
+            results = []
+            for doc_id, score in heapq.nlargest(max_results, scores.items(), key=lambda item: item[1]):
+                doc = self._docs[doc_id]
+                results.append({
+                    "title": doc["title"],
+                    "url": doc["url"],
+                    "snippet": doc["snippet"],
+                    "score": round(score, 4)
+                })
+            return results
+
+    def ensure_index(self):
+        """Load the on-disk index, building it first if it does not exist"""
+        with self._lock:
+            if self._loaded:
+                return
+            if not (self.index_dir / "terms.json").exists():
+                self.reindex()
+            else:
+                self._load()
+
+    def reindex(self) -> Dict[str, int]:
+        """
+        Bring the index up to date with the corpus directory
+
+        Returns:
+            Counts of added, updated, unchanged and removed files
+        """
+        with self._lock:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            files_path = self.index_dir / "files.json"
+            previous: Dict[str, Any] = {}
+            if files_path.exists():
+                with open(files_path, "r", encoding="utf-8") as f:
+                    previous = json.load(f)
+
+            counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+            current: Dict[str, Any] = {}
+            for path in sorted(self._corpus_files()):
+                rel = path.relative_to(self.corpus_dir).as_posix()
+                stat = path.stat()
+                old = previous.get(rel)
+                if old and old["mtime_ns"] == stat.st_mtime_ns and old["size"] == stat.st_size:
+                    current[rel] = old
+                    counts["unchanged"] += 1
+                    continue
+                current[rel] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "chunks": self._parse(path)}
+                counts["updated" if old else "added"] += 1
+            counts["removed"] = len(set(previous) - set(current))
+
+            self._write_index(current)
+            self._write_json(files_path, current)
+            self._load()
+
+        logger.info("Local corpus indexed", corpus_dir=str(self.corpus_dir), documents=len(self._docs), **counts)
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._release_mmap()
+            self._loaded = False
+
+    def _corpus_files(self) -> Iterator[Path]:
+        for root, dirs, files in os.walk(self.corpus_dir):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                path = Path(root) / name
+                if path.suffix.lower() in SUPPORTED_SUFFIXES:
+                    yield path
+
+    def _parse(self, path: Path) -> List[Dict[str, Any]]:
+        default_title = path.stem.replace("_", " ").replace("-", " ").strip() or path.name
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+            if path.suffix.lower() == ".json":
+                pieces = _split_json(json.loads(text), default_title)
+            else:
+                pieces = _split_markdown(text, default_title)
+        except (OSError, ValueError) as e:
+            logger.warning("Skipping unreadable corpus file", path=str(path), error=str(e))
+            return []
+
+        chunks = []
+        for title, passage in pieces:
+            terms = tokenize(f"{title} {passage}")
+            if not terms:
+                continue
+            snippet = " ".join(passage.split())
+            if len(snippet) > SNIPPET_CHARS:
+                snippet = snippet[:SNIPPET_CHARS].rsplit(" ", 1)[0] + "..."
+            chunks.append({"title": title, "snippet": snippet, "length": len(terms), "tf": dict(Counter(terms))})
+        return chunks
+
+    def _write_index(self, files: Dict[str, Any]):
+        docs: List[Dict[str, Any]] = []
+        postings: Dict[str, List[int]] = {}
+        for rel, info in files.items():
+            url = (self.corpus_dir / rel).resolve().as_uri()
+            for n, chunk in enumerate(info["chunks"]):
+                doc_id = len(docs)
+                docs.append({
+                    "title": chunk["title"],
+                    "snippet": chunk["snippet"],
+                    "url": f"{url}#chunk-{n}" if len(info["chunks"]) > 1 else url,
+                    "length": chunk["length"]
+                })
+                for term, tf in chunk["tf"].items():
+                    postings.setdefault(term, []).extend((doc_id, tf))
+
+        terms: Dict[str, List[int]] = {}
+        flat = array("I")
+        for term in sorted(postings):
+            pairs = postings[term]
+            terms[term] = [len(flat) // 2, len(pairs) // 2]
+            flat.extend(pairs)
+
+        # Release the old mapping before replacing the file underneath it
+        self._release_mmap()
+        tmp_path = self.index_dir / "postings.bin.tmp"
+        with open(tmp_path, "wb") as f:
+            flat.tofile(f)
+        os.replace(tmp_path, self.index_dir / "postings.bin")
+        self._write_json(self.index_dir / "docs.json", docs)
+        self._write_json(self.index_dir / "terms.json", {"byteorder": sys.byteorder, "terms": terms})
+
+    def _load(self):
+        with open(self.index_dir / "docs.json", "r", encoding="utf-8") as f:
+            self._docs = json.load(f)
+        with open(self.index_dir / "terms.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("byteorder") != sys.byteorder:
+            raise ValueError("Local search index was built on a machine with a different byte order; reindex it")
+        self._terms = meta["terms"]
+        self._avg_len = sum(d["length"] for d in self._docs) / len(self._docs) if self._docs else 0.0
+
+        self._release_mmap()
+        postings_path = self.index_dir / "postings.bin"
+        if postings_path.stat().st_size:
+            with open(postings_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._postings = memoryview(self._mmap).cast("I")
+        self._loaded = True
+
+    def _release_mmap(self):
+        if self._postings is not None:
+            self._postings.release()
+            self._postings = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    @staticmethod
+    def _write_json(path: Path, data: Any):
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
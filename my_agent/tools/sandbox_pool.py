@@ -0,0 +1,319 @@
+"""
+Sandbox Worker Pool
+Warm pool of resource-limited Python subprocesses for running generated code
+"""
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence
+import asyncio
+import json
+import os
+import queue
+import selectors
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+WORKER_SCRIPT = Path(__file__).with_name("sandbox_worker.py")
+HEADER_SIZE = 4
+DEFAULT_PRELOAD = ("math", "statistics", "json", "random", "decimal", "itertools", "collections")
+
+
+class SandboxError(RuntimeError):
+    """A worker could not be started or died outside of a job"""
+
+
+@dataclass
+class SandboxLimits:
+    """Per-worker resource limits"""
+    cpu_seconds: float = 5.0
+    wall_seconds: float = 10.0
+    memory_mb: int = 1024
+    file_size_mb: int = 16
+    max_output_chars: int = 65536
+    max_file_bytes: int = 65536
+
+
+class _Worker:
+    """One warm interpreter with its own temporary working directory"""
+
+    def __init__(self, limits: SandboxLimits, max_jobs: int, preload: Sequence[str], startup_timeout: float):
+        self.workdir = tempfile.mkdtemp(prefix="mapis-sandbox-")
+        config = {**asdict(limits), "max_jobs": max_jobs, "preload": list(preload)}
+        # Isolated mode plus a scrubbed environment: no API keys or user site-packages leak in
+        env = {"PATH": os.environ.get("PATH", ""), "HOME": self.workdir, "TMPDIR": self.workdir,
+               "PYTHONDONTWRITEBYTECODE": "1", "OPENBLAS_NUM_THREADS": "1", "OMP_NUM_THREADS": "1"}
+        self.process = subprocess.Popen(
+            [sys.executable, "-I", str(WORKER_SCRIPT), json.dumps(config)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            cwd=self.workdir, env=env, start_new_session=True, close_fds=True
+        )
+        self.jobs = 0
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.process.stdout, selectors.EVENT_READ)
+        try:
+            ready = self._receive(startup_timeout)
+        except (SandboxError, TimeoutError) as e:
+            self.kill()
+            raise SandboxError(f"Sandbox worker failed to start: {e or 'timed out'}") from e
+        if not ready.get("ready"):
+            self.kill()
+            raise SandboxError("Sandbox worker did not report ready")
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def run(self, payload: bytes, timeout: float) -> Dict[str, Any]:
+        """Send one JSON-encoded job and wait for its response"""
+        self.jobs += 1
+        try:
+            self.process.stdin.write(len(payload).to_bytes(HEADER_SIZE, "little") + payload)
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise SandboxError(f"Sandbox worker is gone: {e}") from e
+        return self._receive(timeout)
+
+    def _receive(self, timeout: float) -> Dict[str, Any]:
+        header = self._read_exact(HEADER_SIZE, timeout)
+        return json.loads(self._read_exact(int.from_bytes(header, "little"), timeout))
+
+    def _read_exact(self, size: int, timeout: float) -> bytes:
+        deadline = time.monotonic() + timeout
+        chunks = []
+        fd = self.process.stdout.fileno()
+        while size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._selector.select(remaining):
+                raise TimeoutError()
+            chunk = os.read(fd, size)
+            if not chunk:
+                raise SandboxError(f"Sandbox worker exited (code {self.process.poll()})")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def kill(self):
+        if self.process.poll() is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError, AttributeError):
+                self.process.kill()
+        self.process.wait()
+        self._close()
+
+    def close(self):
+        """Let the worker exit on EOF, killing it if it lingers"""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        self.kill()
+
+    def _close(self):
+        self._selector.close()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class SandboxPool:
+    """
+    Pre-forked pool of sandboxed Python workers
+
+    Workers are started ahead of time (with common modules preloaded) and
+    reused, so a job costs a pipe round trip instead of an interpreter start.
+    Each worker runs under rlimits for address space, file size and CPU time,
+    in its own temporary directory, with a scrubbed environment. Wall time is
+    enforced here: a worker that overruns is killed and replaced. Workers are
+    recycled after ``max_jobs`` jobs to bound state leaking between jobs.
+
+    This limits resources; it is not a security boundary against hostile code
+    (there is no network or filesystem namespace isolation).
+    """
+
+    def __init__(self, size: Optional[int] = None, max_jobs: int = 50, limits: Optional[SandboxLimits] = None,
+                 preload: Sequence[str] = DEFAULT_PRELOAD, startup_timeout: float = 10.0):
+        self.size = size or os.cpu_count() or 2
+        self.max_jobs = max_jobs
+        self.limits = limits or SandboxLimits()
+        self.preload = tuple(preload)
+        self.startup_timeout = startup_timeout
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._closed = False
+        self._stats = {"jobs": 0, "failed": 0, "timeouts": 0, "recycled": 0, "crashed": 0}
+        logger.info("SandboxPool initialized", size=self.size, max_jobs=max_jobs)
+
+    def start(self) -> "SandboxPool":
+        """Start all workers now rather than on first use"""
+        with self._lock:
+            missing = self.size - self._workers
+            self._workers += max(0, missing)
+        # Interpreter start-up dominates, so bring the workers up in parallel
+        threads = [threading.Thread(target=self._start_one, daemon=True) for _ in range(max(0, missing))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.info("Sandbox workers warm", workers=self._workers)
+        return self
+
+    async def run(self, code: str, inputs: Optional[Dict[str, Any]] = None,
+                  timeout: Optional[float] = None, cpu_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Run code in a worker without blocking the event loop"""
+        return await asyncio.to_thread(self.run_sync, code, inputs, timeout, cpu_seconds)
+
+    async def map(self, codes: List[str], inputs: Optional[Dict[str, Any]] = None,
+                  timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Run several snippets in parallel across the pool"""
+        return list(await asyncio.gather(*(self.run(code, inputs, timeout) for code in codes)))
+
+    def run_sync(self, code: str, inputs: Optional[Dict[str, Any]] = None,
+                 timeout: Optional[float] = None, cpu_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run Python code in a sandboxed worker
+
+        Args:
+            code: Source to execute; it sees an ``inputs`` dict and may set ``result``
+            inputs: JSON-serializable values exposed to the code as ``inputs``
+            timeout: Wall-time limit in seconds (defaults to the pool limit)
+            cpu_seconds: CPU-time limit in seconds (defaults to the pool limit)
+
+        Returns:
+            Dict with ok, result, stdout, stderr, error, files (small text files
+            the code wrote) and duration
+        """
+        timeout = timeout or self.limits.wall_seconds
+        job = {"code": code, "inputs": inputs or {}, "cpu_seconds": cpu_seconds}
+        # Encoded before a worker is taken, so bad inputs never hold one
+        try:
+            payload = json.dumps(job).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            return self._failure(f"Inputs are not JSON-serializable: {e}", 0.0)
+
+        worker = self._acquire()
+        try:
+            response = worker.run(payload, timeout)
+        except TimeoutError:
+            self._discard(worker, "timeouts")
+            return self._failure(f"Wall time limit exceeded ({timeout}s)", timeout)
+        except SandboxError as e:
+            # Typically the memory limit killing the interpreter outright
+            self._discard(worker, "crashed")
+            return self._failure(str(e), 0.0)
+        except BaseException:
+            # Interrupted mid-job (KeyboardInterrupt, a garbled response): the worker's state is
+            # unknown, so it is killed rather than returned to the pool
+            self._discard(worker)
+            raise
+
+        self._release(worker)
+        with self._lock:
+            self._stats["jobs"] += 1
+            if not response["ok"]:
+                self._stats["failed"] += 1
+        response["worker"] = worker.pid
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "workers": self._workers, "idle": self._idle.qsize()}
+
+    def close(self):
+        """Stop all idle workers; busy workers are stopped when they finish"""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.close()
+            with self._lock:
+                self._workers -= 1
+        logger.info("SandboxPool closed", **self.stats())
+
+    def _spawn(self) -> _Worker:
+        try:
+            return _Worker(self.limits, self.max_jobs, self.preload, self.startup_timeout)
+        except Exception:
+            with self._lock:
+                self._workers -= 1
+            raise
+
+    def _acquire(self) -> _Worker:
+        while True:
+            if self._closed:
+                raise SandboxError("SandboxPool is closed")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                grow = self._workers < self.size
+                if grow:
+                    self._workers += 1
+            if grow:
+                return self._spawn()
+            try:
+                # Time out periodically so a worker discarded elsewhere lets us grow again
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+    def _release(self, worker: _Worker):
+        if self._closed:
+            self._discard(worker)
+        elif worker.jobs >= self.max_jobs:
+            with self._lock:
+                self._stats["recycled"] += 1
+            self._discard(worker, graceful=True)
+        else:
+            self._idle.put(worker)
+
+    def _discard(self, worker: _Worker, reason: Optional[str] = None, graceful: bool = False):
+        if graceful:
+            worker.close()
+        else:
+            worker.kill()
+        with self._lock:
+            self._workers -= 1
+            if reason:
+                self._stats["jobs"] += 1
+                self._stats["failed"] += 1
+                self._stats[reason] += 1
+        if reason:
+            logger.warning("Sandbox worker discarded", reason=reason, pid=worker.pid)
+        if not self._closed:
+            # Start the replacement in the background so the pool stays warm
+            threading.Thread(target=self._refill, daemon=True).start()
+
+    def _refill(self):
+        with self._lock:
+            if self._closed or self._workers >= self.size:
+                return
+            self._workers += 1
+        self._start_one()
+
+    def _start_one(self):
+        try:
+            self._idle.put(self._spawn())
+        except Exception as e:
+            logger.warning("Failed to start replacement sandbox worker", error=str(e))
+
+    @staticmethod
+    def _failure(error: str, duration: float) -> Dict[str, Any]:
+        return {"ok": False, "result": None, "stdout": "", "stderr": "", "error": error,
+                "files": {}, "duration": duration, "worker": None}
@@ -0,0 +1,210 @@
+"""
+Sandbox Worker
+Child process for SandboxPool: applies resource limits, then runs jobs sent over stdin
+
+Run as a script (``python -I sandbox_worker.py '<config json>'``); it imports
+nothing from the package so the interpreter starts as lean as possible.
+"""
+import contextlib
+import io
+import json
+import math
+import os
+import shutil
+import signal
+import struct
+import sys
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+HEADER = struct.Struct("<I")
+
+
+class CPULimitExceeded(BaseException):
+    """Raised from SIGXCPU; a BaseException so job code cannot swallow it with `except Exception`"""
+
+
+def _on_sigxcpu(signum, frame):
+    raise CPULimitExceeded()
+
+
+def apply_limits(config):
+    if resource is None:
+        return
+    mb = 1024 * 1024
+    limits = (
+        (resource.RLIMIT_AS, config["memory_mb"] * mb),
+        (resource.RLIMIT_FSIZE, config["file_size_mb"] * mb),
+        (resource.RLIMIT_CORE, 0),
+        # hard CPU cap for the worker's whole life; the per-job soft limit is set in run_job
+        (resource.RLIMIT_CPU, int(config["cpu_seconds"] * (config["max_jobs"] + 1)) + 5),
+    )
+    for limit, value in limits:
+        try:
+            resource.setrlimit(limit, (value, value))
+        except (ValueError, OSError):
+            pass
+    signal.signal(signal.SIGXCPU, _on_sigxcpu)
+
+
+def set_job_cpu_limit(seconds):
+    if resource is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = math.ceil(usage.ru_utime + usage.ru_stime + seconds)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def collect_files(job_dir, max_bytes):
+    """Small UTF-8 files the job left in its working directory"""
+    files = {}
+    for root, _, names in os.walk(job_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, job_dir)
+            try:
+                if os.path.getsize(path) > max_bytes:
+                    files[rel] = None
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    files[rel] = f.read()
+            except (OSError, UnicodeDecodeError):
+                files[rel] = None
+    return files
+
+
+@contextlib.contextmanager
+def redirect_fds(paths):
+    """
+    Point fds 1 and 2 at files while a job runs
+
+    Catches what bypasses sys.stdout/sys.stderr: child processes
+    (os.system, subprocess), os.write and sys.__stdout__.
+    """
+    saved = []
+    _flush_std()
+    try:
+        for fd, path in zip((1, 2), paths):
+            target = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            saved.append((fd, os.dup(fd)))
+            os.dup2(target, fd)
+            os.close(target)
+        yield
+    finally:
+        _flush_std()
+        for fd, original in saved:
+            os.dup2(original, fd)
+            os.close(original)
+
+
+def _flush_std():
+    for stream in (sys.__stdout__, sys.__stderr__):
+        try:
+            stream.flush()
+        except (AttributeError, OSError, ValueError):
+            pass
+
+
+def read_capture(path, max_chars):
+    """Text a job wrote to one of its fds (at most max_chars), removing the capture file"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(max_chars * 4)
+        os.remove(path)
+    except OSError:
+        return ""
+    return data.decode("utf-8", errors="replace")[:max_chars]
+
+
+def run_job(job, config, workdir, seq):
+    max_output = config["max_output_chars"]
+    job_dir = os.path.join(workdir, f"job-{seq}")
+    os.mkdir(job_dir)
+    os.chdir(job_dir)
+    stdout, stderr = io.StringIO(), io.StringIO()
+    # Outside job_dir, so they are not collected as files the job wrote
+    captures = (os.path.join(workdir, f"job-{seq}.stdout"), os.path.join(workdir, f"job-{seq}.stderr"))
+    namespace = {"__name__": "__sandbox__", "inputs": job.get("inputs") or {}}
+    response = {"ok": True, "error": None, "result": None}
+    start = time.perf_counter()
+
+    try:
+        set_job_cpu_limit(job.get("cpu_seconds") or config["cpu_seconds"])
+        with redirect_fds(captures), contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exec(compile(job["code"], "<sandbox>", "exec"), namespace)
+    except CPULimitExceeded:
+        response.update(ok=False, error="CPU time limit exceeded")
+    except MemoryError:
+        response.update(ok=False, error="Memory limit exceeded")
+    except BaseException:
+        response.update(ok=False, error=traceback.format_exc(limit=-5))
+    finally:
+        if resource is not None:
+            _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+    result = namespace.get("result")
+    try:
+        json.dumps(result)
+        response["result"] = result
+    except (TypeError, ValueError):
+        response["result"] = repr(result)
+
+    response.update(
+        stdout=(stdout.getvalue() + read_capture(captures[0], max_output))[:max_output],
+        stderr=(stderr.getvalue() + read_capture(captures[1], max_output))[:max_output],
+        files=collect_files(job_dir, config["max_file_bytes"]),
+        duration=round(time.perf_counter() - start, 6),
+    )
+    os.chdir(workdir)
+    shutil.rmtree(job_dir, ignore_errors=True)
+    return response
+
+
+def main():
+    config = json.loads(sys.argv[1])
+    workdir = os.getcwd()
+    # Protocol messages use private copies of the original stdin/stdout; fds 0 and 1 are pointed at
+    # /dev/null so nothing a job runs can read from or write into the protocol pipes
+    channel_in = os.fdopen(os.dup(0), "rb")
+    channel_out = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    sys.stdin = io.StringIO()
+
+    for module in config.get("preload", ()):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+    apply_limits(config)
+
+    def send(message):
+        payload = json.dumps(message, default=repr).encode("utf-8")
+        channel_out.write(HEADER.pack(len(payload)) + payload)
+        channel_out.flush()
+
+    send({"ready": True, "pid": os.getpid()})
+    seq = 0
+    while True:
+        header = channel_in.read(HEADER.size)
+        if len(header) < HEADER.size:
+            break
+        (length,) = HEADER.unpack(header)
+        job = json.loads(channel_in.read(length))
+        seq += 1
+        send(run_job(job, config, workdir, seq))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Search Result Cache
+Two-tier (memory + optional disk) TTL cache for GoogleSearchMCP results
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# (fresh seconds, extra seconds a stale entry may still be served while it is refreshed)
+DEFAULT_TTLS: Dict[str, tuple] = {
+    "default": (3600, 3600),
+    "competitors": (24 * 3600, 24 * 3600),
+    "market_trends": (6 * 3600, 6 * 3600),
+    "market_size": (7 * 24 * 3600, 7 * 24 * 3600),
+}
+NEGATIVE_TTL = 300
+
+_PUNCTUATION = re.compile(r"[^\w\s$%-]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a query: lowercase, punctuation stripped, whitespace collapsed"""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", query.lower())).strip()
+
+
+@dataclass
+class CacheEntry:
+    """Cached search results with freshness bounds (unix timestamps)"""
+    results: List[Dict[str, Any]]
+    fresh_until: float
+    stale_until: float
+
+    @property
+    def negative(self) -> bool:
+        return not self.results
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    def is_usable(self, now: float) -> bool:
+        return now < self.stale_until
+
+
+class SearchCache:
+    """
+    LRU memory tier in front of an optional directory of JSON files
+
+    Lookups return fresh and stale entries alike; the caller decides whether
+    to revalidate. Hit/miss counters are logged every ``log_every`` lookups.
+    """
+
+    def __init__(self, max_entries: int = 2048, disk_dir: Optional[Path] = None,
+                 ttls: Optional[Dict[str, tuple]] = None, negative_ttl: int = NEGATIVE_TTL,
+                 log_every: int = 100):
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.negative_ttl = negative_ttl
+        self.log_every = log_every
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stale_hits": 0, "negative_hits": 0, "disk_hits": 0, "misses": 0}
+        logger.info("SearchCache initialized", max_entries=max_entries, disk_dir=str(self.disk_dir) if self.disk_dir else None)
+
+    @staticmethod
+    def make_key(query: str, max_results: int) -> str:
+        return f"{normalize_query(query)}|{max_results}"
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """Look up a usable (fresh or stale) entry, checking memory then disk"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry.is_usable(now):
+                    self._memory.move_to_end(key)
+                else:
+                    del self._memory[key]
+                    entry = None
+
+        from_disk = False
+        if entry is None and self.disk_dir is not None:
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None and entry.is_usable(now):
+                from_disk = True
+                self._remember(key, entry)
+            else:
+                entry = None
+
+        self._record(entry, now, from_disk)
+        return entry
+
+    async def put(self, key: str, results: List[Dict[str, Any]], policy: str = "default") -> CacheEntry:
+        """Store results under a TTL policy; empty results get the short negative TTL"""
+        now = time.time()
+        if results:
+            fresh, stale = self.ttls.get(policy, self.ttls["default"])
+        else:
+            fresh, stale = self.negative_ttl, 0
+        entry = CacheEntry(results=results, fresh_until=now + fresh, stale_until=now + fresh + stale)
+        self._remember(key, entry)
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._write_disk, key, entry)
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus overall hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._memory)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["stale_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+
+    def _remember(self, key: str, entry: CacheEntry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _record(self, entry: Optional[CacheEntry], now: float, from_disk: bool):
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+            elif entry.is_fresh(now):
+                self._stats["hits"] += 1
+            else:
+                self._stats["stale_hits"] += 1
+            if entry is not None and entry.negative:
+                self._stats["negative_hits"] += 1
+            if from_disk:
+                self._stats["disk_hits"] += 1
+            lookups = self._stats["hits"] + self._stats["stale_hits"] + self._stats["misses"]
+        if self.log_every and lookups % self.log_every == 0:
+            logger.info("Search cache stats", **self.stats())
+
+    def _disk_path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.disk_dir / digest[:2] / f"{digest}.json"
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Unreadable search cache file", path=str(path), error=str(e))
+            return None
+        if data.get("key") != key:
+            return None
+        return CacheEntry(results=data["results"], fresh_until=data["fresh_until"], stale_until=data["stale_until"])
+
+    def _write_disk(self, key: str, entry: CacheEntry):
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": key, **asdict(entry)}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Failed to write search cache file", path=str(path), error=str(e))
@@ -0,0 +1,88 @@
+"""
+Search Planner
+Collects the searches an orchestration run needs and runs them concurrently
+"""
+from typing import List, Dict, Any, Optional, Awaitable
+import asyncio
+import structlog
+from .google_search import GoogleSearchMCP, google_search
+from .search_cache import normalize_query
+
+logger = structlog.get_logger(__name__)
+
+
+class SearchPlan:
+    """
+    Per-run search plan
+
+    Searches are registered up front under a name, then started together.
+    Queries that normalize to the same text run once (with the largest
+    requested result count) and every name gets its own slice. All searches
+    share one concurrency budget, and agents receive awaitables so they only
+    wait for results at the point they build their prompts - by then the
+    searches have usually overlapped with earlier LLM stages.
+    """
+
+    def __init__(self, search: Optional[GoogleSearchMCP] = None, max_concurrency: int = 4):
+        self.search = search or google_search
+        self.max_concurrency = max_concurrency
+        # name -> (normalized query, max_results)
+        self._needs: Dict[str, tuple] = {}
+        # normalized query -> [query, max_results, cache_policy]
+        self._queries: Dict[str, list] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def add(self, name: str, query: str, max_results: int = 5, cache_policy: str = "default") -> str:
+        """Register a search need under a name"""
+        if self._tasks:
+            raise RuntimeError("Cannot add searches after the plan has started")
+        key = normalize_query(query)
+        self._needs[name] = (key, max_results)
+        planned = self._queries.get(key)
+        if planned is None:
+            self._queries[key] = [query, max_results, cache_policy]
+        else:
+            planned[1] = max(planned[1], max_results)
+        return name
+
+    def add_competitors(self, domain: str, product_type: str, name: str = "competitors") -> str:
+        return self.add(name, GoogleSearchMCP.competitors_query(domain, product_type), 10, "competitors")
+
+    def add_market_trends(self, domain: str, name: str = "market_trends") -> str:
+        return self.add(name, GoogleSearchMCP.market_trends_query(domain), 5, "market_trends")
+
+    def add_market_size(self, domain: str, region: str = "global", name: str = "market_size") -> str:
+        return self.add(name, GoogleSearchMCP.market_size_query(domain, region), 5, "market_size")
+
+    def start(self) -> "SearchPlan":
+        """Launch all planned queries on the running event loop"""
+        if self._tasks:
+            return self
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(query: str, max_results: int, policy: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.search.search(query, max_results=max_results, cache_policy=policy)
+
+        for key, (query, max_results, policy) in self._queries.items():
+            self._tasks[key] = asyncio.create_task(run(query, max_results, policy))
+        logger.info("Search plan started", needs=len(self._needs), queries=len(self._tasks))
+        return self
+
+    def results(self, name: str) -> Awaitable[List[Dict[str, Any]]]:
+        """Awaitable results for a registered name (starts the plan if needed)"""
+        self.start()
+        key, max_results = self._needs[name]
+        task = self._tasks[key]
+
+        async def sliced() -> List[Dict[str, Any]]:
+            # shield so one consumer being cancelled does not cancel a shared query
+            return (await asyncio.shield(task))[:max_results]
+
+        return sliced()
+
+    def cancel(self):
+        """Cancel any searches still running (e.g. when the workflow fails)"""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
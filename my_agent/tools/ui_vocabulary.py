@@ -0,0 +1,143 @@
+"""
+UI Element Vocabulary
+Single-pass matcher mapping UI component names and synonyms in free text to canonical element names
+"""
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+import os
+import re
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_VOCABULARY = Path(__file__).parent.parent / "data" / "ui_elements.txt"
+_END = ""
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    """
+    Regex for every phrase below a trie node
+
+    Phrases sharing a prefix share the prefix in the pattern, so at any text
+    position the engine follows at most one branch per character instead of
+    trying every phrase. Branches are tried before the phrase end, so the
+    longest phrase wins.
+    """
+    branches = [(r"\s+" if char == " " else re.escape(char)) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char != _END]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if _END in node:
+        return body + "?" if len(branches) == 1 and len(body) == 1 else "(?:" + body + ")?"
+    return body
+
+
+class UIVocabulary:
+    """
+    UI element vocabulary compiled into one case-insensitive regex
+
+    Entries map a canonical element name to its synonyms. Every term is
+    inserted into a character trie that is compiled to a single pattern, so
+    a scan is one pass over the text whatever the vocabulary size. The
+    pattern is built on first use, and from ``path`` if no entries are given.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, Iterable[str]]] = None, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path else DEFAULT_VOCABULARY
+        self._entries = entries
+        self._terms: Optional[Dict[str, str]] = None
+        self._pattern: Optional[re.Pattern] = None
+
+    @staticmethod
+    def parse(lines: Iterable[str]) -> Dict[str, List[str]]:
+        """Parse ``Canonical Name: synonym, synonym`` lines, skipping blanks and # comments"""
+        entries: Dict[str, List[str]] = {}
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, _, synonyms = line.partition(":")
+            entries.setdefault(name.strip(), []).extend(s.strip() for s in synonyms.split(",") if s.strip())
+        return entries
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "UIVocabulary":
+        return cls(path=path)
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def _compile(self):
+        entries = self._entries
+        if entries is None:
+            with open(self.path, encoding="utf-8") as f:
+                entries = self.parse(f)
+
+        terms: Dict[str, str] = {}
+        trie: Dict[str, dict] = {}
+        for canonical, synonyms in entries.items():
+            for term in (canonical, *synonyms):
+                key = self._key(term)
+                if not key:
+                    continue
+                # First definition wins when two elements claim the same term
+                if terms.setdefault(key, canonical) != canonical:
+                    continue
+                node = trie
+                for char in key:
+                    node = node.setdefault(char, {})
+                node[_END] = {}
+
+        self._terms = terms
+        self._pattern = re.compile(r"(?<!\w)(?:" + (_trie_pattern(trie) or "(?!)") + r")(?!\w)", re.IGNORECASE)
+        logger.debug("UI vocabulary compiled", elements=len(entries), terms=len(terms))
+
+    @property
+    def pattern(self) -> re.Pattern:
+        if self._pattern is None:
+            self._compile()
+        return self._pattern
+
+    @property
+    def terms(self) -> Dict[str, str]:
+        """Normalized term -> canonical element name"""
+        if self._terms is None:
+            self._compile()
+        return self._terms
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def extract(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Canonical elements mentioned in text
+
+        Args:
+            text: Free text to scan
+            limit: Stop after this many distinct elements
+
+        Returns:
+            Canonical element names, without duplicates, in order of first mention
+        """
+        terms = self.terms
+        found: Dict[str, None] = {}
+        for match in self.pattern.finditer(text):
+            found.setdefault(terms[self._key(match.group())])
+            if limit is not None and len(found) >= limit:
+                break
+        return list(found)
+
+    def canonical(self, label: str) -> str:
+        """The canonical name when the whole label is a known term, else the label unchanged"""
+        return self.terms.get(self._key(label), label)
+
+    def normalize(self, labels: Iterable[str], limit: Optional[int] = None) -> List[str]:
+        """Map labels to canonical names, dropping duplicates but keeping order"""
+        normalized = list(dict.fromkeys(self.canonical(label) for label in labels if label.strip()))
+        return normalized[:limit] if limit is not None else normalized
+
+
+# Global instance (loaded on first use; UI_VOCABULARY_FILE overrides the bundled vocabulary)
+ui_vocabulary = UIVocabulary(path=os.getenv("UI_VOCABULARY_FILE") or None)
@@ -0,0 +1,272 @@
+"""
+Wireframe Layout Engine
+Character-grid layout for ASCII wireframes: boxes, columns, wrapping and truncation
+"""
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Union, Sequence, Tuple
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_WIDTH = 50
+ELLIPSIS = "..."
+# Narrowest column Columns will lay out: a bordered, padded box with one character inside
+MIN_COLUMN_WIDTH = 5
+
+
+def wrap_text(text: str, width: int) -> List[str]:
+    """Greedy word wrap; words longer than the width are split"""
+    if width <= 0:
+        return []
+    lines: List[str] = []
+    current = ""
+    for word in text.split():
+        while len(word) > width:
+            if current:
+                lines.append(current)
+                current = ""
+            lines.append(word[:width])
+            word = word[width:]
+        if not word:
+            continue
+        if not current:
+            current = word
+        elif len(current) + 1 + len(word) <= width:
+            current += " " + word
+        else:
+            lines.append(current)
+            current = word
+    if current or not lines:
+        lines.append(current)
+    return lines
+
+
+def truncate_text(text: str, width: int) -> str:
+    """Cut text to the width, marking the cut with an ellipsis"""
+    text = " ".join(text.split())
+    if len(text) <= width:
+        return text
+    if width <= len(ELLIPSIS):
+        return text[:width]
+    return text[:width - len(ELLIPSIS)] + ELLIPSIS
+
+
+class CharGrid:
+    """
+    Fixed-size character canvas
+
+    Rows are preallocated lists of single characters and text is written with
+    slice assignment, so drawing never builds intermediate strings.
+    """
+
+    __slots__ = ("width", "height", "rows")
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.rows = [[" "] * width for _ in range(height)]
+
+    def reset(self, height: int):
+        """Clear the first `height` rows for reuse, growing the buffer if needed"""
+        for row in self.rows[:height]:
+            row[:] = " " * self.width
+        while len(self.rows) < height:
+            self.rows.append([" "] * self.width)
+        self.height = height
+
+    def write(self, x: int, y: int, text: str):
+        if 0 <= y < self.height and x < self.width:
+            text = text[:self.width - x]
+            self.rows[y][x:x + len(text)] = text
+
+    def hline(self, x: int, y: int, width: int, char: str = "-"):
+        self.write(x, y, char * width)
+
+    def vline(self, x: int, y: int, height: int, char: str = "|"):
+        for row in self.rows[y:y + height]:
+            row[x] = char
+
+    def render(self) -> str:
+        return "\n".join("".join(row).rstrip() for row in self.rows[:self.height])
+
+
+class Node(ABC):
+    """Base layout node"""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def measure(self, width: int) -> int:
+        """Height in rows when laid out at the given width"""
+
+    @abstractmethod
+    def draw(self, grid: CharGrid, x: int, y: int, width: int) -> int:
+        """Draw at (x, y) within the width and return the height used"""
+
+
+class Text(Node):
+    """Text that wraps onto several lines, or is truncated to one"""
+
+    __slots__ = ("text", "wrap")
+
+    def __init__(self, text: str, wrap: bool = True):
+        self.text = str(text)
+        self.wrap = wrap
+
+    def lines(self, width: int) -> List[str]:
+        return wrap_text(self.text, width) if self.wrap else [truncate_text(self.text, width)]
+
+    def measure(self, width: int) -> int:
+        return len(self.lines(width))
+
+    def draw(self, grid: CharGrid, x: int, y: int, width: int) -> int:
+        lines = self.lines(width)
+        for i, line in enumerate(lines):
+            grid.write(x, y + i, line)
+        return len(lines)
+
+
+class Box(Node):
+    """
+    Vertical container with an optional border and title
+
+    With ``corner="-"`` the top and bottom borders are plain dashed lines,
+    matching the classic single-screen wireframe look.
+    """
+
+    __slots__ = ("children", "title", "border", "padding", "corner")
+
+    def __init__(self, children: Sequence[Node], title: str = None, border: bool = True,
+                 padding: int = 1, corner: str = "+"):
+        self.children = list(children)
+        self.title = title
+        self.border = border
+        self.padding = padding
+        self.corner = corner
+
+    def inner_width(self, width: int) -> int:
+        return max(0, width - (2 if self.border else 0) - 2 * self.padding)
+
+    def measure(self, width: int) -> int:
+        inner = self.inner_width(width)
+        height = sum(child.measure(inner) for child in self.children)
+        if self.border:
+            height += 2
+        return height
+
+    def draw(self, grid: CharGrid, x: int, y: int, width: int) -> int:
+        inner = self.inner_width(width)
+        offset = 1 if self.border else 0
+        cy = y + offset
+        for child in self.children:
+            cy += child.draw(grid, x + offset + self.padding, cy, inner)
+        height = cy - y + offset
+
+        if self.border:
+            grid.hline(x, y, width)
+            grid.hline(x, y + height - 1, width)
+            grid.vline(x, y + 1, height - 2)
+            grid.vline(x + width - 1, y + 1, height - 2)
+            if self.corner != "-":
+                for cx, cy in ((x, y), (x + width - 1, y), (x, y + height - 1), (x + width - 1, y + height - 1)):
+                    grid.write(cx, cy, self.corner)
+            if self.title:
+                grid.write(x + 2, y, truncate_text(f" {self.title} ", max(0, width - 4)))
+        return height
+
+
+class Columns(Node):
+    """
+    Side-by-side children sharing the width evenly
+
+    Children that do not fit at MIN_COLUMN_WIDTH wrap onto further rows
+    instead of running past the right edge.
+    """
+
+    __slots__ = ("children", "gap")
+
+    def __init__(self, children: Sequence[Node], gap: int = 1):
+        self.children = list(children)
+        self.gap = gap
+
+    def column_widths(self, count: int, width: int) -> List[int]:
+        """Widths of `count` columns sharing one row"""
+        if not count:
+            return []
+        usable = max(0, width - self.gap * (count - 1))
+        base, extra = divmod(usable, count)
+        return [base + (1 if i < extra else 0) for i in range(count)]
+
+    def rows(self, width: int) -> List[List[Tuple[Node, int, int]]]:
+        """The children as (node, x offset, width), one list per row"""
+        per_row = max(1, (width + self.gap) // (MIN_COLUMN_WIDTH + self.gap))
+        rows = []
+        for start in range(0, len(self.children), per_row):
+            children = self.children[start:start + per_row]
+            row, offset = [], 0
+            for child, w in zip(children, self.column_widths(len(children), width)):
+                row.append((child, offset, w))
+                offset += w + self.gap
+            rows.append(row)
+        return rows
+
+    def measure(self, width: int) -> int:
+        return sum(max(child.measure(w) for child, _, w in row) for row in self.rows(width))
+
+    def draw(self, grid: CharGrid, x: int, y: int, width: int) -> int:
+        cy = y
+        for row in self.rows(width):
+            cy += max(child.draw(grid, x + offset, cy, w) for child, offset, w in row)
+        return cy - y
+
+
+ElementSpec = Union[str, Node, Sequence[Any]]
+
+
+def build_node(element: ElementSpec) -> Node:
+    """
+    Turn a wireframe element spec into a layout node
+
+    Strings become wrapped text, nested lists become a row of columns
+    (each column boxed), and nodes pass through unchanged.
+    """
+    if isinstance(element, Node):
+        return element
+    if isinstance(element, (list, tuple)):
+        return Columns([Box([build_node(child)]) for child in element])
+    return Text(str(element))
+
+
+def build_screen(elements: Sequence[ElementSpec]) -> Node:
+    """
+    Layout tree for one screen: its elements stacked inside a bordered frame
+
+    The screen name is not part of the tree; each renderer prints it above the frame.
+    """
+    return Box([build_node(e) for e in elements], corner="-")
+
+
+def render_screen(screen_name: str, elements: Sequence[ElementSpec], width: int = DEFAULT_WIDTH,
+                  grid: CharGrid = None) -> str:
+    """Render a single screen to an ASCII wireframe string"""
+    root = build_screen(elements)
+    height = root.measure(width)
+    if grid is None or grid.width != width:
+        grid = CharGrid(width, height)
+    else:
+        grid.reset(height)
+    root.draw(grid, 0, 0, width)
+    return f"\n[{screen_name}]\n{grid.render()}\n"
+
+
+def render_many(screens: Dict[str, Sequence[ElementSpec]], width: int = DEFAULT_WIDTH) -> Dict[str, str]:
+    """
+    Render every screen of a run in one pass
+
+    A single grid buffer is reused across screens, so batch rendering only
+    allocates rows when a screen is taller than any before it.
+    """
+    grid = CharGrid(width, 0)
+    rendered = {name: render_screen(name, elements, width, grid) for name, elements in screens.items()}
+    logger.debug("Rendered wireframes", screens=len(rendered))
+    return rendered
@@ -0,0 +1,161 @@
+"""
+Wireframe SVG Renderer
+Vector wireframes drawn from the same layout tree as the ASCII renderer
+"""
+from typing import List, Dict, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+import structlog
+from .wireframe_layout import Node, Text, Box, Columns, CharGrid, ElementSpec, DEFAULT_WIDTH, build_screen
+
+logger = structlog.get_logger(__name__)
+
+# One layout cell in pixels - geometry matches the ASCII grid cell for cell
+CELL_WIDTH = 7
+CELL_HEIGHT = 22
+MARGIN = 12
+TITLE_HEIGHT = 24
+SHEET_COLUMNS = 3
+SHEET_GAP = 24
+
+STYLE = (
+    "<style>"
+    "text{font:12px monospace;fill:#222}"
+    ".t{font-weight:bold;font-size:13px}"
+    ".f{fill:#fff;stroke:#333;stroke-width:1.5}"
+    ".b{fill:none;stroke:#999}"
+    ".btn{fill:#e6eefc;stroke:#3366cc}"
+    ".in{fill:#fff;stroke:#888}"
+    ".m{fill:#eee;stroke:#999}"
+    ".x{stroke:#bbb}"
+    "</style>"
+)
+
+# CSS class -> keywords identifying the element kind
+ELEMENT_KINDS = (
+    ("btn", ("button",)),
+    ("in", ("input", "field", "search", "dropdown", "text area", "checkbox", "radio")),
+    ("m", ("image", "video", "photo", "map", "chart", "carousel", "avatar")),
+)
+
+
+def element_kind(text: str) -> Optional[str]:
+    """CSS class for a UI element label, or None for plain text"""
+    lowered = text.lower()
+    for kind, keywords in ELEMENT_KINDS:
+        if any(keyword in lowered for keyword in keywords):
+            return kind
+    return None
+
+
+def _num(value: float) -> str:
+    return f"{value:g}"
+
+
+def _emit(node: Node, x: int, y: int, width: int, out: List[str], root: bool = False) -> int:
+    """Append SVG elements for a node at cell (x, y) and return its height in cells"""
+    if isinstance(node, Text):
+        lines = node.lines(width)
+        px, py = x * CELL_WIDTH, y * CELL_HEIGHT
+        kind = element_kind(node.text)
+        if kind:
+            # Widgets extend into the surrounding padding so the label keeps its full width
+            rx, rw, rh = px - 4, width * CELL_WIDTH + 8, len(lines) * CELL_HEIGHT - 6
+            out.append(f'<rect class="{kind}" x="{rx}" y="{py + 3}" width="{rw}" height="{rh}" rx="4"/>')
+            if kind == "m":
+                out.append(f'<path class="x" d="M{rx} {py + 3}l{rw} {rh}m0 -{rh}l-{rw} {rh}"/>')
+        for i, line in enumerate(lines):
+            out.append(f'<text x="{px}" y="{py + i * CELL_HEIGHT + 15}">{escape(line)}</text>')
+        return len(lines)
+
+    if isinstance(node, Box):
+        offset = 1 if node.border else 0
+        inner = node.inner_width(width)
+        start = len(out)
+        cy = y + offset
+        for child in node.children:
+            cy += _emit(child, x + offset + node.padding, cy, inner, out)
+        height = cy - y + offset
+        if node.border:
+            # The frame goes underneath the children; its lines run through the
+            # middle of the ASCII border cells
+            out.insert(start, f'<rect class="{"f" if root else "b"}" x="{_num((x + 0.5) * CELL_WIDTH)}" '
+                              f'y="{_num((y + 0.5) * CELL_HEIGHT)}" width="{(width - 1) * CELL_WIDTH}" '
+                              f'height="{(height - 1) * CELL_HEIGHT}"/>')
+            if node.title:
+                out.append(f'<text class="t" x="{(x + 2) * CELL_WIDTH}" y="{y * CELL_HEIGHT + 15}">{escape(node.title)}</text>')
+        return height
+
+    if isinstance(node, Columns):
+        cy = y
+        for row in node.rows(width):
+            cy += max(_emit(child, x + offset, cy, w, out) for child, offset, w in row)
+        return cy - y
+
+    # Any other node draws itself onto a character grid, emitted row by row as text
+    grid = CharGrid(width, node.measure(width))
+    height = node.draw(grid, 0, 0, width)
+    px, py = x * CELL_WIDTH, y * CELL_HEIGHT
+    for i, row in enumerate(grid.rows[:height]):
+        line = "".join(row).rstrip()
+        if line:
+            out.append(f'<text x="{px}" y="{py + i * CELL_HEIGHT + 15}" xml:space="preserve">{escape(line)}</text>')
+    return height
+
+
+def _screen_fragment(screen_name: str, elements: Sequence[ElementSpec], width: int) -> Tuple[str, int, int]:
+    """SVG body for one screen (title plus frame) and its pixel size"""
+    out = [f'<text class="t" x="0" y="16">{escape(screen_name)}</text>', f'<g transform="translate(0 {TITLE_HEIGHT})">']
+    height = _emit(build_screen(elements), 0, 0, width, out, root=True)
+    out.append("</g>")
+    return "".join(out), width * CELL_WIDTH, TITLE_HEIGHT + height * CELL_HEIGHT
+
+
+def _document(body: str, width: int, height: int) -> str:
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">{STYLE}{body}</svg>\n')
+
+
+def _standalone(body: str, width: int, height: int) -> str:
+    return _document(f'<g transform="translate({MARGIN} {MARGIN})">{body}</g>', width + 2 * MARGIN, height + 2 * MARGIN)
+
+
+def render_screen_svg(screen_name: str, elements: Sequence[ElementSpec], width: int = DEFAULT_WIDTH) -> str:
+    """Render a single screen to a standalone SVG document"""
+    return _standalone(*_screen_fragment(screen_name, elements, width))
+
+
+def render_svgs(screens: Dict[str, Sequence[ElementSpec]], width: int = DEFAULT_WIDTH,
+                columns: int = SHEET_COLUMNS) -> Tuple[Dict[str, str], str]:
+    """
+    Render every screen of a run to SVG in one pass
+
+    Each screen is laid out once; its fragment is wrapped as a standalone
+    document and also placed on a combined sheet, ``columns`` screens per row.
+
+    Args:
+        screens: Mapping of screen name to its UI elements
+        width: Layout width in cells
+        columns: Screens per row on the combined sheet
+
+    Returns:
+        Tuple of (screen name -> SVG document, combined sheet SVG document)
+    """
+    documents: Dict[str, str] = {}
+    placed: List[str] = []
+    columns = max(1, columns)
+    x = y = row_height = sheet_width = 0
+
+    for n, (name, elements) in enumerate(screens.items()):
+        body, w, h = _screen_fragment(name, elements, width)
+        documents[name] = _standalone(body, w, h)
+
+        if n and n % columns == 0:
+            x, y, row_height = 0, y + row_height + SHEET_GAP, 0
+        placed.append(f'<g transform="translate({x + MARGIN} {y + MARGIN})">{body}</g>')
+        row_height = max(row_height, h)
+        sheet_width = max(sheet_width, x + w)
+        x += w + SHEET_GAP
+
+    sheet = _document("".join(placed), sheet_width + 2 * MARGIN, y + row_height + 2 * MARGIN)
+    logger.debug("Rendered SVG wireframes", screens=len(documents), sheet_bytes=len(sheet))
+    return documents, sheet
@@ -20,7 +20,8 @@ from google.adk import Runner
 from google.adk.agents.llm_agent import Agent
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.genai import types
-from typing import Any, Optional
+from pydantic import BaseModel, ConfigDict, ValidationError
+from typing import Any, Optional, Type, TypeVar
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -29,6 +30,24 @@ logger = structlog.get_logger(__name__)
 _session_service = InMemorySessionService()
 
 
+def _require_all_properties(schema: dict, cls: type):
+    schema["required"] = list(schema.get("properties", {}))
+
+
+class StructuredResponse(BaseModel):
+    """
+    Base for agent response schemas (used as ADK ``output_schema``)
+    
+    Every field is listed as required in the generated JSON schema so the
+    model always fills it in, while the Python defaults still allow building
+    an empty instance around raw text when a reply cannot be validated.
+    """
+    model_config = ConfigDict(json_schema_extra=_require_all_properties)
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
 async def call_agent(agent: Agent, prompt: str, session_id: str = "default_session", user_id: str = "default_user") -> str:
     """
     Call an agent with a prompt and return the response
@@ -106,6 +125,28 @@ async def call_agent(agent: Agent, prompt: str, session_id: str = "default_sessi
         return f"Error: Could not get response from agent: {str(e)}"
 
 
+def parse_response(response: str, schema: Type[ModelT]) -> Optional[ModelT]:
+    """
+    Validate an agent reply produced under an ``output_schema``
+    
+    The reply is parsed and validated in a single pass. Anything that does not
+    match (e.g. the error string returned by call_agent) yields None so the
+    caller can fall back to keeping the raw text.
+    
+    Args:
+        response: Agent response text (JSON when the agent has an output_schema)
+        schema: Pydantic model the agent declared as its output_schema
+        
+    Returns:
+        Validated model instance, or None
+    """
+    try:
+        return schema.model_validate_json(response)
+    except ValidationError as e:
+        logger.warning("Agent response did not match schema", schema=schema.__name__, errors=e.error_count())
+        return None
+
+
 def _extract_text_from_event(event: Any) -> str:
     """Extract text from a Google ADK Event object"""
     if isinstance(event, str):
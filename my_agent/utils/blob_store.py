@@ -0,0 +1,133 @@
+"""
+Blob Store
+Content-addressed storage for output artifacts, shared by every session through hardlinks
+"""
+from pathlib import Path
+from typing import Dict, Union
+import hashlib
+import os
+import shutil
+import stat
+import threading
+import time
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Blobs younger than this are never collected: they may be stored but not linked yet
+DEFAULT_GC_MIN_AGE = 3600.0
+
+
+class BlobStore:
+    """
+    Artifact bodies stored once under their SHA-256, linked into session directories
+
+    ``put`` writes a body only if no blob with its hash exists yet, and
+    ``link`` hardlinks the blob into a session directory, so sessions look
+    exactly as before but identical files share one copy on disk and cost no
+    write bandwidth after the first. Blobs are read-only, so a session file
+    cannot be edited in place under the other sessions sharing it. Where
+    hardlinks are not supported (another filesystem, some network mounts)
+    the file is copied instead. A blob whose only link is the store's own no
+    longer belongs to any session and is removed by ``gc``.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self._stats = {"stored": 0, "deduplicated": 0, "copied": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes) -> str:
+        """Store a body (unless already present) and return its hash"""
+        digest = self.digest(data)
+        path = self.path(digest)
+        if path.exists():
+            try:
+                # Fresh mtime keeps gc off a blob that is about to be linked again
+                os.utime(path)
+                self._count("deduplicated")
+                return digest
+            except FileNotFoundError:
+                pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        # Two writers racing on the same body both produce the same bytes
+        os.replace(tmp_path, path)
+        self._count("stored")
+        return digest
+
+    def link(self, digest: str, target: Union[str, Path]):
+        """Place a stored blob at target (replacing any existing file), by hardlink or else by copy"""
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+        try:
+            os.link(self.path(digest), tmp)
+        except OSError:
+            shutil.copyfile(self.path(digest), tmp)
+            self._count("copied")
+        os.replace(tmp, target)
+
+    def write(self, data: bytes, target: Union[str, Path]) -> str:
+        """``put`` then ``link``; returns the hash"""
+        digest = self.put(data)
+        try:
+            self.link(digest, target)
+        except FileNotFoundError:
+            # Collected between put and link; store it again
+            self.put(data)
+            self.link(digest, target)
+        return digest
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def gc(self, min_age: float = DEFAULT_GC_MIN_AGE) -> Dict[str, int]:
+        """
+        Remove blobs no session links to any more
+
+        Args:
+            min_age: Seconds a blob (or leftover temp file) must have existed
+                before it can be removed
+
+        Returns:
+            Dict with the number of blobs removed and kept, and bytes freed
+        """
+        cutoff = time.time() - min_age
+        removed = kept = freed = 0
+        if not self.root.is_dir():
+            return {"removed": 0, "kept": 0, "bytes_freed": 0}
+        for shard in os.scandir(self.root):
+            if not shard.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(shard.path):
+                info = entry.stat(follow_symlinks=False)
+                orphan = entry.name.endswith(".tmp") or info.st_nlink <= 1
+                if not orphan or info.st_mtime > cutoff:
+                    kept += 1
+                    continue
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    continue
+                removed += 1
+                freed += info.st_size
+        logger.info("Blob store garbage collected", root=str(self.root), removed=removed, kept=kept, bytes_freed=freed)
+        return {"removed": removed, "kept": kept, "bytes_freed": freed}
@@ -0,0 +1,49 @@
+"""
+BM25 Scoring Utilities
+Shared tokenizer and Okapi BM25 helpers for the local full-text indexes
+"""
+from typing import List
+import math
+import re
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Small English stopword list - enough to keep prompts like
+# "Give me a new idea in the X domain" from matching on filler words
+STOPWORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "give",
+    "has", "have", "i", "in", "into", "is", "it", "its", "me", "my", "of",
+    "on", "or", "our", "please", "that", "the", "their", "this", "to",
+    "want", "we", "with", "you", "your"
+])
+
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase index terms
+
+    Args:
+        text: Raw text
+
+    Returns:
+        List of terms with stopwords removed (order preserved)
+    """
+    if not text:
+        return []
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def idf(total_docs: int, doc_freq: int) -> float:
+    """BM25 inverse document frequency (always positive)"""
+    return math.log(1.0 + (total_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def term_score(tf: int, doc_len: int, avg_doc_len: float, term_idf: float,
+               k1: float = DEFAULT_K1, b: float = DEFAULT_B) -> float:
+    """BM25 contribution of a single term to a single document"""
+    norm = k1 * (1.0 - b + b * doc_len / avg_doc_len) if avg_doc_len else k1
+    return term_idf * tf * (k1 + 1.0) / (tf + norm)
+
@@ -2,436 +2,972 @@
 File Output Utilities
 Saves agent outputs to organized files
 """
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
+import asyncio
+import functools
+import hashlib
 import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
 import structlog
+from ..agents.competitor_matrix import CompetitorMatrix
+from ..agents.market_scenarios import MarketScenarios
+from ..tools.wireframe_svg import render_svgs
+from .markdown_table import dataframe_to_markdown
+from .blob_store import BlobStore, DEFAULT_GC_MIN_AGE
+from .output_catalog import CATALOG_FILE, OutputCatalog, scan_artifacts
+from .results_json import ResultsReader, ResultsWriter, index_path, write_results_json
+from .pdf_export import pdf_exporter
+from .session_bundle import BUNDLE_FORMATS, BundleReader, BundleWriter, bundle_suffix
+from .templates import templates
 
 logger = structlog.get_logger(__name__)
 
+# Writer threads shared by every session saving concurrently
+OUTPUT_WRITERS = 4
 
-def save_outputs_to_files(results: Dict[str, Any], session_id: str, output_dir: Optional[Path] = None) -> Dict[str, str]:
+# Content-addressed artifact store under each output directory (OUTPUT_DEDUP=0 writes plain copies)
+BLOB_DIR = ".blobs"
+OUTPUT_DEDUP = os.getenv("OUTPUT_DEDUP", "1").lower() not in ("0", "false", "no")
+
+# Finished runs live in outputs/runs/<YYYY>/<MM>/<DD>/<hash shard>/<run id>; they are written under
+# outputs/.staging/<run id> and renamed into place when complete
+RUNS_DIR = "runs"
+STAGING_DIR = ".staging"
+
+# Runs older than this many days are removed by apply_output_retention (unset keeps every run)
+OUTPUT_RETENTION_DAYS = float(os.getenv("OUTPUT_RETENTION_DAYS") or 0) or None
+
+# Staging directories left by interrupted runs are handled once this old (seconds): moved into runs/
+# as incomplete runs if they saved any results, removed otherwise
+DEFAULT_STAGING_MAX_AGE = 86400.0
+
+# SQLite catalog of saved sessions under each output directory (OUTPUT_CATALOG=0 disables it)
+OUTPUT_CATALOG = os.getenv("OUTPUT_CATALOG", "1").lower() not in ("0", "false", "no")
+
+# PDF renderings of the pitch deck and concept paper (needs reportlab; OUTPUT_PDF=0 skips them)
+OUTPUT_PDF = os.getenv("OUTPUT_PDF", "1").lower() not in ("0", "false", "no")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_blob_stores: Dict[Path, BlobStore] = {}
+_catalogs: Dict[Path, OutputCatalog] = {}
+
+
+@dataclass
+class Artifact:
     """
-    Save all outputs from the orchestrator to organized files
-    
+    One output file: its text or bytes, a future that resolves to them (rendered in
+    the background), a function that writes it to the given path, or None for a directory
+    """
+    key: Optional[str]
+    path: Path
+    content: Union[str, bytes, Future, Callable[[Path], Any], None]
+    message: Optional[str] = None
+    store: Optional[BlobStore] = None
+    digest: Optional[str] = None
+
+    def write(self):
+        if self.content is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if callable(self.content):
+            self.content(self.path)
+            return
+        data = self.data()
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if self.store is not None:
+            # Stored once by hash and hardlinked here; identical files across sessions share the blob
+            self.digest = self.store.write(data, self.path)
+            return
+        # Write beside the target and rename, so the file is either complete or absent
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+    def data(self) -> Union[str, bytes]:
+        """The file contents, waiting for a background render to finish if there is one"""
+        return self.content.result() if isinstance(self.content, Future) else self.content
+
+
+@dataclass
+class OutputPlan:
+    """
+    Every artifact of a session, rendered in memory before anything touches the disk
+
+    Artifacts are written under ``work_dir`` and the directory is renamed to
+    ``session_dir`` once the session is complete (the two are the same for bundles).
+    """
+    session_id: str
+    session_dir: Path
+    results: Dict[str, Any]
+    artifacts: List[Artifact] = field(default_factory=list)
+    store: Optional[BlobStore] = None
+    work_dir: Optional[Path] = None
+    output_root: Optional[Path] = None
+    failed_stages: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.work_dir is None:
+            self.work_dir = self.session_dir
+        if self.output_root is None:
+            self.output_root = self.session_dir.parent
+
+    def add(self, key: Optional[str], path: Path, content: Union[str, bytes, Future, Callable[[Path], Any], None],
+            message: Optional[str] = None):
+        self.artifacts.append(Artifact(key, path, content, message, self.store))
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=OUTPUT_WRITERS, thread_name_prefix="mapis-output")
+        return _executor
+
+
+def _safe_name(name: str) -> str:
+    return "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')[:50]
+
+
+def _unique_names(names: List[str], default: str) -> List[str]:
+    """
+    Safe file names for a list of names, distinct even where names sanitize alike
+
+    "Home!" and "Home?" (or several emoji-only names) would otherwise share
+    one file; later ones get _2, _3, ... Compared case-insensitively, for
+    case-insensitive filesystems.
+    """
+    used = set()
+    unique = []
+    for name in names:
+        base = _safe_name(name) or default
+        candidate, n = base, 1
+        while candidate.lower() in used:
+            n += 1
+            candidate = f"{base}_{n}"
+        used.add(candidate.lower())
+        unique.append(candidate)
+    return unique
+
+
+def _get_blob_store(output_dir: Path) -> Optional[BlobStore]:
+    if not OUTPUT_DEDUP:
+        return None
+    with _executor_lock:
+        if output_dir not in _blob_stores:
+            _blob_stores[output_dir] = BlobStore(output_dir / BLOB_DIR)
+        return _blob_stores[output_dir]
+
+
+def get_output_catalog(output_dir: Optional[Path] = None) -> OutputCatalog:
+    """
+    The catalog of an output directory (outputs/catalog.sqlite3 by default), e.g. to look up past runs
+
+    Example: ``get_output_catalog().find(domain="FinTech", since=datetime.now() - timedelta(days=7), min_tam=1e9)``
+    """
+    root = _output_root(output_dir)
+    with _executor_lock:
+        if root not in _catalogs:
+            _catalogs[root] = OutputCatalog(root / CATALOG_FILE)
+        return _catalogs[root]
+
+
+def _catalog_session(output_root: Path, location: Path, session_id: str, results: Dict[str, Any], artifacts: List[Any],
+                     bundle: Optional[str] = None, created_at: Optional[float] = None):
+    """Record a saved session in its output directory's catalog; never fails the save"""
+    if not OUTPUT_CATALOG:
+        return
+    try:
+        get_output_catalog(output_root).record(location, session_id, results, artifacts, bundle, created_at)
+    except Exception as e:
+        logger.error("Error updating output catalog", location=str(location), error=str(e))
+
+
+def _output_root(output_dir: Optional[Path] = None) -> Path:
+    # Determine output directory
+    if output_dir is None:
+        project_root = Path(__file__).parent.parent.parent
+        return project_root / 'outputs'
+    return Path(output_dir)
+
+
+def new_run_id(session_id: str, now: Optional[datetime] = None) -> str:
+    """Unique name for one run: session ID, start time and a random suffix (runs never share a directory)"""
+    now = now or datetime.now()
+    return f"{_safe_name(session_id) or 'session'}_{now.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+def _run_dirs(session_id: str, output_dir: Optional[Path] = None) -> Tuple[Path, Path]:
+    """
+    Final and staging directory for a new run
+
+    The final directory is sharded by date and by hash of the run ID, so no
+    directory collects more than a day's runs / 256 entries however many runs
+    a batch produces.
+    """
+    root = _output_root(output_dir)
+    now = datetime.now()
+    run_id = new_run_id(session_id, now)
+    shard = hashlib.sha1(run_id.encode("utf-8")).hexdigest()[:2]
+    return root / RUNS_DIR / now.strftime("%Y/%m/%d") / shard / run_id, root / STAGING_DIR / run_id
+
+
+def _publish(plan: OutputPlan) -> bool:
+    """Rename a finished session from its staging directory into place"""
+    if plan.work_dir == plan.session_dir:
+        return True
+    try:
+        plan.session_dir.parent.mkdir(parents=True, exist_ok=True)
+        os.rename(plan.work_dir, plan.session_dir)
+    except OSError as e:
+        logger.error("Error moving session into place", staging_dir=str(plan.work_dir),
+                     output_dir=str(plan.session_dir), error=str(e))
+        return False
+    return True
+
+
+def _pdf_enabled() -> bool:
+    return OUTPUT_PDF and pdf_exporter.available
+
+
+def _submit_pdf(kind: str, text: str, title: str) -> Optional[Future]:
+    """Start rendering a PDF in the background; if that fails only the PDF is skipped, not the session"""
+    if not _pdf_enabled():
+        return None
+    try:
+        return pdf_exporter.submit(kind, text, title)
+    except Exception as e:
+        logger.error("Error starting PDF export", kind=kind, error=str(e))
+        return None
+
+
+def _json_name(compress: bool) -> str:
+    return "complete_results.json.gz" if compress else "complete_results.json"
+
+
+def _plan_concept_paper(plan: OutputPlan, session_dir: Path, safe_domain: str):
+    """Concept paper (for feature extensions)"""
+    results = plan.results
+    concept = results.get("concept_paper", {})
+    concept_text = concept.get("full_text", "")
+    if concept_text:
+        plan.add("concept_paper", session_dir / f"concept_paper_{safe_domain}.md", concept_text, "Saved concept paper")
+        pdf = _submit_pdf("document", concept_text, f"Concept Paper - {results.get('domain', 'general')}")
+        if pdf is not None:
+            plan.add("concept_paper_pdf", session_dir / f"concept_paper_{safe_domain}.pdf", pdf, "Saved concept paper (PDF)")
+
+
+def _plan_pitch(plan: OutputPlan, session_dir: Path, safe_domain: str):
+    """Pitch deck (for new app ideas and feature extensions)"""
+    results = plan.results
+    pitch = results.get("pitch", {})
+    pitch_text = pitch.get("full_text", "")
+    if pitch_text:
+        # Save as Marp format (can be converted to visual slides)
+        plan.add("pitch", session_dir / f"pitch_deck_{safe_domain}.md", pitch_text, "Saved pitch deck")
+
+        # Rendered straight to PDF (one slide per page) on the PDF process pool
+        pdf = _submit_pdf("slides", pitch_text, f"Pitch Deck - {results.get('domain', 'general')}")
+        has_pdf = pdf is not None
+        if has_pdf:
+            plan.add("pitch_pdf", session_dir / f"pitch_deck_{safe_domain}.pdf", pdf, "Saved pitch deck (PDF)")
+
+        # Create a guide for converting to visual slides
+        guide = templates.render("pitch_deck_guide.md", safe_domain=safe_domain, has_pdf=has_pdf)
+        plan.add("pitch_guide", session_dir / f"pitch_deck_guide_{safe_domain}.md", guide)
+
+
+def _plan_wireframes(plan: OutputPlan, session_dir: Path, safe_domain: str):
+    """Wireframes (both text and detailed versions)"""
+    results = plan.results
+    wireframes = results.get("wireframes", {})
+    svg_screens = {}
+
+    # Extract wireframe data - structure is wireframes.wireframes dict
+    if isinstance(wireframes, dict) and "wireframes" in wireframes:
+        # Screen names as keys
+        screens = list(wireframes.get("wireframes", {}).items())
+        wireframe_text = templates.render("wireframes.txt", screens=screens)
+        wireframe_detailed = templates.render("wireframes_detailed.md", screens=screens)
+        svg_screens = {name: wf_data.get("elements") or [] for name, wf_data in screens if isinstance(wf_data, dict)}
+    else:
+        # Fallback: treat wireframes as a list or other structure
+        wireframe_text = str(wireframes)
+        wireframe_detailed = str(wireframes)
+
+    # Save simple text version
+    if wireframe_text:
+        plan.add("wireframes", session_dir / f"wireframes_{safe_domain}.txt", wireframe_text, "Saved wireframes (text)")
+
+    # Save detailed version with ASCII art
+    if wireframe_detailed:
+        plan.add("wireframes_detailed", session_dir / f"wireframes_detailed_{safe_domain}.md", wireframe_detailed,
+                 "Saved wireframes (detailed)")
+
+    # Save vector wireframes (one SVG per screen plus a combined sheet)
+    if svg_screens:
+        screen_svgs, sheet_svg = render_svgs(svg_screens)
+        svg_dir = session_dir / "wireframes_svg"
+        plan.add("wireframes_svg", svg_dir, None)
+        for file_name, svg in zip(_unique_names(list(screen_svgs), default="screen"), screen_svgs.values()):
+            plan.add(None, svg_dir / f"{file_name}.svg", svg)
+        plan.add("wireframes_sheet", session_dir / f"wireframes_sheet_{safe_domain}.svg", sheet_svg, "Saved wireframes (SVG)")
+
+    # Generate image wireframes description file
+    # This file contains instructions for generating visual wireframes
+    guide = templates.render("wireframes_image_guide.md", safe_domain=safe_domain, has_svg=bool(svg_screens))
+    plan.add("wireframes_image_guide", session_dir / f"wireframes_image_guide_{safe_domain}.md", guide)
+
+
+def _plan_architecture(plan: OutputPlan, session_dir: Path, safe_domain: str):
+    """Architecture document (only for new app ideas, not feature extensions)"""
+    # Skip architecture for feature extensions as they integrate with existing architecture
+    results = plan.results
+    if results.get("intent", "") == "feature_extension":
+        return
+    architecture = results.get("architecture", {})
+
+    if isinstance(architecture, dict):
+        # raw_architecture, when present, is the full detailed spec
+        arch_text = templates.render("architecture.md", architecture=architecture)
+    else:
+        arch_text = str(architecture)
+
+    if arch_text:
+        plan.add("architecture", session_dir / f"architecture_{safe_domain}.md", arch_text, "Saved architecture")
+
+
+def _plan_feature_design(plan: OutputPlan, session_dir: Path, safe_domain: str):
+    """Feature design (for feature extensions)"""
+    feature = plan.results.get("feature_design", {})
+    feature_text = templates.render("feature_design.md", feature=feature)
+    plan.add("feature_design", session_dir / f"feature_design_{safe_domain}.md", feature_text, "Saved feature design")
+
+
+def _plan_idea_breakdown(plan: OutputPlan, session_dir: Path, safe_domain: str):
+    """Idea breakdown (for new app ideas)"""
+    idea = plan.results.get("idea_breakdown", {})
+    idea_text = templates.render("idea_breakdown.md", idea=idea)
+    plan.add("idea_breakdown", session_dir / f"idea_breakdown_{safe_domain}.md", idea_text, "Saved idea breakdown")
+
+
+def _plan_market_size(plan: OutputPlan, session_dir: Path, safe_domain: str):
+    """Market size analysis"""
+    market = plan.results.get("market_size", {})
+    market_text = templates.render("market_analysis.md", market=market)
+    plan.add("market_size", session_dir / f"market_analysis_{safe_domain}.md", market_text, "Saved market analysis")
+
+    # Save scenario analysis (tornado + full grid as CSV, readable extracts as markdown)
+    scenarios = market.get("scenarios")
+    if scenarios:
+        tornado = MarketScenarios.tornado_frame(scenarios)
+        grid = MarketScenarios.grid_frame(scenarios)
+        grid_csv = session_dir / f"market_scenarios_{safe_domain}.csv"
+        sample = MarketScenarios.sample_grid(grid)
+        sample.columns = [f"{value:.3g}" for value in sample.columns]
+        sample.index = [f"{value:.3g}" for value in sample.index]
+
+        scenarios_text = templates.render(
+            "market_scenarios.md",
+            scenarios=scenarios,
+            metric=scenarios["metric"].replace("_", " ").upper(),
+            grid=grid,
+            grid_csv=grid_csv.name,
+            tornado_table=dataframe_to_markdown(tornado, float_format=lambda v: f"{v:,.0f}" if abs(v) >= 100 else f"{v:.4g}"),
+            sample_table=dataframe_to_markdown(sample, float_format=",.0f"),
+        )
+
+        plan.add("market_scenarios", session_dir / f"market_scenarios_{safe_domain}.md", scenarios_text, "Saved market scenarios")
+        plan.add("market_scenarios_csv", grid_csv, grid.to_csv())
+        plan.add("market_tornado_csv", session_dir / f"market_tornado_{safe_domain}.csv", tornado.to_csv())
+
+
+def _plan_competitor_analysis(plan: OutputPlan, session_dir: Path, safe_domain: str):
+    """Competitor analysis"""
+    competitor = plan.results.get("competitor_analysis", {})
+    tables = {}
+
+    # Derived feature matrix, scores and gaps (full matrix also as CSV)
+    feature_matrix = competitor.get("feature_matrix")
+    if feature_matrix and feature_matrix.get("features"):
+        matrix = CompetitorMatrix.matrix_frame(feature_matrix)
+        scores = CompetitorMatrix.scores_frame(feature_matrix)
+        gaps = CompetitorMatrix.gaps_frame(feature_matrix)
+        tables = {
+            "matrix_table": dataframe_to_markdown(matrix.T.replace({True: "✓", False: ""})),
+            "scores_table": dataframe_to_markdown(scores, float_format=".0%"),
+            "gaps_table": None if gaps.empty else dataframe_to_markdown(gaps, float_format=".0%"),
+        }
+        plan.add("competitor_matrix_csv", session_dir / f"competitor_matrix_{safe_domain}.csv", matrix.astype(int).join(scores).to_csv())
+
+    # raw_analysis, when present, is the full detailed analysis
+    comp_text = templates.render("competitor_analysis.md", competitor=competitor, **tables)
+    plan.add("competitor_analysis", session_dir / f"competitor_analysis_{safe_domain}.md", comp_text, "Saved competitor analysis")
+
+
+def _plan_domain_analysis(plan: OutputPlan, session_dir: Path, safe_domain: str):
+    """Domain analysis"""
+    domain_analysis = plan.results.get("domain_analysis", {})
+    domain_text = templates.render("domain_analysis.md", domain_analysis=domain_analysis, safe_domain=safe_domain)
+    plan.add("domain_analysis", session_dir / f"domain_analysis_{safe_domain}.md", domain_text, "Saved domain analysis")
+
+
+# Artifacts rendered from each stage's results, in the order the README lists them
+STAGE_PLANNERS: Dict[str, Callable[[OutputPlan, Path, str], None]] = {
+    "concept_paper": _plan_concept_paper,
+    "pitch": _plan_pitch,
+    "wireframes": _plan_wireframes,
+    "architecture": _plan_architecture,
+    "feature_design": _plan_feature_design,
+    "idea_breakdown": _plan_idea_breakdown,
+    "market_size": _plan_market_size,
+    "competitor_analysis": _plan_competitor_analysis,
+    "domain_analysis": _plan_domain_analysis,
+}
+
+
+def _plan_stage(plan: OutputPlan, stage: str) -> bool:
+    """Add the artifacts of one finished stage to a plan; a stage that cannot be rendered is logged and skipped"""
+    # Sanitize domain for filenames
+    safe_domain = _safe_name(plan.results.get("domain", "general"))
+    try:
+        STAGE_PLANNERS[stage](plan, plan.work_dir, safe_domain)
+    except Exception as e:
+        logger.error("Error rendering stage outputs", stage=stage, error=str(e))
+        import traceback
+        logger.debug("Traceback", traceback=traceback.format_exc())
+        plan.failed_stages.append(stage)
+        return False
+    return True
+
+
+def plan_outputs(results: Dict[str, Any], session_id: str, output_dir: Optional[Path] = None,
+                 compact_json: bool = False, compress_json: bool = False, bundle: Optional[str] = None) -> OutputPlan:
+    """
+    Render every output file for a session without writing anything
+
     Args:
         results: The results dictionary from orchestrator.process()
         session_id: Session ID for organizing files
         output_dir: Optional output directory (defaults to outputs/ in project root)
-        
+        compact_json: Write complete_results.json without indentation
+        compress_json: Gzip complete_results.json (saved as complete_results.json.gz)
+        bundle: Plan for a single-file bundle ("zip" or "tar.zst") rather than a session directory
+
     Returns:
-        Dictionary mapping output type to file path
+        OutputPlan with the session directory and the artifacts to write
     """
-    # Determine output directory
-    if output_dir is None:
-        project_root = Path(__file__).parent.parent.parent
-        output_dir = project_root / 'outputs'
+    root = _output_root(output_dir)
+    session_dir, work_dir = _run_dirs(session_id, root)
+    if bundle:
+        # Bundles are written beside the final directory and renamed into place by the bundle writer
+        plan = OutputPlan(session_id, session_dir, results, output_root=root)
+    else:
+        plan = OutputPlan(session_id, session_dir, results, store=_get_blob_store(root), work_dir=work_dir, output_root=root)
+    for stage in STAGE_PLANNERS:
+        if stage in results:
+            _plan_stage(plan, stage)
+
+    # Save complete results as JSON (for reference); streamed stage by stage by the writer thread, not here
+    if bundle:
+        # A bundle compresses every member itself, so the JSON goes in as plain text
+        separators = (",", ":") if compact_json else None
+        plan.add("complete_results", plan.work_dir / "complete_results.json",
+                 json.dumps(results, indent=None if compact_json else 2, separators=separators, default=str))
     else:
-        output_dir = Path(output_dir)
-    
-    # Create output directory if it doesn't exist
-    output_dir.mkdir(exist_ok=True)
-    
-    # Create session-specific subdirectory
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    session_dir = output_dir / f"{session_id}_{timestamp}"
-    session_dir.mkdir(exist_ok=True)
-    
+        plan.add("complete_results", plan.work_dir / _json_name(compress_json),
+                 functools.partial(write_results_json, results, compact=compact_json, compress=compress_json))
+
+    return plan
+
+
+def _write_artifact(artifact: Artifact) -> bool:
+    try:
+        artifact.write()
+    except Exception as e:
+        logger.error("Error saving output file", file=str(artifact.path), error=str(e))
+        return False
+    if artifact.message:
+        logger.info(artifact.message, file=str(artifact.path))
+    return True
+
+
+def _finish(plan: OutputPlan, written: List[bool]) -> Dict[str, str]:
+    """Collect what was written, write the README listing it and move the session into place"""
     saved_files = {}
-    intent = results.get("intent", "unknown")
-    domain = results.get("domain", "general")
-    
-    # Sanitize domain and intent for filenames
-    safe_domain = "".join(c for c in domain if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')[:50]
-    safe_intent = intent.replace('_', '-')
-    
+    for artifact, ok in zip(plan.artifacts, written):
+        if ok and artifact.key:
+            saved_files[artifact.key] = str(artifact.path)
+
+    # Hash of every file that went through the blob store, so a session can be checked or rebuilt from it
+    stored = {artifact.path.relative_to(plan.work_dir).as_posix(): {"sha256": artifact.digest, "size": artifact.path.stat().st_size}
+              for artifact, ok in zip(plan.artifacts, written) if ok and artifact.digest}
+    if stored:
+        manifest = json.dumps({"session_id": plan.session_id, "files": stored}, indent=2)
+        if _write_artifact(Artifact("manifest", plan.work_dir / "manifest.json", manifest)):
+            saved_files["manifest"] = str(plan.work_dir / "manifest.json")
+
+    readme = _readme(plan, saved_files)
+    if _write_artifact(Artifact("readme", plan.work_dir / "README.md", readme)):
+        saved_files["readme"] = str(plan.work_dir / "README.md")
+
+    # Everything is on disk: one rename makes the whole session visible at its final path
+    kinds = {Path(path).relative_to(plan.work_dir).as_posix(): key for key, path in saved_files.items()}
+    location = plan.session_dir if _publish(plan) else plan.work_dir
+    saved_files = {key: str(location / relative) for relative, key in kinds.items()}
+    _catalog_session(plan.output_root, location, plan.session_id, plan.results, scan_artifacts(location, kinds))
+
+    logger.info("Saved all outputs to files", output_dir=str(location), files=list(saved_files.keys()))
+    return saved_files
+
+
+def _readme(plan: OutputPlan, saved_files: Dict[str, str]) -> str:
+    files = [(output_type, Path(file_path).name) for output_type, file_path in saved_files.items()
+             if output_type != "complete_results"]
+    return templates.render(
+        "README.md",
+        session_id=plan.session_id,
+        generated=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        results=plan.results,
+        files=files,
+        failed_stages=plan.failed_stages,
+        json_name=Path(saved_files.get("complete_results", "complete_results.json")).name,
+    )
+
+
+def _bundle_outputs(plan: OutputPlan, fmt: str) -> Dict[str, str]:
+    """
+    Write every artifact and the README into one bundle file instead of a session directory
+
+    Returns:
+        Dictionary mapping output type to its name inside the bundle, plus
+        "bundle" with the path of the bundle itself
+    """
+    bundle_path = plan.session_dir.with_name(plan.session_dir.name + bundle_suffix(fmt))
+    saved_files = {}
+    members = []
+    with BundleWriter(bundle_path, fmt) as bundle:
+        for artifact in plan.artifacts:
+            if artifact.content is None:
+                continue
+            name = artifact.path.relative_to(plan.work_dir).as_posix()
+            try:
+                data = artifact.data()
+            except Exception as e:
+                logger.error("Error rendering output file", file=name, error=str(e))
+                continue
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            bundle.add(name, data)
+            members.append((artifact.key, name, len(data), None))
+            if artifact.key:
+                saved_files[artifact.key] = name
+        readme = _readme(plan, saved_files).encode("utf-8")
+        bundle.add("README.md", readme)
+        members.append(("readme", "README.md", len(readme), None))
+        saved_files["readme"] = "README.md"
+    saved_files["bundle"] = str(bundle.path)
+    _catalog_session(plan.output_root, bundle.path, plan.session_id, plan.results, members, bundle=bundle.format)
+    logger.info("Saved all outputs to bundle", bundle=str(bundle.path), files=len(saved_files) - 1)
+    return saved_files
+
+
+def save_outputs_to_files(results: Dict[str, Any], session_id: str, output_dir: Optional[Path] = None,
+                          compact_json: bool = False, compress_json: bool = False,
+                          bundle: Optional[str] = None) -> Dict[str, str]:
+    """
+    Save all outputs from the orchestrator to organized files
+
+    Blocking; from async code use ``save_outputs_async`` so the event loop
+    keeps serving other sessions while files are written.
+
+    Args:
+        results: The results dictionary from orchestrator.process()
+        session_id: Session ID for organizing files
+        output_dir: Optional output directory (defaults to outputs/ in project root)
+        compact_json: Write complete_results.json without indentation
+        compress_json: Gzip complete_results.json (not used for bundles, which compress every member)
+        bundle: Write one "zip" or "tar.zst" file (outputs/runs/YYYY/MM/DD/<shard>/<run id>.zip)
+            instead of a session directory; read single artifacts back with ``session_bundle.read_artifact``
+
+    Returns:
+        Dictionary mapping output type to file path (for a bundle: to the name
+        inside it, plus "bundle" with the bundle's path)
+    """
     try:
-        # Save concept paper (for feature extensions)
-        if "concept_paper" in results:
-            concept = results.get("concept_paper", {})
-            concept_text = concept.get("full_text", "")
-            if concept_text:
-                concept_file = session_dir / f"concept_paper_{safe_domain}.md"
-                with open(concept_file, 'w', encoding='utf-8') as f:
-                    f.write(concept_text)
-                saved_files["concept_paper"] = str(concept_file)
-                logger.info("Saved concept paper", file=str(concept_file))
-        
-        # Save pitch deck (for new app ideas and feature extensions)
-        if "pitch" in results:
-            pitch = results.get("pitch", {})
-            pitch_text = pitch.get("full_text", "")
-            if pitch_text:
-                # Save as Marp format (can be converted to visual slides)
-                pitch_file = session_dir / f"pitch_deck_{safe_domain}.md"
-                with open(pitch_file, 'w', encoding='utf-8') as f:
-                    f.write(pitch_text)
-                saved_files["pitch"] = str(pitch_file)
-                logger.info("Saved pitch deck", file=str(pitch_file))
-                
-                # Create a guide for converting to visual slides
-                pitch_guide_file = session_dir / f"pitch_deck_guide_{safe_domain}.md"
-                with open(pitch_guide_file, 'w', encoding='utf-8') as f:
-                    f.write("# Pitch Deck Conversion Guide\n\n")
-                    f.write("## Overview\n\n")
-                    f.write(f"The pitch deck is saved in Marp format: `pitch_deck_{safe_domain}.md`\n\n")
-                    f.write("## Converting to Visual Slides\n\n")
-                    f.write("### Option 1: Marp (Recommended)\n")
-                    f.write("1. Install Marp CLI: `npm install -g @marp-team/marp-cli`\n")
-                    f.write(f"2. Convert to PDF: `marp pitch_deck_{safe_domain}.md -o pitch_deck_{safe_domain}.pdf`\n")
-                    f.write(f"3. Convert to HTML: `marp pitch_deck_{safe_domain}.md -o pitch_deck_{safe_domain}.html`\n")
-                    f.write(f"4. Convert to PowerPoint: `marp pitch_deck_{safe_domain}.md -o pitch_deck_{safe_domain}.pptx`\n\n")
-                    f.write("### Option 2: Online Marp Editor\n")
-                    f.write("1. Go to https://marp.app/\n")
-                    f.write(f"2. Copy content from `pitch_deck_{safe_domain}.md`\n")
-                    f.write("3. Export as PDF, PowerPoint, or HTML\n\n")
-                    f.write("### Option 3: VS Code Extension\n")
-                    f.write("1. Install 'Marp for VS Code' extension\n")
-                    f.write(f"2. Open `pitch_deck_{safe_domain}.md`\n")
-                    f.write("3. Use preview and export features\n\n")
-                    f.write("### Option 4: Manual Conversion\n")
-                    f.write("Copy each slide section to PowerPoint, Google Slides, or Keynote manually.\n\n")
-                saved_files["pitch_guide"] = str(pitch_guide_file)
-        
-        # Save wireframes (both text and detailed versions)
-        if "wireframes" in results:
-            wireframes = results.get("wireframes", {})
-            wireframe_text = ""
-            wireframe_detailed = ""
-            
-            # Extract wireframe data - structure is wireframes.wireframes dict
-            if isinstance(wireframes, dict):
-                if "wireframes" in wireframes:
-                    wireframes_dict = wireframes.get("wireframes", {})
-                    # wireframes_dict is a dict with screen names as keys
-                    for screen_name, wf_data in wireframes_dict.items():
-                        if isinstance(wf_data, dict):
-                            # Simple wireframe version
-                            wireframe_text += f"## {screen_name}\n\n"
-                            simple_wf = wf_data.get("wireframe", "")
-                            if simple_wf:
-                                wireframe_text += f"{simple_wf}\n\n"
-                            
-                            # Detailed wireframe version (from raw_analysis)
-                            wireframe_detailed += f"# {screen_name}\n\n"
-                            raw_analysis = wf_data.get("raw_analysis", "")
-                            if raw_analysis:
-                                wireframe_detailed += f"{raw_analysis}\n\n"
-                            
-                            # Add elements if available
-                            elements = wf_data.get("elements", [])
-                            if elements:
-                                wireframe_detailed += f"## UI Elements\n\n"
-                                for elem in elements:
-                                    wireframe_detailed += f"- {elem}\n"
-                                wireframe_detailed += "\n"
-                        else:
-                            wireframe_text += f"## {screen_name}\n\n{str(wf_data)}\n\n"
-                else:
-                    # Fallback: treat wireframes as a list or other structure
-                    wireframe_text = str(wireframes)
-                    wireframe_detailed = str(wireframes)
-            else:
-                wireframe_text = str(wireframes)
-                wireframe_detailed = str(wireframes)
-            
-            # Save simple text version
-            if wireframe_text:
-                wireframe_file = session_dir / f"wireframes_{safe_domain}.txt"
-                with open(wireframe_file, 'w', encoding='utf-8') as f:
-                    f.write(wireframe_text)
-                saved_files["wireframes"] = str(wireframe_file)
-                logger.info("Saved wireframes (text)", file=str(wireframe_file))
-            
-            # Save detailed version with ASCII art
-            if wireframe_detailed:
-                wireframe_detailed_file = session_dir / f"wireframes_detailed_{safe_domain}.md"
-                with open(wireframe_detailed_file, 'w', encoding='utf-8') as f:
-                    f.write(wireframe_detailed)
-                saved_files["wireframes_detailed"] = str(wireframe_detailed_file)
-                logger.info("Saved wireframes (detailed)", file=str(wireframe_detailed_file))
-            
-            # Generate image wireframes description file
-            # This file contains instructions for generating visual wireframes
-            wireframe_image_guide = session_dir / f"wireframes_image_guide_{safe_domain}.md"
-            with open(wireframe_image_guide, 'w', encoding='utf-8') as f:
-                f.write("# Wireframe Image Generation Guide\n\n")
-                f.write("## Overview\n\n")
-                f.write("This guide explains how to convert the ASCII wireframes into visual wireframe images.\n\n")
-                f.write("## Available Formats\n\n")
-                f.write("### 1. Text Wireframes\n")
-                f.write(f"- File: `wireframes_{safe_domain}.txt`\n")
-                f.write("- Simple text representation of wireframes\n\n")
-                f.write("### 2. Detailed ASCII Wireframes\n")
-                f.write(f"- File: `wireframes_detailed_{safe_domain}.md`\n")
-                f.write("- Detailed ASCII art wireframes with full layout\n\n")
-                f.write("## Image Generation Options\n\n")
-                f.write("### Option 1: Mermaid Diagrams\n")
-                f.write("Convert ASCII wireframes to Mermaid flowcharts:\n")
-                f.write("```mermaid\n")
-                f.write("graph TD\n")
-                f.write("    A[Screen Header] --> B[Content Area]\n")
-                f.write("    B --> C[Footer]\n")
-                f.write("```\n\n")
-                f.write("### Option 2: AI Image Generation\n")
-                f.write("Use AI tools like:\n")
-                f.write("- DALL-E / Midjourney: Describe the wireframe layout\n")
-                f.write("- Stable Diffusion: Use ASCII wireframe as prompt\n")
-                f.write("- ChatGPT / Claude: Request visual wireframe generation\n\n")
-                f.write("### Option 3: Design Tools\n")
-                f.write("Import ASCII wireframes into:\n")
-                f.write("- Figma: Create frames based on ASCII layout\n")
-                f.write("- Excalidraw: Draw wireframes manually\n")
-                f.write("- Balsamiq: Use wireframe templates\n\n")
-                f.write("### Option 4: Code-Based Generation\n")
-                f.write("Use libraries like:\n")
-                f.write("- Python: `matplotlib`, `PIL` for programmatic wireframes\n")
-                f.write("- JavaScript: `D3.js`, `React` for interactive wireframes\n\n")
-                f.write("## Next Steps\n\n")
-                f.write("1. Review the detailed ASCII wireframes in `wireframes_detailed_{safe_domain}.md`\n")
-                f.write("2. Choose your preferred image generation method\n")
-                f.write("3. Generate visual wireframes based on the ASCII layouts\n")
-                f.write("4. Save images in formats like PNG, SVG, or PDF\n\n")
-            saved_files["wireframes_image_guide"] = str(wireframe_image_guide)
-        
-        # Save architecture document (only for new app ideas, not feature extensions)
-        # Skip architecture for feature extensions as they integrate with existing architecture
-        intent = results.get("intent", "")
-        if "architecture" in results and intent != "feature_extension":
-            architecture = results.get("architecture", {})
-            arch_text = ""
-            
-            if isinstance(architecture, dict):
-                arch_text = f"# Architecture Design\n\n"
-                
-                # Use raw_architecture if available (contains full detailed spec)
-                if architecture.get("raw_architecture"):
-                    arch_text += f"{architecture.get('raw_architecture')}\n\n"
-                else:
-                    arch_text += f"## Overview\n\n{architecture.get('overview', architecture.get('description', ''))}\n\n"
-                    
-                    if "components" in architecture:
-                        arch_text += "## Components\n\n"
-                        for comp in architecture.get("components", []):
-                            arch_text += f"- {comp}\n"
-                        arch_text += "\n"
-                    
-                    if "tech_stack" in architecture:
-                        arch_text += "## Technology Stack\n\n"
-                        for tech in architecture.get("tech_stack", []):
-                            arch_text += f"- {tech}\n"
-                        arch_text += "\n"
-                    
-                    if "architecture_diagram" in architecture:
-                        arch_text += f"## Architecture Diagram\n\n```\n{architecture.get('architecture_diagram')}\n```\n\n"
-                    
-                    # Add any other fields
-                    for key, value in architecture.items():
-                        if key not in ["overview", "description", "components", "tech_stack", "architecture_diagram", "raw_architecture"]:
-                            arch_text += f"## {key.replace('_', ' ').title()}\n\n{value}\n\n"
-            else:
-                arch_text = str(architecture)
-            
-            if arch_text:
-                arch_file = session_dir / f"architecture_{safe_domain}.md"
-                with open(arch_file, 'w', encoding='utf-8') as f:
-                    f.write(arch_text)
-                saved_files["architecture"] = str(arch_file)
-                logger.info("Saved architecture", file=str(arch_file))
-        
-        # Save feature design (for feature extensions)
-        if "feature_design" in results:
-            feature = results.get("feature_design", {})
-            feature_text = f"# Feature Design\n\n"
-            feature_text += f"## Feature Request\n\n{feature.get('feature_request', 'N/A')}\n\n"
-            feature_text += f"## Overview\n\n{feature.get('feature_overview', 'N/A')}\n\n"
-            
-            if "user_stories" in feature:
-                feature_text += "## User Stories\n\n"
-                for story in feature.get("user_stories", []):
-                    feature_text += f"- {story}\n"
-                feature_text += "\n"
-            
-            if "user_journey" in feature:
-                feature_text += "## User Journey\n\n"
-                journey = feature.get("user_journey", [])
-                if isinstance(journey, list):
-                    for step in journey:
-                        feature_text += f"- {step}\n"
-                else:
-                    feature_text += f"{journey}\n"
-                feature_text += "\n"
-            
-            if "technical_requirements" in feature:
-                feature_text += "## Technical Requirements\n\n"
-                for req in feature.get("technical_requirements", []):
-                    feature_text += f"- {req}\n"
-                feature_text += "\n"
-            
-            feature_file = session_dir / f"feature_design_{safe_domain}.md"
-            with open(feature_file, 'w', encoding='utf-8') as f:
-                f.write(feature_text)
-            saved_files["feature_design"] = str(feature_file)
-            logger.info("Saved feature design", file=str(feature_file))
-        
-        # Save idea breakdown (for new app ideas)
-        if "idea_breakdown" in results:
-            idea = results.get("idea_breakdown", {})
-            idea_text = f"# Idea Breakdown\n\n"
-            idea_text += f"## Problem Statement\n\n{idea.get('problem_statement', 'N/A')}\n\n"
-            idea_text += f"## Value Proposition\n\n{idea.get('value_proposition', 'N/A')}\n\n"
-            idea_text += f"## Target Audience\n\n{idea.get('target_audience', 'N/A')}\n\n"
-            
-            if "proposed_features" in idea:
-                idea_text += "## Proposed Features\n\n"
-                for feature in idea.get("proposed_features", []):
-                    idea_text += f"- {feature}\n"
-                idea_text += "\n"
-            
-            idea_file = session_dir / f"idea_breakdown_{safe_domain}.md"
-            with open(idea_file, 'w', encoding='utf-8') as f:
-                f.write(idea_text)
-            saved_files["idea_breakdown"] = str(idea_file)
-            logger.info("Saved idea breakdown", file=str(idea_file))
-        
-        # Save market size analysis
-        if "market_size" in results:
-            market = results.get("market_size", {})
-            market_text = f"# Market Size Analysis\n\n"
-            
-            if "tam" in market:
-                tam = market.get("tam", {})
-                market_text += f"## Total Addressable Market (TAM)\n\n"
-                market_text += f"Value: ${tam.get('value_usd', 0):,}\n"
-                market_text += f"Currency: {tam.get('currency', 'USD')}\n"
-                market_text += f"Description: {tam.get('description', '')}\n\n"
-            
-            if "sam" in market:
-                sam = market.get("sam", {})
-                market_text += f"## Serviceable Addressable Market (SAM)\n\n"
-                market_text += f"Value: ${sam.get('value_usd', 0):,}\n"
-                market_text += f"Currency: {sam.get('currency', 'USD')}\n"
-                market_text += f"Description: {sam.get('description', '')}\n\n"
-            
-            if "som" in market:
-                som = market.get("som", {})
-                market_text += f"## Serviceable Obtainable Market (SOM)\n\n"
-                market_text += f"Value: ${som.get('value_usd', 0):,}\n"
-                market_text += f"Currency: {som.get('currency', 'USD')}\n"
-                market_text += f"Description: {som.get('description', '')}\n\n"
-            
-            market_file = session_dir / f"market_analysis_{safe_domain}.md"
-            with open(market_file, 'w', encoding='utf-8') as f:
-                f.write(market_text)
-            saved_files["market_size"] = str(market_file)
-            logger.info("Saved market analysis", file=str(market_file))
-        
-        # Save competitor analysis
-        if "competitor_analysis" in results:
-            competitor = results.get("competitor_analysis", {})
-            comp_text = f"# Competitor Analysis\n\n"
-            
-            # Use raw_analysis if available (contains full detailed analysis)
-            if competitor.get("raw_analysis"):
-                comp_text += f"{competitor.get('raw_analysis')}\n\n"
-            else:
-                # Fallback to structured fields
-                if "competitors" in competitor:
-                    comp_text += "## Competitors\n\n"
-                    for comp in competitor.get("competitors", []):
-                        if isinstance(comp, dict):
-                            comp_text += f"### {comp.get('name', 'Unknown')}\n\n"
-                            comp_text += f"{comp.get('description', '')}\n\n"
-                        else:
-                            comp_text += f"- {comp}\n"
-                    comp_text += "\n"
-                
-                if "top_competitors" in competitor:
-                    comp_text += "## Top Competitors\n\n"
-                    for comp in competitor.get("top_competitors", []):
-                        if isinstance(comp, dict):
-                            comp_text += f"### {comp.get('name', 'Unknown')}\n\n"
-                            comp_text += f"{comp.get('description', '')}\n\n"
-                        else:
-                            comp_text += f"- {comp}\n"
-                    comp_text += "\n"
-                
-                if "differentiation" in competitor:
-                    comp_text += "## Differentiation\n\n"
-                    comp_text += f"{competitor.get('differentiation', '')}\n\n"
-                
-                if "differentiation_opportunities" in competitor:
-                    comp_text += "## Differentiation Opportunities\n\n"
-                    for opp in competitor.get("differentiation_opportunities", []):
-                        comp_text += f"- {opp}\n"
-                    comp_text += "\n"
-                
-                if "market_gaps" in competitor:
-                    comp_text += "## Market Gaps\n\n"
-                    for gap in competitor.get("market_gaps", []):
-                        comp_text += f"- {gap}\n"
-                    comp_text += "\n"
-            
-            comp_file = session_dir / f"competitor_analysis_{safe_domain}.md"
-            with open(comp_file, 'w', encoding='utf-8') as f:
-                f.write(comp_text)
-            saved_files["competitor_analysis"] = str(comp_file)
-            logger.info("Saved competitor analysis", file=str(comp_file))
-        
-        # Save domain analysis
-        if "domain_analysis" in results:
-            domain_analysis = results.get("domain_analysis", {})
-            domain_text = f"# Domain Analysis\n\n"
-            domain_text += f"Domain: {safe_domain or 'N/A'}\n\n"
-            
-            if isinstance(domain_analysis, dict):
-                for key, value in domain_analysis.items():
-                    domain_text += f"## {key.replace('_', ' ').title()}\n\n"
-                    if isinstance(value, list):
-                        for item in value:
-                            domain_text += f"- {item}\n"
-                    else:
-                        domain_text += f"{value}\n"
-                    domain_text += "\n"
-            else:
-                domain_text += str(domain_analysis)
-            
-            domain_file = session_dir / f"domain_analysis_{safe_domain}.md"
-            with open(domain_file, 'w', encoding='utf-8') as f:
-                f.write(domain_text)
-            saved_files["domain_analysis"] = str(domain_file)
-            logger.info("Saved domain analysis", file=str(domain_file))
-        
-        # Save complete results as JSON (for reference)
-        json_file = session_dir / "complete_results.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, default=str)
-        saved_files["complete_results"] = str(json_file)
-        
-        # Create a README file with summary
-        readme_file = session_dir / "README.md"
-        with open(readme_file, 'w', encoding='utf-8') as f:
-            f.write(f"# MAPIS Output - {session_id}\n\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write(f"## Summary\n\n")
-            f.write(f"- **Intent**: {intent}\n")
-            f.write(f"- **Domain**: {domain}\n")
-            f.write(f"- **User Input**: {results.get('user_input', 'N/A')}\n\n")
-            f.write(f"## Generated Files\n\n")
-            for output_type, file_path in saved_files.items():
-                if output_type != "complete_results":
-                    f.write(f"- **{output_type.replace('_', ' ').title()}**: `{Path(file_path).name}`\n")
-            f.write(f"\n## Complete Results\n\n")
-            f.write(f"Full JSON results available in `complete_results.json`\n")
-        saved_files["readme"] = str(readme_file)
-        
-        logger.info("Saved all outputs to files", output_dir=str(session_dir), files=list(saved_files.keys()))
-        
+        plan = plan_outputs(results, session_id, output_dir, compact_json, compress_json, bundle)
+        if bundle:
+            return _bundle_outputs(plan, bundle)
+        written = list(_get_executor().map(_write_artifact, plan.artifacts))
+        return _finish(plan, written)
     except Exception as e:
         logger.error("Error saving outputs to files", error=str(e))
         import traceback
         logger.debug("Traceback", traceback=traceback.format_exc())
-    
-    return saved_files
+        return {}
+
+
+async def save_outputs_async(results: Dict[str, Any], session_id: str, output_dir: Optional[Path] = None,
+                             compact_json: bool = False, compress_json: bool = False,
+                             bundle: Optional[str] = None) -> Dict[str, str]:
+    """
+    Save all outputs without blocking the event loop
+
+    Rendering, every file write (including the JSON dump) and the README run
+    on a small thread pool shared by all sessions; the files of one session
+    are written concurrently.
+
+    Args:
+        results: The results dictionary from orchestrator.process()
+        session_id: Session ID for organizing files
+        output_dir: Optional output directory (defaults to outputs/ in project root)
+        compact_json: Write complete_results.json without indentation
+        compress_json: Gzip complete_results.json (not used for bundles, which compress every member)
+        bundle: Write one "zip" or "tar.zst" file (outputs/runs/YYYY/MM/DD/<shard>/<run id>.zip)
+            instead of a session directory; read single artifacts back with ``session_bundle.read_artifact``
+
+    Returns:
+        Dictionary mapping output type to file path (for a bundle: to the name
+        inside it, plus "bundle" with the bundle's path)
+    """
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    try:
+        plan = await loop.run_in_executor(executor, plan_outputs, results, session_id, output_dir, compact_json, compress_json, bundle)
+        if bundle:
+            return await loop.run_in_executor(executor, _bundle_outputs, plan, bundle)
+        written = await asyncio.gather(*(loop.run_in_executor(executor, _write_artifact, artifact) for artifact in plan.artifacts))
+        return await loop.run_in_executor(executor, _finish, plan, list(written))
+    except Exception as e:
+        logger.error("Error saving outputs to files", error=str(e))
+        import traceback
+        logger.debug("Traceback", traceback=traceback.format_exc())
+        return {}
+
+
+class StageOutputWriter:
+    """
+    Writes a session's output files while the pipeline is still running
+
+    Register ``on_stage`` with ``MAPISOrchestrator.add_stage_listener``: as
+    each stage finishes, its artifacts are rendered and written atomically on
+    the shared writer threads and its section is appended to
+    complete_results.json, so disk I/O overlaps the next LLM calls and a
+    crash in a later stage keeps everything already done. ``finish`` writes
+    whatever is still missing and regenerates the README.
+    """
+
+    def __init__(self, session_id: str, output_dir: Optional[Path] = None,
+                 compact_json: bool = False, compress_json: bool = False):
+        self.session_id = session_id
+        self.output_root = _output_root(output_dir)
+        # Files go to the staging directory as stages finish; finish() renames it to session_dir
+        self.session_dir, self.work_dir = _run_dirs(session_id, self.output_root)
+        self.json_path = self.work_dir / _json_name(compress_json)
+        self.compact_json = compact_json
+        self.compress_json = compress_json
+        self._json: Optional[ResultsWriter] = None
+        self._json_keys = set()
+        self._stages = set()
+        self._saved: Dict[str, List[Artifact]] = {}
+        self._failed: List[str] = []
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+
+    def on_stage(self, session_id: str, stage: str, results: Dict[str, Any]):
+        """Stage listener; returns immediately, the files are written in the background"""
+        if session_id != self.session_id:
+            return
+        self._submit(stage, results)
+
+    def _submit(self, stage: Optional[str], results: Dict[str, Any]):
+        if stage is not None:
+            if stage not in STAGE_PLANNERS or stage in self._stages:
+                stage = None
+            else:
+                self._stages.add(stage)
+        # Snapshot on the caller's thread; the orchestrator keeps adding to results
+        self._futures.append(_get_executor().submit(self._emit, stage, dict(results)))
+
+    def _emit(self, stage: Optional[str], results: Dict[str, Any]):
+        if stage is not None:
+            # A stage that cannot be rendered loses only its own files; its JSON section and the other stages still go out
+            try:
+                plan = self._plan(results, store=_get_blob_store(self.output_root))
+                ok = _plan_stage(plan, stage)
+                written = [artifact for artifact in plan.artifacts if _write_artifact(artifact)]
+            except Exception as e:
+                logger.error("Error saving stage outputs", stage=stage, error=str(e))
+                ok, written = False, []
+            with self._lock:
+                self._saved[stage] = written
+                if not ok:
+                    self._failed.append(stage)
+
+        # Sections go out in results order; a job holding a later snapshot may write an earlier one's keys first
+        with self._lock:
+            try:
+                if self._json is None:
+                    self.work_dir.mkdir(parents=True, exist_ok=True)
+                    self._json = ResultsWriter(self.json_path, compact=self.compact_json, compress=self.compress_json)
+                for key, value in results.items():
+                    if key not in self._json_keys:
+                        self._json.write_section(key, value)
+                        self._json_keys.add(key)
+            except Exception as e:
+                logger.error("Error saving output file", file=str(self.json_path), error=str(e))
+
+    def _plan(self, results: Dict[str, Any], store: Optional[BlobStore] = None) -> OutputPlan:
+        return OutputPlan(self.session_id, self.session_dir, results, store=store, work_dir=self.work_dir,
+                          output_root=self.output_root)
+
+    def _close(self, results: Dict[str, Any]) -> Dict[str, str]:
+        with self._lock:
+            json_ok = self._json is not None
+            if json_ok:
+                try:
+                    self._json.close()
+                except Exception as e:
+                    logger.error("Error saving output file", file=str(self.json_path), error=str(e))
+                    json_ok = False
+
+            # README lists the files in stage order, however the stages finished
+            plan = self._plan(results)
+            for stage in STAGE_PLANNERS:
+                plan.artifacts.extend(self._saved.get(stage, []))
+                if stage in self._failed:
+                    plan.failed_stages.append(stage)
+        plan.add("complete_results", self.json_path, None)
+        return _finish(plan, [True] * (len(plan.artifacts) - 1) + [json_ok])
+
+    async def finish(self, results: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Write any stage not seen yet (e.g. reused results), wait for every write and regenerate the README
+
+        Args:
+            results: The results dictionary from orchestrator.process()
+
+        Returns:
+            Dictionary mapping output type to file path
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            for stage in STAGE_PLANNERS:
+                if stage in results and stage not in self._stages:
+                    self._submit(stage, results)
+            self._submit(None, results)
+            # A failed job must not keep the JSON from being closed or the session from being published
+            for error in await asyncio.gather(*(asyncio.wrap_future(future) for future in self._futures),
+                                              return_exceptions=True):
+                if isinstance(error, Exception):
+                    logger.error("Error saving stage outputs", error=str(error))
+            self._futures.clear()
+            return await loop.run_in_executor(_get_executor(), self._close, results)
+        except Exception as e:
+            logger.error("Error saving outputs to files", error=str(e))
+            import traceback
+            logger.debug("Traceback", traceback=traceback.format_exc())
+            return {}
+
+
+def collect_output_garbage(output_dir: Optional[Path] = None, min_age: float = DEFAULT_GC_MIN_AGE) -> Dict[str, int]:
+    """
+    Delete stored artifact bodies that no session directory links to any more
+
+    Run after removing old session directories; removing a session never
+    touches the blob store itself.
+
+    Args:
+        output_dir: Output directory (defaults to outputs/ in project root)
+        min_age: Seconds a blob must have existed before it can be removed
+
+    Returns:
+        Dict with the number of blobs removed and kept, and bytes freed
+    """
+    return BlobStore(_output_root(output_dir) / BLOB_DIR).gc(min_age)
+
+
+_SESSION_NAME = re.compile(r"^(?P<session_id>.+)_(?P<timestamp>\d{8}_\d{6})(?:_[0-9a-f]{8})?$")
+_DAY = re.compile(r"^\d{4}/\d{2}/\d{2}$")
+
+
+def _session_entries(root: Path) -> List[Path]:
+    """Session directories and bundles: the sharded runs/ tree, plus sessions saved flat before it"""
+    if not root.is_dir():
+        return []
+    legacy = [entry for entry in root.iterdir() if entry.name not in (RUNS_DIR, STAGING_DIR, BLOB_DIR)]
+    return sorted(legacy) + sorted((root / RUNS_DIR).glob("*/*/*/*/*"))
+
+
+def catalog_existing_outputs(output_dir: Optional[Path] = None) -> int:
+    """
+    Add sessions saved before the catalog existed (or with OUTPUT_CATALOG=0) to it
+
+    Reads only the summary sections of each complete_results.json through its
+    index where there is one. Sessions already in the catalog are refreshed.
+
+    Args:
+        output_dir: Output directory (defaults to outputs/ in project root)
+
+    Returns:
+        Number of sessions cataloged
+    """
+    root = _output_root(output_dir)
+    catalog = get_output_catalog(root)
+    count = 0
+    for entry in _session_entries(root):
+        bundle = next((fmt for fmt in BUNDLE_FORMATS if entry.name.endswith(bundle_suffix(fmt))), None)
+        name = entry.name[:-len(bundle_suffix(bundle))] if bundle else entry.name
+        match = _SESSION_NAME.match(name)
+        try:
+            if bundle and entry.is_file():
+                reader = BundleReader(entry)
+                results = json.loads(reader.read("complete_results.json"))
+                artifacts = [(None, member, None, None) for member in reader.names()]
+            elif entry.is_dir() and not bundle:
+                json_path = next((entry / _json_name(compress) for compress in (False, True)
+                                  if (entry / _json_name(compress)).exists()), None)
+                if json_path is None:
+                    continue
+                reader = ResultsReader(json_path)
+                summary = ("intent", "domain", "user_input", "keywords", "status", "market_size")
+                results = {key: reader.load(key) for key in summary if key in reader.sections()}
+                artifacts = scan_artifacts(entry)
+            else:
+                continue
+            created_at = (time.mktime(time.strptime(match.group("timestamp"), "%Y%m%d_%H%M%S"))
+                          if match else entry.stat().st_mtime)
+            catalog.record(entry, match.group("session_id") if match else name, results, artifacts, bundle, created_at)
+            count += 1
+        except Exception as e:
+            logger.warning("Skipping session that could not be cataloged", location=str(entry), error=str(e))
+    logger.info("Cataloged existing outputs", output_dir=str(root), sessions=count)
+    return count
+
+
+def _recover_staging(root: Path, entry: Path) -> Optional[Path]:
+    """
+    Move an interrupted run that saved results from staging into runs/ as an incomplete run
+
+    Its finished stages stay readable (``ResultsReader`` recovers an unclosed
+    complete_results.json through its index) and it is cataloged with status
+    "incomplete".
+
+    Returns:
+        The run's new location, or None if it holds no results worth keeping
+    """
+    json_path = next((entry / _json_name(compress) for compress in (False, True)
+                      if (entry / _json_name(compress)).exists() or index_path(entry / _json_name(compress)).exists()), None)
+    if json_path is None:
+        return None
+    match = _SESSION_NAME.match(entry.name)
+    started = datetime.strptime(match.group("timestamp"), "%Y%m%d_%H%M%S") if match \
+        else datetime.fromtimestamp(entry.stat().st_mtime)
+    shard = hashlib.sha1(entry.name.encode("utf-8")).hexdigest()[:2]
+    location = root / RUNS_DIR / started.strftime("%Y/%m/%d") / shard / entry.name
+    location.parent.mkdir(parents=True, exist_ok=True)
+    os.rename(entry, location)
+    logger.warning("Recovered interrupted run", staging_dir=str(entry), output_dir=str(location))
+
+    results: Dict[str, Any] = {}
+    try:
+        reader = ResultsReader(location / json_path.name)
+        summary = ("intent", "domain", "user_input", "keywords", "market_size")
+        results = {key: reader.load(key) for key in summary if key in reader.sections()}
+    except Exception as e:
+        logger.warning("Could not read results of interrupted run", location=str(location), error=str(e))
+    _catalog_session(root, location, match.group("session_id") if match else entry.name,
+                     dict(results, status="incomplete"), scan_artifacts(location), created_at=started.timestamp())
+    return location
+
+
+def apply_output_retention(output_dir: Optional[Path] = None, max_age_days: Optional[float] = None,
+                           staging_max_age: float = DEFAULT_STAGING_MAX_AGE,
+                           min_blob_age: float = DEFAULT_GC_MIN_AGE) -> Dict[str, int]:
+    """
+    Remove runs past the retention period, abandoned staging directories and blobs nothing links to
+
+    Staging directories of interrupted runs that saved results are moved into
+    runs/ as incomplete runs first; only those with nothing in them are
+    removed. Runs go a whole day directory at a time, chosen by the date in
+    their path, so nothing under runs/ is listed or stat'ed beyond the day
+    directories; their catalog rows go with them. Sessions saved flat in the
+    output directory before the sharded layout are left alone.
+
+    Args:
+        output_dir: Output directory (defaults to outputs/ in project root)
+        max_age_days: Remove runs from days before this many days ago
+            (defaults to OUTPUT_RETENTION_DAYS; None or 0 keeps every run)
+        staging_max_age: Seconds after which an unfinished staging directory counts as abandoned
+        min_blob_age: Seconds a blob must have existed before it can be removed
+
+    Returns:
+        Dict with the number of runs, day directories and staging directories
+        removed, staging directories recovered as incomplete runs, plus the
+        blob store's removed / kept / bytes_freed counts
+    """
+    root = _output_root(output_dir)
+    max_age_days = OUTPUT_RETENTION_DAYS if max_age_days is None else max_age_days
+    stats = {"runs": 0, "days": 0, "staging": 0, "recovered": 0}
+
+    # Staging directories of runs that never finished (crashed or killed processes); handled first so
+    # recovered runs are subject to the same retention as the rest
+    staging_cutoff = time.time() - staging_max_age
+    staging_dir = root / STAGING_DIR
+    for entry in sorted(staging_dir.iterdir()) if staging_dir.is_dir() else []:
+        try:
+            if entry.stat().st_mtime >= staging_cutoff:
+                continue
+            if _recover_staging(root, entry) is not None:
+                stats["recovered"] += 1
+            else:
+                shutil.rmtree(entry)
+                stats["staging"] += 1
+        except OSError as e:
+            logger.error("Error cleaning up staging directory", directory=str(entry), error=str(e))
+
+    runs_dir = root / RUNS_DIR
+    if max_age_days and runs_dir.is_dir():
+        # Zero-padded YYYY/MM/DD paths sort like the dates they name
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime("%Y/%m/%d")
+        removed: List[Path] = []
+        for day in sorted(runs_dir.glob("*/*/*")):
+            name = day.relative_to(runs_dir).as_posix()
+            if not _DAY.match(name) or name >= cutoff:
+                continue
+            runs = list(day.glob("*/*"))
+            try:
+                shutil.rmtree(day)
+            except OSError as e:
+                logger.error("Error removing old runs", directory=str(day), error=str(e))
+                continue
+            removed += runs
+            stats["days"] += 1
+        # Drop month and year directories left empty
+        for directory in sorted(runs_dir.glob("*/*"), reverse=True) + sorted(runs_dir.glob("*"), reverse=True):
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+        stats["runs"] = len(removed)
+        if removed and OUTPUT_CATALOG:
+            try:
+                get_output_catalog(root).remove(*removed)
+            except Exception as e:
+                logger.error("Error updating output catalog", error=str(e))
 
+    stats.update(collect_output_garbage(root, min_blob_age))
+    logger.info("Applied output retention", output_dir=str(root), **stats)
+    return stats
@@ -0,0 +1,60 @@
+"""
+Markdown Table Rendering
+Renders pandas DataFrames as GitHub-flavoured markdown tables without extra dependencies
+"""
+from typing import Callable, List, Optional, Union
+import numbers
+import pandas as pd
+
+Formatter = Union[str, Callable[[float], str]]
+
+
+def _format_cell(value, float_format: Optional[Formatter]) -> str:
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    if float_format is not None and isinstance(value, numbers.Real) and not isinstance(value, (bool, numbers.Integral)):
+        text = float_format(value) if callable(float_format) else format(value, float_format)
+    else:
+        text = str(value)
+    # Pipes would split the cell and newlines would end the row
+    return text.replace("|", "\\|").replace("\n", " ")
+
+
+def _format_column(column: pd.Series, float_format: Optional[Formatter]) -> List[str]:
+    """Every cell of one column, formatted as ``_format_cell`` would"""
+    values = column.tolist()
+    if float_format is None or not pd.api.types.is_float_dtype(column):
+        return [_format_cell(value, float_format) for value in values]
+    # Plain float column: skip the per-cell type checks
+    fmt = float_format if callable(float_format) else lambda value: format(value, float_format)
+    return ["" if value != value else fmt(value).replace("|", "\\|").replace("\n", " ") for value in values]
+
+
+def dataframe_to_markdown(df: pd.DataFrame, float_format: Optional[Formatter] = ",.2f", index: bool = True) -> str:
+    """
+    Render a DataFrame as a markdown table
+
+    ``DataFrame.to_markdown`` needs the optional ``tabulate`` package; this
+    covers what the output files need. Numeric columns are right-aligned.
+
+    Args:
+        df: Table to render
+        float_format: Format spec (e.g. ",.0f") or callable for float cells
+        index: Include the index as the first column
+
+    Returns:
+        Markdown table text ending in a newline
+    """
+    frame = df.reset_index() if index else df
+    if index and df.index.name is None and "index" in frame.columns:
+        frame = frame.rename(columns={"index": ""})
+
+    headers = [str(c) for c in frame.columns]
+    numeric = [pd.api.types.is_numeric_dtype(frame[c]) and not pd.api.types.is_bool_dtype(frame[c]) for c in frame.columns]
+    align = ["---:" if is_numeric else "---" for is_numeric in numeric]
+
+    lines = ["| " + " | ".join(headers) + " |", "|" + "|".join(align) + "|"]
+    # Column by column: one tolist() per column instead of a tuple per row
+    columns = [_format_column(frame.iloc[:, i], float_format) for i in range(frame.shape[1])]
+    lines.extend("| " + " | ".join(row) + " |" for row in zip(*columns))
+    return "\n".join(lines) + "\n"
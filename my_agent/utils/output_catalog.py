@@ -0,0 +1,295 @@
+"""
+Output Catalog
+SQLite index of every saved session and its artifacts, queryable by intent, domain, keywords, date and market size
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+import json
+import os
+import sqlite3
+import threading
+import time
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+CATALOG_FILE = "catalog.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id             INTEGER PRIMARY KEY,
+    location       TEXT NOT NULL UNIQUE,
+    session_id     TEXT NOT NULL,
+    intent         TEXT,
+    domain         TEXT COLLATE NOCASE,
+    user_input     TEXT,
+    status         TEXT,
+    created_at     REAL NOT NULL,
+    updated_at     REAL NOT NULL,
+    bundle         TEXT,
+    tam_usd        REAL,
+    sam_usd        REAL,
+    som_year_1_usd REAL,
+    som_year_3_usd REAL,
+    som_year_5_usd REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_domain ON sessions (domain, intent, created_at);
+CREATE INDEX IF NOT EXISTS sessions_intent ON sessions (intent, created_at);
+CREATE INDEX IF NOT EXISTS sessions_created ON sessions (created_at);
+CREATE INDEX IF NOT EXISTS sessions_tam ON sessions (tam_usd);
+CREATE INDEX IF NOT EXISTS sessions_session_id ON sessions (session_id);
+
+-- created_at is repeated here so keyword + date range queries stay on one index
+CREATE TABLE IF NOT EXISTS keywords (
+    keyword    TEXT NOT NULL COLLATE NOCASE,
+    created_at REAL NOT NULL,
+    session    INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    PRIMARY KEY (keyword, created_at, session)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS keywords_session ON keywords (session);
+
+CREATE TABLE IF NOT EXISTS artifacts (
+    session    INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    path       TEXT NOT NULL,
+    kind       TEXT,
+    size       INTEGER,
+    sha256     TEXT,
+    PRIMARY KEY (session, path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS artifacts_kind ON artifacts (kind);
+CREATE INDEX IF NOT EXISTS artifacts_sha256 ON artifacts (sha256);
+"""
+
+_METRICS = ("tam_usd", "sam_usd", "som_year_1_usd", "som_year_3_usd", "som_year_5_usd")
+_SESSION_COLUMNS = ("id", "location", "session_id", "intent", "domain", "user_input", "status",
+                    "created_at", "updated_at", "bundle") + _METRICS
+
+# One artifact: (kind or None, path relative to the session, size in bytes, sha256 or None)
+ArtifactRecord = Tuple[Optional[str], str, Optional[int], Optional[str]]
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None and value != "" else None
+    except (TypeError, ValueError):
+        return None
+
+
+def session_metrics(results: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """TAM / SAM / SOM in USD from a results dict (None where the run has no estimate)"""
+    market = results.get("market_size")
+    if not isinstance(market, dict):
+        return dict.fromkeys(_METRICS)
+    sections = {key: market.get(key) if isinstance(market.get(key), dict) else {} for key in ("tam", "sam", "som")}
+    return {
+        "tam_usd": _number(sections["tam"].get("value_usd")),
+        "sam_usd": _number(sections["sam"].get("value_usd")),
+        "som_year_1_usd": _number(sections["som"].get("year_1_usd")),
+        "som_year_3_usd": _number(sections["som"].get("year_3_usd")),
+        "som_year_5_usd": _number(sections["som"].get("year_5_usd")),
+    }
+
+
+def _timestamp(value: Union[None, float, datetime]) -> Optional[float]:
+    return value.timestamp() if isinstance(value, datetime) else value
+
+
+class OutputCatalog:
+    """
+    One row per saved session, plus its keywords and artifacts, in a local SQLite file
+
+    ``record`` upserts a session by its location (session directory or
+    bundle path), so saving the same run again refreshes its row instead of
+    adding one. Queries run on indexes over (domain, intent, created_at),
+    (intent, created_at), created_at, tam_usd and keyword, so filtered lookups
+    stay in the milliseconds with hundreds of thousands of sessions. WAL mode
+    and a busy timeout let several processes save into the same catalog.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            logger.info("Output catalog opened", path=str(self.path))
+        return self._conn
+
+    def record(self, location: Union[str, Path], session_id: str, results: Dict[str, Any],
+               artifacts: Iterable[ArtifactRecord] = (), bundle: Optional[str] = None,
+               created_at: Optional[float] = None) -> int:
+        """
+        Insert or refresh one session and replace its keyword and artifact rows
+
+        Args:
+            location: Session directory or bundle file
+            session_id: Session ID the run was saved under
+            results: The results dictionary from orchestrator.process()
+            artifacts: (kind, relative path, size, sha256) for each file in the session
+            bundle: Bundle format ("zip" / "tar.zst") if the session is a single file
+            created_at: Unix time of the run (defaults to now; kept on later updates)
+
+        Returns:
+            Row ID of the session
+        """
+        now = time.time()
+        row = {
+            "location": str(location),
+            "session_id": session_id,
+            "intent": results.get("intent"),
+            "domain": results.get("domain"),
+            "user_input": results.get("user_input"),
+            "status": results.get("status"),
+            "created_at": created_at or now,
+            "updated_at": now,
+            "bundle": bundle,
+            **session_metrics(results),
+        }
+        keywords = results.get("keywords") or []
+        keywords = {str(keyword).strip() for keyword in keywords if str(keyword).strip()} if isinstance(keywords, list) else set()
+        columns = ", ".join(row)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in row if column not in ("location", "created_at"))
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                session, created = conn.execute(
+                    f"INSERT INTO sessions ({columns}) VALUES ({', '.join('?' * len(row))}) "
+                    f"ON CONFLICT (location) DO UPDATE SET {updates} RETURNING id, created_at",
+                    tuple(row.values()),
+                ).fetchone()
+                conn.execute("DELETE FROM keywords WHERE session = ?", (session,))
+                conn.executemany("INSERT OR IGNORE INTO keywords (keyword, created_at, session) VALUES (?, ?, ?)",
+                                 [(keyword, created, session) for keyword in keywords])
+                conn.execute("DELETE FROM artifacts WHERE session = ?", (session,))
+                conn.executemany("INSERT OR REPLACE INTO artifacts (session, kind, path, size, sha256) VALUES (?, ?, ?, ?, ?)",
+                                 [(session, kind, path, size, digest) for kind, path, size, digest in artifacts])
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        logger.debug("Session cataloged", location=str(location), session=session)
+        return session
+
+    def find(self, domain: Optional[str] = None, intent: Optional[str] = None, keyword: Optional[str] = None,
+             since: Union[None, float, datetime] = None, until: Union[None, float, datetime] = None,
+             min_tam: Optional[float] = None, max_tam: Optional[float] = None,
+             session_id: Optional[str] = None, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """
+        Sessions matching every given filter, newest first
+
+        Example: ``find(domain="FinTech", intent="new_app_idea", since=datetime.now() - timedelta(days=7), min_tam=1e9)``
+
+        Args:
+            domain: Domain, case-insensitive
+            intent: "new_app_idea" or "feature_extension"
+            keyword: One of the run's keywords, case-insensitive
+            since: Created at or after (datetime or Unix time)
+            until: Created before (datetime or Unix time)
+            min_tam: TAM in USD at least this
+            max_tam: TAM in USD at most this
+            session_id: Session ID the run was saved under
+            limit: Maximum number of rows (None for all)
+
+        Returns:
+            Session rows as dicts (location, session_id, intent, domain, user_input,
+            status, created_at, updated_at, bundle and the market metrics)
+        """
+        clauses, params = [], []
+        dates = [(clause, value) for clause, value in (("created_at >= ?", _timestamp(since)),
+                                                        ("created_at < ?", _timestamp(until))) if value is not None]
+        if keyword is not None:
+            clauses.append("id IN (SELECT session FROM keywords WHERE "
+                           + " AND ".join(["keyword = ?"] + [clause for clause, _ in dates]) + ")")
+            params += [keyword] + [value for _, value in dates]
+        for clause, value in [("domain = ?", domain), ("intent = ?", intent), ("session_id = ?", session_id)] + dates + [
+                ("tam_usd >= ?", min_tam), ("tam_usd <= ?", max_tam)]:
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        sql = f"SELECT {', '.join(_SESSION_COLUMNS)} FROM sessions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        # With any filter besides dates, "+created_at" keeps the planner from walking the whole date
+        # index just to skip a sort: the matches come from the most selective index and are sorted
+        sql += " ORDER BY +created_at DESC" if len(clauses) > len(dates) else " ORDER BY created_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self._connect().execute(sql, params)]
+
+    def artifacts(self, session: int, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Artifact rows (kind, path, size, sha256) of one session, by row ID"""
+        sql = "SELECT kind, path, size, sha256 FROM artifacts WHERE session = ?"
+        params: List[Any] = [session]
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        with self._lock:
+            return [dict(row) for row in self._connect().execute(sql + " ORDER BY path", params)]
+
+    def keywords(self, session: int) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._connect().execute(
+                "SELECT keyword FROM keywords WHERE session = ? ORDER BY keyword", (session,))]
+
+    def remove(self, *locations: Union[str, Path]) -> int:
+        """Drop sessions (and their keyword and artifact rows) by location; returns how many were cataloged"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = conn.executemany("DELETE FROM sessions WHERE location = ?",
+                                          [(str(location),) for location in locations])
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def scan_artifacts(session_dir: Path, kinds: Optional[Dict[str, str]] = None) -> List[ArtifactRecord]:
+    """
+    Artifact records for every file under a session directory (used when backfilling old sessions)
+
+    Args:
+        session_dir: Session directory
+        kinds: Optional relative path -> output type, e.g. from the session's saved files
+
+    Returns:
+        (kind, relative path, size, sha256) tuples; sha256 comes from manifest.json when present
+    """
+    digests: Dict[str, str] = {}
+    try:
+        with open(session_dir / "manifest.json", encoding="utf-8") as f:
+            digests = {path: entry.get("sha256") for path, entry in json.load(f).get("files", {}).items()}
+    except (OSError, ValueError):
+        pass
+    records = []
+    for dirpath, _, filenames in os.walk(session_dir):
+        for name in filenames:
+            path = Path(dirpath) / name
+            relative = path.relative_to(session_dir).as_posix()
+            records.append(((kinds or {}).get(relative), relative, path.stat().st_size, digests.get(relative)))
+    return sorted(records, key=lambda record: record[1])
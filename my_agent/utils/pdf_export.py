@@ -0,0 +1,341 @@
+"""
+PDF Export
+Renders pitch decks (Marp markdown, one slide per page) and concept papers to PDF with reportlab
+
+Rendering is CPU-bound pure Python, so it runs on a process pool: batch runs
+use every core, and neither the orchestrator's event loop nor the output
+writer threads do the layout work themselves.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional
+import functools
+import io
+import multiprocessing
+import os
+import re
+import threading
+import structlog
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import (HRFlowable, KeepInFrame, ListFlowable, ListItem, PageBreak, Paragraph,
+                                    Preformatted, SimpleDocTemplate, Spacer, Table, TableStyle)
+except ImportError:  # optional dependency
+    colors = None
+
+logger = structlog.get_logger(__name__)
+
+PDF_KINDS = ("slides", "document")
+
+# 16:9 slide pages
+SLIDE_SIZE = (10 * 72.0, 5.625 * 72.0)
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_BULLET = re.compile(r"^(\s*)(?:[-*+•])\s+(.*)$")
+_NUMBERED = re.compile(r"^(\s*)\d+[.)]\s+(.*)$")
+_RULE = re.compile(r"^\s*(?:-{3,}|\*{3,}|_{3,})\s*$")
+_TABLE_DIVIDER = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(?:\|\s*:?-{3,}:?\s*)*\|?\s*$")
+_FRONT_MATTER_KEY = re.compile(r"^[A-Za-z_][\w-]*\s*:")
+_INLINE = [
+    (re.compile(r"`([^`]+)`"), r'<font face="Courier">\1</font>'),
+    (re.compile(r"\*\*(.+?)\*\*|__(.+?)__"), lambda m: f"<b>{m.group(1) or m.group(2)}</b>"),
+    (re.compile(r"(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])|(?<![\w_])_(?!\s)(.+?)(?<!\s)_(?![\w_])"),
+     lambda m: f"<i>{m.group(1) or m.group(2)}</i>"),
+    (re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)"), r'<link href="\2" color="blue">\1</link>'),
+]
+
+
+def _inline(text: str) -> str:
+    """Markdown inline markup -> reportlab paragraph markup"""
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    for pattern, replacement in _INLINE:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _styles(slides: bool) -> Dict[str, Any]:
+    sheet = getSampleStyleSheet()
+    scale = 1.25 if slides else 1.0
+    styles = {
+        "body": ParagraphStyle("MapisBody", parent=sheet["BodyText"], fontSize=10.5 * scale, leading=14 * scale,
+                               spaceAfter=5 * scale),
+        "code": ParagraphStyle("MapisCode", parent=sheet["Code"], fontSize=8.5 * scale, leading=10.5 * scale,
+                               backColor=colors.HexColor("#f4f4f4"), borderPadding=4),
+        "quote": ParagraphStyle("MapisQuote", parent=sheet["BodyText"], fontSize=10.5 * scale, leading=14 * scale,
+                                leftIndent=14, textColor=colors.HexColor("#555555"), fontName="Helvetica-Oblique"),
+        "cell": ParagraphStyle("MapisCell", parent=sheet["BodyText"], fontSize=8.5 * scale, leading=10.5 * scale),
+    }
+    sizes = (26, 20, 16, 13, 11.5, 10.5) if slides else (20, 16, 13.5, 12, 11, 10.5)
+    for level, size in enumerate(sizes, start=1):
+        styles[f"h{level}"] = ParagraphStyle(f"MapisH{level}", parent=sheet["Heading1"], fontSize=size,
+                                             leading=size * 1.25, spaceBefore=size * 0.5, spaceAfter=size * 0.35,
+                                             textColor=colors.HexColor("#1f3a5f"))
+    return styles
+
+
+def _list(items: List[str], numbered: bool, style: ParagraphStyle) -> ListFlowable:
+    return ListFlowable([ListItem(Paragraph(_inline(item), style), leftIndent=14) for item in items],
+                        bulletType="1" if numbered else "bullet", start=None if numbered else "•",
+                        leftIndent=14, bulletFontSize=style.fontSize * 0.8)
+
+
+def _table(rows: List[List[str]], style: ParagraphStyle, width: float) -> Table:
+    columns = max(len(row) for row in rows)
+    cells = [[Paragraph(_inline(cell), style) for cell in row + [""] * (columns - len(row))] for row in rows]
+    table = Table(cells, colWidths=[width / columns] * columns, repeatRows=1)
+    table.setStyle(TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#bbbbbb")),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#e8eef5")),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ]))
+    return table
+
+
+def _split_row(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def _flowables(markdown: str, styles: Dict[str, Any], width: float) -> List[Any]:
+    """Block-level markdown (headings, lists, tables, code, quotes, rules, paragraphs) as flowables"""
+    story: List[Any] = []
+    paragraph: List[str] = []
+    items: List[str] = []
+    numbered = False
+    lines = markdown.splitlines()
+
+    def flush():
+        nonlocal items
+        if paragraph:
+            story.append(Paragraph(_inline(" ".join(paragraph)), styles["body"]))
+            paragraph.clear()
+        if items:
+            story.append(_list(items, numbered, styles["body"]))
+            items = []
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            flush()
+            code = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith("```"):
+                code.append(lines[i])
+                i += 1
+            story.append(Preformatted("\n".join(code), styles["code"]))
+            story.append(Spacer(1, 6))
+        elif not stripped:
+            flush()
+        elif _HEADING.match(stripped):
+            flush()
+            hashes, text = _HEADING.match(stripped).groups()
+            story.append(Paragraph(_inline(text), styles[f"h{len(hashes)}"]))
+        elif _RULE.match(stripped):
+            flush()
+            story.append(HRFlowable(width="100%", color=colors.HexColor("#cccccc"), spaceBefore=4, spaceAfter=4))
+        elif stripped.startswith("|") and i + 1 < len(lines) and _TABLE_DIVIDER.match(lines[i + 1]):
+            flush()
+            rows = [_split_row(line)]
+            i += 2
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                rows.append(_split_row(lines[i]))
+                i += 1
+            story.append(_table(rows, styles["cell"], width))
+            story.append(Spacer(1, 6))
+            continue
+        elif stripped.startswith(">"):
+            flush()
+            story.append(Paragraph(_inline(stripped.lstrip("> ")), styles["quote"]))
+        elif _BULLET.match(line) or _NUMBERED.match(line):
+            match = _BULLET.match(line)
+            is_numbered = match is None
+            text = (match or _NUMBERED.match(line)).group(2)
+            if paragraph or (items and is_numbered != numbered):
+                flush()
+            numbered = is_numbered
+            items.append(text)
+        elif items and line[:1].isspace():
+            # Continuation of the previous list item
+            items[-1] += " " + stripped
+        else:
+            if items:
+                flush()
+            paragraph.append(stripped)
+        i += 1
+    flush()
+    return story
+
+
+def split_slides(markdown: str) -> List[str]:
+    """
+    Marp slides: the deck split on ``---`` lines, without the front matter
+
+    Args:
+        markdown: Pitch deck in Marp markdown
+
+    Returns:
+        Markdown of each non-empty slide
+    """
+    lines = markdown.strip().splitlines()
+    # Front matter: a leading --- block of "key: value" lines (marp: true, theme: ...)
+    if lines and lines[0].strip() == "---":
+        for end in range(1, len(lines)):
+            if lines[end].strip() == "---":
+                if all(_FRONT_MATTER_KEY.match(line) or not line.strip() for line in lines[1:end]):
+                    lines = lines[end + 1:]
+                break
+    slides, current, fenced = [], [], False
+    for line in lines:
+        if line.strip().startswith("```"):
+            fenced = not fenced
+        if not fenced and line.strip() == "---":
+            slides.append("\n".join(current))
+            current = []
+        else:
+            current.append(line)
+    slides.append("\n".join(current))
+    return [slide for slide in slides if slide.strip()]
+
+
+def render_pdf(kind: str, markdown: str, title: str = "") -> bytes:
+    """
+    Render markdown to PDF bytes (runs in the worker processes)
+
+    Args:
+        kind: "slides" for a Marp pitch deck (one 16:9 page per slide, shrunk to fit),
+            "document" for a flowing A4 document such as a concept paper
+        markdown: Source text
+        title: PDF title metadata
+
+    Returns:
+        The PDF file contents
+    """
+    if colors is None:
+        raise RuntimeError("PDF export needs reportlab (pip install reportlab)")
+    if kind not in PDF_KINDS:
+        raise ValueError(f"Unsupported PDF kind: {kind}")
+    buffer = io.BytesIO()
+    slides = kind == "slides"
+    styles = _styles(slides)
+    margin = 0.45 * inch if slides else 0.8 * inch
+    # invariant: no timestamps or random IDs, so identical input gives identical bytes (and one stored blob)
+    doc = SimpleDocTemplate(buffer, pagesize=SLIDE_SIZE if slides else A4, title=title, author="MAPIS",
+                            leftMargin=margin, rightMargin=margin, topMargin=margin, bottomMargin=margin,
+                            invariant=1)
+    if slides:
+        story: List[Any] = []
+        for slide in split_slides(markdown):
+            story.append(KeepInFrame(doc.width, doc.height, _flowables(slide, styles, doc.width), mode="shrink"))
+            story.append(PageBreak())
+        story = story[:-1] or [Spacer(1, 1)]
+        doc.build(story)
+    else:
+        def page_number(canvas, document):
+            canvas.saveState()
+            canvas.setFont("Helvetica", 8)
+            canvas.drawRightString(A4[0] - margin, margin / 2, str(document.page))
+            canvas.restoreState()
+
+        doc.build(_flowables(markdown, styles, doc.width) or [Spacer(1, 1)],
+                  onFirstPage=page_number, onLaterPages=page_number)
+    return buffer.getvalue()
+
+
+class PDFExporter:
+    """
+    Renders PDFs on a shared process pool
+
+    The pool starts on first use. Where available it uses a fork server
+    that has already imported this module, so workers are not forked from a
+    multi-threaded process. Like any non-fork start method, each worker still
+    re-imports the main module, so scripts that export PDFs need an
+    ``if __name__ == "__main__":`` guard. Without one the worker re-running the
+    script cannot start processes of its own; that case is rendered in-process
+    instead of failing.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return colors is not None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                try:
+                    context = multiprocessing.get_context("forkserver")
+                    context.set_forkserver_preload([__name__])
+                except ValueError:  # no fork server on this platform
+                    context = multiprocessing.get_context()
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                logger.info("PDF export pool started", workers=self.workers)
+            return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor):
+        """Drop a broken pool (a worker died); the next submit starts a new one"""
+        with self._lock:
+            if self._pool is not pool:
+                return
+            self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        logger.warning("PDF export pool broken, restarting it on next use")
+
+    def _check_result(self, pool: ProcessPoolExecutor, future: Future):
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._discard(pool)
+
+    def submit(self, kind: str, markdown: str, title: str = "") -> Future:
+        """Start rendering in the background; the future resolves to the PDF bytes"""
+        pool = self._get_pool()
+        try:
+            future = pool.submit(render_pdf, kind, markdown, title)
+        except BrokenProcessPool:
+            # ProcessPoolExecutor never recovers once a worker has died, so retry once on a fresh pool
+            self._discard(pool)
+            pool = self._get_pool()
+            future = pool.submit(render_pdf, kind, markdown, title)
+        except RuntimeError as e:
+            # Starting a process while this one is still bootstrapping (a script without a main
+            # guard, re-run by a worker importing it) fails; drop the pool so its queues are released
+            self._release(pool)
+            logger.warning("PDF export pool unavailable, rendering in-process", error=str(e))
+            return self._render_in_process(kind, markdown, title)
+        future.add_done_callback(functools.partial(self._check_result, pool))
+        return future
+
+    def _release(self, pool: ProcessPoolExecutor):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _render_in_process(kind: str, markdown: str, title: str) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(render_pdf(kind, markdown, title))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def render(self, kind: str, markdown: str, title: str = "") -> bytes:
+        return self.submit(kind, markdown, title).result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+
+# Global instance (PDF_WORKERS caps the worker processes; defaults to one per core)
+pdf_exporter = PDFExporter(workers=int(os.getenv("PDF_WORKERS") or 0) or None)
@@ -0,0 +1,272 @@
+"""
+Results JSON
+Section-by-section writer and lazy reader for complete_results.json
+"""
+from pathlib import Path
+from collections import deque
+from typing import Dict, Any, Deque, Iterable, Iterator, List, Optional, Union
+import gzip
+import json
+import threading
+import zlib
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+INDEX_SUFFIX = ".index.json"
+GZIP_MAGIC = b"\x1f\x8b"
+# Encoder output is gathered into blocks of about this size before each write
+WRITE_BLOCK = 64 * 1024
+
+
+def index_path(path: Union[str, Path]) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+class ResultsWriter:
+    """
+    Streams a results dict to disk one top-level section (stage) at a time
+
+    Each section is encoded incrementally and appended as soon as it is
+    written, so no stage is ever held in memory as one JSON string and a
+    crash keeps the stages already done. The default layout is byte-for-byte what
+    ``json.dump(results, f, indent=2, default=str)`` produces; ``compact``
+    drops the whitespace. With ``compress`` every section is its own gzip
+    member (the file is still a normal .gz). A sidecar index gets one JSON
+    line per section with its byte range, so ``ResultsReader`` can load one
+    stage without touching the rest, even from a file that was never closed.
+
+    Writing a key twice appends it again; readers see the last value.
+    """
+
+    def __init__(self, path: Union[str, Path], compact: bool = False, compress: bool = False):
+        self.path = Path(path)
+        self.compact = compact
+        self.compress = compress
+        self._file = open(self.path, "wb")
+        if compact:
+            self._encoder = json.JSONEncoder(separators=(",", ":"), default=str)
+            self._tail = "}"
+        else:
+            self._encoder = json.JSONEncoder(indent=2, default=str)
+            self._tail = "\n}"
+        self._index = open(index_path(self.path), "w", encoding="utf-8")
+        self._add_index_line({"compact": compact, "gzip": compress})
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self) -> "ResultsWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_section(self, key: str, value: Any):
+        """Encode and append one top-level key"""
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"ResultsWriter for {self.path} is closed")
+            first = self._file.tell() == 0
+            head = ("{" if first else ",") + json.dumps(str(key)) + ":"
+            if not self.compact:
+                head = head[0] + "\n  " + head[1:] + " "
+            offset, length = self._append(self._chunks(key, value, first))
+            self._add_index_line({"key": str(key), "offset": offset, "length": length,
+                                  "value_offset": len(head.encode("utf-8"))})
+
+    def _chunks(self, key: str, value: Any, first: bool) -> Iterator[str]:
+        """
+        The section's text: ``{key: value}`` encoded as a one-key object
+
+        The encoder nests the value one level in, exactly as inside the
+        top-level object; only the object's closing brace is held back, and
+        its opening brace becomes a comma after the first section.
+        """
+        chunks = self._encoder.iterencode({str(key): value})
+        opening = next(chunks)
+        yield opening if first else "," + opening[1:]
+        # Hold back just enough trailing text to drop the closing brace
+        held: Deque[str] = deque()
+        held_size = 0
+        for chunk in chunks:
+            held.append(chunk)
+            held_size += len(chunk)
+            while held_size - len(held[0]) >= len(self._tail):
+                held_size -= len(held[0])
+                yield held.popleft()
+        yield "".join(held)[:-len(self._tail)]
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._file.tell() == 0:
+                tail = "{}"
+            else:
+                tail = self._tail
+            self._append([tail])
+            self._file.close()
+            self._add_index_line({"complete": True})
+            self._index.close()
+
+    def _append(self, chunks: Iterable[str]):
+        """
+        Write text as one chunk (one gzip member when compressing); returns its byte range
+
+        Small pieces are gathered into blocks of about WRITE_BLOCK characters;
+        long strings (LLM transcripts) are written in slices of that size
+        rather than copied into a block and encoded whole.
+        """
+        offset = self._file.tell()
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if self.compress else None
+
+        def write(text: str):
+            data = text.encode("utf-8")
+            self._file.write(compressor.compress(data) if compressor else data)
+
+        block: List[str] = []
+        size = 0
+        for chunk in chunks:
+            if len(chunk) >= WRITE_BLOCK:
+                if block:
+                    write("".join(block))
+                    block, size = [], 0
+                for start in range(0, len(chunk), WRITE_BLOCK):
+                    write(chunk[start:start + WRITE_BLOCK])
+                continue
+            block.append(chunk)
+            size += len(chunk)
+            if size >= WRITE_BLOCK:
+                write("".join(block))
+                block, size = [], 0
+        if block:
+            write("".join(block))
+        if compressor:
+            self._file.write(compressor.flush())
+        self._file.flush()
+        return offset, self._file.tell() - offset
+
+    def _add_index_line(self, entry: Dict[str, Any]):
+        self._index.write(json.dumps(entry) + "\n")
+        self._index.flush()
+
+
+def write_results_json(results: Dict[str, Any], path: Union[str, Path], compact: bool = False, compress: bool = False) -> Path:
+    """
+    Write a whole results dict with ``ResultsWriter``
+
+    Args:
+        results: The results dictionary from orchestrator.process()
+        path: Output file (conventionally ending .json, or .json.gz when compressing)
+        compact: Omit indentation and spaces
+        compress: Gzip each section
+
+    Returns:
+        The path written
+    """
+    with ResultsWriter(path, compact=compact, compress=compress) as writer:
+        for key, value in results.items():
+            writer.write_section(key, value)
+    return Path(path)
+
+
+def _parse_index(text: str) -> Dict[str, Any]:
+    """
+    Index lines as one dict: compact, gzip, complete and the byte range of each section
+
+    A torn last line (the writer was killed mid-write) is ignored. Indexes
+    written as a single JSON object by earlier versions are returned as is.
+    """
+    lines = text.splitlines()
+    if not lines:
+        raise ValueError("Empty results index")
+    header = json.loads(lines[0])
+    if "sections" in header:
+        return header
+    index = {"compact": header.get("compact", False), "gzip": header.get("gzip", False),
+             "complete": False, "sections": {}}
+    for line in lines[1:]:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            break
+        if entry.get("complete"):
+            index["complete"] = True
+        else:
+            index["sections"][entry.pop("key")] = entry
+    return index
+
+
+class ResultsReader:
+    """
+    Reads results JSON written by ``ResultsWriter``, one section at a time if wanted
+
+    With the sidecar index, ``load`` reads and parses only the bytes of the
+    requested section, and ``load_all`` also recovers the finished stages of a
+    run that stopped before the file was closed. Without an index (e.g. files
+    from older runs) it falls back to parsing the whole file once.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._index: Optional[Dict[str, Any]] = None
+        self._full: Optional[Dict[str, Any]] = None
+        try:
+            with open(index_path(self.path), encoding="utf-8") as f:
+                self._index = _parse_index(f.read())
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable results index", path=str(self.path), error=str(e))
+
+    @property
+    def indexed(self) -> bool:
+        return self._index is not None
+
+    def sections(self) -> List[str]:
+        if self._index is not None:
+            return list(self._index["sections"])
+        return list(self._load_full())
+
+    def load(self, key: str) -> Any:
+        """
+        One top-level section
+
+        Raises:
+            KeyError: If the section is not in the file
+        """
+        if self._index is None:
+            return self._load_full()[key]
+        entry = self._index["sections"][key]
+        with open(self.path, "rb") as f:
+            f.seek(entry["offset"])
+            chunk = f.read(entry["length"])
+        if self._index.get("gzip"):
+            chunk = gzip.decompress(chunk)
+        return json.loads(chunk[entry["value_offset"]:])
+
+    def load_all(self) -> Dict[str, Any]:
+        if self._index is None:
+            return dict(self._load_full())
+        return {key: self.load(key) for key in self.sections()}
+
+    def _load_full(self) -> Dict[str, Any]:
+        if self._full is None:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            if data[:2] == GZIP_MAGIC:
+                data = gzip.decompress(data)
+            self._full = json.loads(data)
+        return self._full
+
+
+def load_section(path: Union[str, Path], key: str) -> Any:
+    """Load a single stage (e.g. "market_size") from a results file"""
+    return ResultsReader(path).load(key)
+
+
+def load_results(path: Union[str, Path]) -> Dict[str, Any]:
+    """Load every stage from a results file"""
+    return ResultsReader(path).load_all()
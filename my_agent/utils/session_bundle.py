@@ -0,0 +1,197 @@
+"""
+Session Bundles
+Single-file compressed export of a session's outputs, with random access to each artifact
+
+Formats:
+    zip      deflate per member; the zip central directory is the index
+    tar.zst  one zstd frame per tar member (a plain .tar.zst for tar/zstd),
+             followed by a skippable frame holding a JSON index and the
+             trailer u32 index length + b"MAPIBDX1"
+"""
+from pathlib import Path
+from typing import Dict, Any, List, Union
+import json
+import os
+import struct
+import tarfile
+import threading
+import time
+import zipfile
+import structlog
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+logger = structlog.get_logger(__name__)
+
+BUNDLE_FORMATS = ("zip", "tar.zst")
+INDEX_MAGIC = b"MAPIBDX1"
+
+_ZIP_MAGIC = b"PK\x03\x04"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_SKIPPABLE = struct.Struct("<II")
+_SKIPPABLE_MAGIC = 0x184D2A50
+_TRAILER = struct.Struct("<I8s")
+
+
+class BundleError(Exception):
+    """Raised when a bundle is missing, truncated or malformed"""
+
+
+def bundle_suffix(fmt: str) -> str:
+    return "." + fmt
+
+
+class BundleWriter:
+    """
+    Writes artifacts into one compressed file in a single sequential pass
+
+    The bundle is written under a temporary name and renamed into place on
+    ``close``, so readers never see half a bundle. ``tar.zst`` needs the
+    optional zstandard package and falls back to zip without it.
+    """
+
+    def __init__(self, path: Union[str, Path], fmt: str = "zip", level: int = 6):
+        if fmt not in BUNDLE_FORMATS:
+            raise ValueError(f"Unsupported bundle format: {fmt}")
+        if fmt == "tar.zst" and zstandard is None:
+            logger.warning("zstandard not installed, writing a zip bundle instead")
+            fmt = "zip"
+            path = Path(str(path)[:-len(".tar.zst")] + ".zip") if str(path).endswith(".tar.zst") else path
+        self.path = Path(path)
+        self.format = fmt
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        self._file = open(self._tmp, "wb")
+        self._mtime = time.time()
+        if fmt == "zip":
+            self._zip = zipfile.ZipFile(self._file, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=level)
+        else:
+            self._zstd = zstandard.ZstdCompressor(level=level)
+            self._index: Dict[str, Dict[str, int]] = {}
+        self._closed = False
+
+    def __enter__(self) -> "BundleWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add(self, name: str, data: Union[str, bytes]):
+        """Append one artifact under a relative name such as ``wireframes_svg/Home.svg``"""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if self.format == "zip":
+            info = zipfile.ZipInfo(name, time.localtime(self._mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            self._zip.writestr(info, data)
+            return
+
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(self._mtime)
+        info.mode = 0o644
+        header = info.tobuf(format=tarfile.PAX_FORMAT)
+        padding = b"\0" * (-len(data) % tarfile.BLOCKSIZE)
+        offset = self._file.tell()
+        self._file.write(self._zstd.compress(header + data + padding))
+        self._index[name] = {"offset": offset, "length": self._file.tell() - offset,
+                             "data_offset": len(header), "size": len(data)}
+
+    def close(self) -> Path:
+        if self._closed:
+            return self.path
+        self._closed = True
+        if self.format == "zip":
+            self._zip.close()
+        else:
+            # End-of-archive blocks, then the index where zstd and tar both skip it
+            self._file.write(self._zstd.compress(b"\0" * (2 * tarfile.BLOCKSIZE)))
+            index = json.dumps(self._index, separators=(",", ":")).encode("utf-8")
+            payload = index + _TRAILER.pack(len(index), INDEX_MAGIC)
+            self._file.write(_SKIPPABLE.pack(_SKIPPABLE_MAGIC, len(payload)) + payload)
+        self._file.close()
+        os.replace(self._tmp, self.path)
+        return self.path
+
+    def abort(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._file.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+class BundleReader:
+    """Lists and extracts single artifacts from a bundle without unpacking the rest"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as f:
+                magic = f.read(4)
+        except FileNotFoundError:
+            raise BundleError(f"Bundle not found: {self.path}")
+        if magic == _ZIP_MAGIC:
+            self.format = "zip"
+            try:
+                with zipfile.ZipFile(self.path) as bundle:
+                    self._index: Any = bundle.namelist()
+            except zipfile.BadZipFile as e:
+                raise BundleError(f"Unreadable bundle {self.path}: {e}")
+        elif magic == _ZSTD_MAGIC:
+            self.format = "tar.zst"
+            self._index = self._read_zst_index()
+        else:
+            raise BundleError(f"Not a session bundle: {self.path}")
+
+    def _read_zst_index(self) -> Dict[str, Dict[str, int]]:
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size < _TRAILER.size:
+                raise BundleError(f"Truncated bundle: {self.path}")
+            f.seek(size - _TRAILER.size)
+            length, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if magic != INDEX_MAGIC or length > size - _TRAILER.size:
+                raise BundleError(f"Bundle has no index: {self.path}")
+            f.seek(size - _TRAILER.size - length)
+            return json.loads(f.read(length))
+
+    def names(self) -> List[str]:
+        return list(self._index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def read(self, name: str) -> bytes:
+        """
+        One artifact's bytes
+
+        Raises:
+            KeyError: If the bundle has no such artifact
+        """
+        if self.format == "zip":
+            with zipfile.ZipFile(self.path) as bundle:
+                return bundle.read(name)
+        entry = self._index[name]
+        if zstandard is None:
+            raise BundleError("Bundle uses zstd compression but zstandard is not installed")
+        with open(self.path, "rb") as f:
+            f.seek(entry["offset"])
+            frame = zstandard.ZstdDecompressor().decompress(f.read(entry["length"]))
+        return frame[entry["data_offset"]:entry["data_offset"] + entry["size"]]
+
+    def read_text(self, name: str) -> str:
+        return self.read(name).decode("utf-8")
+
+
+def read_artifact(path: Union[str, Path], name: str) -> bytes:
+    """Pull a single artifact (e.g. "README.md") out of a bundle"""
+    return BundleReader(path).read(name)
@@ -0,0 +1,236 @@
+"""
+Output Templates
+Text templates for the output artifacts, compiled once into Python render functions
+
+Syntax (a small Jinja-like subset; expressions are plain Python):
+    {{ expr }}                 value of expr
+    {{ expr:spec }}            format(expr, spec), e.g. {{ tam["value_usd"]:,.0f }}
+    {% if expr %} {% elif expr %} {% else %} {% endif %}
+    {% for target in expr %} {% endfor %}
+    {% set name = expr %}
+    {# comment #}
+
+A line holding nothing but one block tag or comment is dropped entirely,
+newline included, so templates can be laid out one tag per line. A ``-``
+inside a tag's closing delimiter (``-}}``, ``-%}``, ``-#}``) also drops the
+whitespace that follows it.
+"""
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+import ast
+import builtins
+import os
+import re
+import threading
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_TEMPLATE_DIR = Path(__file__).parent.parent / "data" / "templates"
+
+# Standalone block tags (whole line) first, then any tag inline
+_TOKEN = re.compile(
+    r"^[ \t]*(?P<line>\{%(?:(?!%\}).)*%\}|\{#(?:(?!#\}).)*#\})[ \t]*(?:\n|\Z)"
+    r"|(?P<tag>\{\{(?:(?!\}\}).)*\}\}|\{%(?:(?!%\}).)*%\}|\{#(?:(?!#\}).)*#\})",
+    re.M | re.S)
+_OPENERS = {"(": ")", "[": "]", "{": "}"}
+
+
+class TemplateError(Exception):
+    """Raised when a template cannot be parsed or compiled"""
+
+
+def title(key: Any) -> str:
+    """``"market_gaps"`` -> ``"Market Gaps"``"""
+    return str(key).replace("_", " ").title()
+
+
+# Helpers every template can call, besides the builtins
+HELPERS: Dict[str, Any] = {"title": title}
+
+
+def _split_format_spec(expr: str) -> Tuple[str, Optional[str]]:
+    """Split ``value:spec`` on the last colon outside brackets and strings"""
+    depth = 0
+    quote = None
+    split = None
+    i = 0
+    while i < len(expr):
+        char = expr[i]
+        if quote:
+            if char == "\\":
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in _OPENERS:
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == ":" and depth == 0:
+            split = i
+        i += 1
+    if split is None:
+        return expr.strip(), None
+    return expr[:split].strip(), expr[split + 1:]
+
+
+class Template:
+    """
+    One template, compiled to a Python function on first render
+
+    The generated function collects every piece of output in a list and
+    joins it once, so rendering an artifact is a single pass with no
+    intermediate strings however many sections and loops it has.
+    """
+
+    def __init__(self, source: str, name: str = "<template>"):
+        self.source = source
+        self.name = name
+        self._render: Optional[Callable[[Dict[str, Any]], str]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _tokenize(source: str) -> List[Tuple[str, str]]:
+        """(kind, text) pairs; kind is "text", "expr", "block" or "comment" """
+        tokens: List[Tuple[str, str]] = []
+        pos = 0
+        strip_next = False
+        for match in _TOKEN.finditer(source):
+            text = source[pos:match.start()]
+            if strip_next:
+                text = text.lstrip()
+            if text:
+                tokens.append(("text", text))
+            tag = match.group("line") or match.group("tag")
+            inner = tag[2:-2]
+            strip_next = inner.endswith("-")
+            if strip_next:
+                inner = inner[:-1]
+            kind = {"{{": "expr", "{%": "block", "{#": "comment"}[tag[:2]]
+            if kind != "comment":
+                tokens.append((kind, inner.strip()))
+            pos = match.end()
+        text = source[pos:]
+        if strip_next:
+            text = text.lstrip()
+        if text:
+            tokens.append(("text", text))
+        return tokens
+
+    def _generate(self) -> Tuple[str, set]:
+        """Python source of the render function, and the names it reads from the context"""
+        body: List[str] = []
+        indent = 1
+        stack: List[str] = []
+        loaded, bound = set(), set()
+
+        def expression(src: str, mode: str = "eval") -> str:
+            try:
+                tree = ast.parse(src, mode=mode)
+            except SyntaxError as e:
+                raise TemplateError(f"{self.name}: invalid expression {src!r}: {e.msg}")
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Name):
+                    (loaded if isinstance(node.ctx, ast.Load) else bound).add(node.id)
+            return src
+
+        def emit(line: str):
+            body.append("    " * indent + line)
+
+        for kind, text in self._tokenize(self.source):
+            if kind == "text":
+                emit(f"_append({text!r})")
+            elif kind == "expr":
+                value, spec = _split_format_spec(text)
+                if spec is None:
+                    emit(f"_append(str({expression(value)}))")
+                else:
+                    emit(f"_append(format({expression(value)}, {spec!r}))")
+            else:
+                keyword, _, rest = text.partition(" ")
+                rest = rest.strip()
+                if keyword in ("if", "for"):
+                    if keyword == "for":
+                        target, sep, iterable = rest.partition(" in ")
+                        if not sep:
+                            raise TemplateError(f"{self.name}: expected 'for <target> in <expr>', got {text!r}")
+                        expression(f"{target.strip()} = None", "exec")
+                        emit(f"for {target.strip()} in {expression(iterable.strip())}:")
+                    else:
+                        emit(f"if {expression(rest)}:")
+                    stack.append(keyword)
+                    indent += 1
+                    emit("pass")
+                elif keyword in ("elif", "else"):
+                    if not stack or stack[-1] != "if":
+                        raise TemplateError(f"{self.name}: {{% {keyword} %}} outside an if block")
+                    indent -= 1
+                    emit(f"elif {expression(rest)}:" if keyword == "elif" else "else:")
+                    indent += 1
+                    emit("pass")
+                elif keyword in ("endif", "endfor"):
+                    if not stack or stack[-1] != keyword[3:]:
+                        raise TemplateError(f"{self.name}: unexpected {{% {keyword} %}}")
+                    stack.pop()
+                    indent -= 1
+                elif keyword == "set":
+                    emit(expression(rest, "exec"))
+                else:
+                    raise TemplateError(f"{self.name}: unknown tag {{% {text} %}}")
+        if stack:
+            raise TemplateError(f"{self.name}: unclosed {{% {stack[-1]} %}}")
+
+        names = loaded - bound - set(HELPERS) - set(dir(builtins))
+        head = ["def _render(_context):", "    _parts = []", "    _append = _parts.append"]
+        head += [f"    {name} = _context.get({name!r})" for name in sorted(names)]
+        return "\n".join(head + body + ["    return ''.join(_parts)"]), names
+
+    def _compile(self):
+        source, _ = self._generate()
+        namespace: Dict[str, Any] = dict(HELPERS)
+        try:
+            exec(compile(source, f"<template {self.name}>", "exec"), namespace)
+        except SyntaxError as e:
+            raise TemplateError(f"{self.name}: {e.msg}")
+        self._render = namespace["_render"]
+
+    def render(self, **context: Any) -> str:
+        if self._render is None:
+            with self._lock:
+                if self._render is None:
+                    self._compile()
+        return self._render(context)
+
+
+class TemplateLibrary:
+    """Templates loaded by file name from a directory, each compiled on first use"""
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None):
+        self.directory = Path(directory) if directory else DEFAULT_TEMPLATE_DIR
+        self._templates: Dict[str, Template] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Template:
+        template = self._templates.get(name)
+        if template is None:
+            with self._lock:
+                template = self._templates.get(name)
+                if template is None:
+                    path = self.directory / name
+                    if not path.exists() and self.directory != DEFAULT_TEMPLATE_DIR:
+                        # Custom directories only need to override some templates
+                        path = DEFAULT_TEMPLATE_DIR / name
+                    with open(path, encoding="utf-8") as f:
+                        template = Template(f.read(), name)
+                    self._templates[name] = template
+                    logger.debug("Template loaded", name=name, path=str(path))
+        return template
+
+    def render(self, name: str, **context: Any) -> str:
+        return self.get(name).render(**context)
+
+
+# Global instance (OUTPUT_TEMPLATE_DIR overrides the bundled templates, file by file)
+templates = TemplateLibrary(os.getenv("OUTPUT_TEMPLATE_DIR") or None)
@@ -0,0 +1,68 @@
+"""
+Idea Index Tests
+Similarity of repeated and different requests against the reuse threshold
+"""
+import inspect
+import tempfile
+import unittest
+from pathlib import Path
+
+from my_agent.idea_index import IdeaIndex
+from my_agent.orchestrator import MAPISOrchestrator
+
+REUSE_THRESHOLD = inspect.signature(MAPISOrchestrator.__init__).parameters["reuse_threshold"].default
+
+# Documents as _remember_results builds them: user input, domain, problem, value proposition, keywords
+IDEAS = [
+    ("Give me a new idea in the EdTech domain", "EdTech",
+     "Students lose motivation in self-paced online courses",
+     "Adaptive study plans with peer accountability groups", ["learning", "motivation", "courses"]),
+    ("Give me a new idea in the FinTech domain", "FinTech",
+     "Freelancers struggle to set aside money for quarterly taxes",
+     "Automatic tax savings on every incoming payment", ["taxes", "freelancers", "savings"]),
+    ("Suggest a HealthTech app for sleep", "HealthTech",
+     "Shift workers cannot keep a regular sleep schedule",
+     "Personalised light and nap plans synced to rotas", ["sleep", "shift work", "wellness"]),
+    ("An AgriTech idea for small farms", "AgriTech",
+     "Small farms waste water with fixed irrigation timers",
+     "Soil sensor driven irrigation on a cheap controller", ["irrigation", "water", "sensors"]),
+]
+
+
+class IdeaIndexSimilarityTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.index = IdeaIndex(Path(self._tmp.name))
+        for user_input, domain, problem, value, keywords in IDEAS:
+            self.index.add("idea", " ".join([user_input, domain, problem, value, *keywords]), {"user_input": user_input},
+                           request=user_input)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_identical_request_reaches_reuse_threshold(self):
+        for user_input, *_ in IDEAS:
+            match = self.index.find_match(user_input, kind="idea", threshold=REUSE_THRESHOLD)
+            self.assertIsNotNone(match, user_input)
+            self.assertEqual(self.index.load_results(match["doc_id"]), {"user_input": user_input})
+
+    def test_different_request_stays_below_reuse_threshold(self):
+        hits = self.index.search("Give me a new idea in the EdTech domain for language learning with kids")
+        self.assertTrue(hits)
+        self.assertLess(hits[0]["similarity"], REUSE_THRESHOLD)
+
+    def test_short_query_contained_in_a_document_stays_below_reuse_threshold(self):
+        # Every word is in the stored EdTech idea, but the query is not that request
+        hits = self.index.search("A new idea for online courses")
+        self.assertTrue(hits)
+        self.assertLess(hits[0]["similarity"], REUSE_THRESHOLD)
+
+    def test_documents_without_a_request_use_all_their_terms(self):
+        index = IdeaIndex(Path(self._tmp.name) / "plain")
+        index.add("idea", "Give me a new idea in the EdTech domain EdTech online courses for adults")
+        self.assertLess(index.search("A new idea for online courses")[0]["similarity"], REUSE_THRESHOLD)
+
+
+if __name__ == "__main__":
+    unittest.main()
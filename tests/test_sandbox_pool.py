@@ -0,0 +1,45 @@
+"""
+Sandbox Pool Tests
+Workers are returned to the pool or discarded on every exit path of a job
+"""
+import threading
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from my_agent.tools.sandbox_pool import SandboxPool, _Worker
+
+
+class SandboxPoolWorkerLeakTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = SandboxPool(size=1).start()
+
+    def tearDown(self):
+        self.pool.close()
+
+    def run_with_deadline(self, code: str, deadline: float = 30.0):
+        """run_sync on a thread, failing instead of hanging if no worker ever comes back"""
+        response = {}
+        thread = threading.Thread(target=lambda: response.update(self.pool.run_sync(code)), daemon=True)
+        thread.start()
+        thread.join(deadline)
+        self.assertFalse(thread.is_alive(), "run_sync blocked waiting for a leaked worker")
+        return response
+
+    def test_unserializable_inputs_fail_without_taking_a_worker(self):
+        response = self.pool.run_sync("result = 1", inputs={"when": datetime.now()})
+        self.assertFalse(response["ok"])
+        self.assertIn("JSON", response["error"])
+        self.assertEqual(self.pool.stats()["idle"], 1)
+        self.assertEqual(self.run_with_deadline("result = 2")["result"], 2)
+
+    def test_interrupted_job_discards_its_worker(self):
+        with mock.patch.object(_Worker, "run", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.pool.run_sync("result = 1")
+        self.assertEqual(self.run_with_deadline("result = 3")["result"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
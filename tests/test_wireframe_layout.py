@@ -0,0 +1,58 @@
+"""
+Wireframe Layout Tests
+Columns stay inside their parent, and the SVG renderer handles any node type
+"""
+import re
+import unittest
+
+from my_agent.tools.wireframe_layout import CharGrid, Node, render_screen
+from my_agent.tools.wireframe_svg import CELL_HEIGHT, CELL_WIDTH, render_screen_svg
+
+
+class ColumnsTest(unittest.TestCase):
+
+    def test_columns_that_fit_share_one_row(self):
+        lines = render_screen("Home", [["Card", "Card", "Card"]]).strip().splitlines()
+        self.assertEqual(sum(line.count("| Card") for line in lines), 3)
+        self.assertEqual(len(lines), 6)
+
+    def test_extra_columns_wrap_inside_the_frame(self):
+        width = 40
+        labels = [f"C{i}" for i in range(30)]
+        lines = render_screen("Home", ["Header", labels, "Footer"], width=width).strip().splitlines()
+        frame = lines[1:]
+        self.assertTrue(all(len(line) <= width for line in frame))
+        self.assertTrue(all(line.endswith("|") for line in frame[1:-1]))
+        self.assertEqual(frame[-2].strip("| "), "Footer")
+        self.assertEqual(sum(line.count("+-") for line in frame), 2 * len(labels))
+
+    def test_svg_matches_wrapped_layout(self):
+        svg = render_screen_svg("Home", [[f"C{i}" for i in range(30)]], width=40)
+        boxes = re.findall(r'<rect class="b" x="([\d.]+)" y="[\d.]+" width="(\d+)"', svg)
+        self.assertEqual(len(boxes), 30)
+        self.assertTrue(all(float(x) + int(w) <= 40 * CELL_WIDTH for x, w in boxes))
+
+
+class Divider(Node):
+    """A custom node the SVG renderer has no special case for"""
+
+    def measure(self, width: int) -> int:
+        return 1
+
+    def draw(self, grid: CharGrid, x: int, y: int, width: int) -> int:
+        grid.hline(x, y, width, "=")
+        return 1
+
+
+class CustomNodeTest(unittest.TestCase):
+
+    def test_svg_draws_custom_nodes_as_text(self):
+        svg = render_screen_svg("Home", ["Header", Divider(), "Footer"], width=20)
+        self.assertIn(f'<text x="{2 * CELL_WIDTH}" y="{2 * CELL_HEIGHT + 15}" xml:space="preserve">{"=" * 16}</text>', svg)
+        self.assertIn(">Footer</text>", svg)
+        ascii_lines = render_screen("Home", ["Header", Divider(), "Footer"], width=20).strip().splitlines()
+        self.assertEqual(ascii_lines[3], "| " + "=" * 16 + " |")
+
+
+if __name__ == "__main__":
+    unittest.main()